@@ -0,0 +1,44 @@
+"""
+Benchmark entry point:
+    python -m generix.bench --sizes 20 100 --ticks 10
+"""
+import argparse
+import os
+
+from generix.bench import runner
+
+
+def main():
+    """
+    Benchmark entry point.
+    """
+    parser = argparse.ArgumentParser(description='Generix headless benchmark.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=runner.DEFAULT_SIZES,
+                        help='board sizes, e.g. 20 100 500 2000 (large sizes are slow)')
+    parser.add_argument('--densities', type=float, nargs='+', default=runner.DEFAULT_DENSITIES)
+    parser.add_argument('--genome-lengths', type=int, nargs='+', default=runner.DEFAULT_GENOME_LENGTHS)
+    parser.add_argument('--ticks', type=int, default=runner.DEFAULT_TICKS)
+    parser.add_argument('--seed', type=int, default=runner.DEFAULT_SEED)
+    parser.add_argument('--output', default='generix-bench.json',
+                        help='file where results are being written')
+    parser.add_argument('--baseline', default='generix-bench-baseline.json',
+                        help='file with results to compare with')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='stores results as a new baseline')
+    args = parser.parse_args()
+
+    cases = runner.make_grid(
+        args.sizes, args.densities, args.genome_lengths, args.ticks, args.seed
+    )
+    results = runner.run(cases, args.output)
+
+    if args.save_baseline:
+        runner.save(results, args.baseline)
+    elif os.path.exists(args.baseline):
+        ratios = runner.compare(results, runner.load(args.baseline))
+        for key, metrics in ratios.items():
+            print(key, ' '.join(f'{metric}={ratio:.2f}x' for metric, ratio in metrics.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+A module for a benchmark runner which drives BoardManager headlessly over a
+grid of board sizes, agents densities and genome lengths.
+"""
+import gc
+import itertools
+import json
+import multiprocessing
+import random
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows: peak RSS is not reported
+    resource = None
+
+from generix.core.cell.id import CellId
+
+
+# Large boards (e.g. 2000) take minutes per case and are run on demand (--sizes)
+DEFAULT_SIZES = (20, 100, 500)
+# Share of board cells occupied by hunters and by food
+DEFAULT_DENSITIES = (0.01, 0.05, 0.2)
+DEFAULT_GENOME_LENGTHS = (16, 64)
+DEFAULT_TICKS = 20
+DEFAULT_SEED = 0
+
+# Metrics compared with a baseline: higher is better for 'ticks_per_sec',
+# lower is better for the rest
+METRICS = ('ticks_per_sec', 'allocs_per_tick', 'peak_alloc_kb', 'peak_rss_kb', 'generation_s')
+
+
+class BenchmarkCase:
+    """
+    A single point of the benchmark grid.
+    """
+    __slots__ = ('size', 'density', 'genome_len', 'ticks', 'seed')
+
+    def __init__(self, size, density, genome_len, ticks, seed):
+        """
+        Constructs BenchmarkCase object.
+        :param size: board width and height (amount of cells).
+        :param density: share of cells occupied by hunters and by food.
+        :param genome_len: length of hunters genomes.
+        :param ticks: amount of ticks to measure.
+        :param seed: seed of the random generator.
+        """
+        self.size = size
+        self.density = density
+        self.genome_len = genome_len
+        self.ticks = ticks
+        self.seed = seed
+
+    @property
+    def key(self):
+        return f'{self.size}x{self.size}/d{self.density}/g{self.genome_len}'
+
+
+def make_grid(sizes=DEFAULT_SIZES, densities=DEFAULT_DENSITIES,
+              genome_lengths=DEFAULT_GENOME_LENGTHS, ticks=DEFAULT_TICKS, seed=DEFAULT_SEED):
+    """
+    Makes benchmark cases of every combination of parameters.
+    :return: list of BenchmarkCase objects.
+    """
+    return [
+        BenchmarkCase(size, density, genome_len, ticks, seed)
+        for size, density, genome_len in itertools.product(sizes, densities, genome_lengths)
+    ]
+
+
+def configure(case):
+    """
+    Applies parameters of the case to the settings.
+    :param case: BenchmarkCase object.
+    :return: None.
+    """
+    from generix.core.context import app_context
+
+    settings = app_context.settings
+    board_data = settings.find('board')
+    board_data['rows'] = case.size
+    board_data['cols'] = case.size
+
+    amount = max(1, int(case.size * case.size * case.density))
+    settings.find(CellId.HUNTER_CELL)['amount'] = amount
+    settings.find(CellId.HUNTER_CELL)['genome_max_len'] = case.genome_len
+    settings.find(CellId.FOOD_CELL)['amount'] = amount
+
+
+def run_case(case):
+    """
+    Runs a single case. Should be called in a fresh process, so settings
+    changes and peak RSS do not leak between cases.
+    :param case: BenchmarkCase object.
+    :return: dict with measurements.
+    """
+    random.seed(case.seed)
+    configure(case)
+
+    from generix.core.board.manager import BoardManager
+
+    manager = BoardManager()
+    manager.create_new_board()
+
+    started = time.perf_counter()
+    for _ in range(case.ticks):
+        manager.tick()
+    elapsed = time.perf_counter() - started
+
+    # Allocations of a tick and peak of memory allocated during it (above what
+    # is allocated before it) are sampled on a separate tick, tracing slows
+    # down the tick
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    manager.tick()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    # Blocks allocated by each module and not freed by the end of the tick
+    allocations = sum(
+        max(stat.count_diff, 0) for stat in after.compare_to(before, 'filename')
+    )
+
+    started = time.perf_counter()
+    manager.form_bots_generation()
+    manager.create_new_board()
+    generation = time.perf_counter() - started
+
+    return {
+        'case': case.key,
+        'ticks': case.ticks,
+        'ticks_per_sec': case.ticks / elapsed if elapsed else 0.0,
+        'allocs_per_tick': allocations,
+        'peak_alloc_kb': (peak - base) / 1024,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+        'generation_s': generation,
+    }
+
+
+def run(cases, output=None):
+    """
+    Runs benchmark cases one by one, each in a fresh process.
+    :param cases: list of BenchmarkCase objects.
+    :param output: path to the file where results are being stored.
+    :return: dict of results: {<case key>: <measurements>}.
+    """
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for case in cases:
+        with context.Pool(processes=1) as pool:
+            result = pool.apply(run_case, (case,))
+        results[case.key] = result
+        print(format_result(result))
+        if output:
+            save(results, output)
+    return results
+
+
+def compare(results, baseline):
+    """
+    Compares results with a baseline.
+    :param results: dict of results.
+    :param baseline: dict of baseline results.
+    :return: dict: {<case key>: {<metric>: <ratio of result to baseline>}}.
+    """
+    ratios = {}
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        ratios[key] = {}
+        for metric in METRICS:
+            current = result.get(metric)
+            previous = baseline[key].get(metric)
+            if current is None or not previous:
+                continue
+            ratios[key][metric] = current / previous
+    return ratios
+
+
+def save(results, path):
+    """
+    Saves results to the file as JSON.
+    :param results: dict of results.
+    :param path: path to the file.
+    :return: None.
+    """
+    with open(path, mode='w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path):
+    """
+    Loads results from the file.
+    :param path: path to the file.
+    :return: dict of results.
+    """
+    with open(path, mode='r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def format_result(result):
+    """
+    Represents result of a case as a single line.
+    :param result: dict with measurements.
+    :return: string.
+    """
+    rss = result['peak_rss_kb']
+    return (
+        f"{result['case']:>24}: {result['ticks_per_sec']:10.2f} ticks/sec, "
+        f"{result['allocs_per_tick']:10} allocs/tick, "
+        f"{result['peak_alloc_kb']:12.1f} KB peak/tick, "
+        f"{rss if rss is not None else '-':>10} KB RSS, "
+        f"{result['generation_s'] * 1000:10.2f} ms/generation"
+    )
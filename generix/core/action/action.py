@@ -2,7 +2,6 @@
 A module for a bot Actions.
 """
 import abc
-import copy
 
 from generix.core.cell.id import CellId
 from generix.core.action import command
@@ -40,109 +39,129 @@ class Stay(BaseAction):
     """
     Stay on the current position.
     """
-    def execute(self, board, point, cell):
+    def execute(self, board, index, cell):
         """
         Tells cell to stay where it is.
         :param board: Board instance (new one).
-        :param point: Point instance.
+        :param index: flat index of the cell.
         :param cell: CellId instance.
         :return: None.
         """
-        if command.is_cell_of_types(board, point, [CellId.EMPTY_CELL]) >= 0:
-            command.move(board, point, cell)
+        if command.is_cell_of_types(board, index, [CellId.EMPTY_CELL]) >= 0:
+            command.move(board, index, cell)
+
+
+class Reproduce(BaseAction):
+    """
+    Split into an adjacent free cell.
+    """
+    def execute(self, board, index, cell, births):
+        """
+        Tells cell to stay where it is and registers its birth. Children are
+        placed once all cells have been updated (see BoardManager.place_births).
+        :param board: Board instance (new one).
+        :param index: flat index of the cell.
+        :param cell: CellId instance.
+        :param births: list of (<flat index>, <cell>) pairs of the tick.
+        :return: None.
+        """
+        if command.is_cell_of_types(board, index, [CellId.EMPTY_CELL]) >= 0:
+            command.move(board, index, cell)
+            births.append((index, cell))
 
 
 class Look(BaseAction):
     """
-    Look for neighboring cell type.
+    Look for the nearest food.
     """
-    def execute(self, board, point, cell_types):
+    def execute(self, sensor, index, cell):
         """
-        Makes cell look for neighboring cell type.
-        :param board: Board instance (any: new or old).
-        :param point: Point instance.
-        :param cell_types: list of cell types to compare cell with.
-        :return: type of cell if type is present in the list, otherwise - None.
+        Makes cell turn to the nearest food within the sensing radius.
+        :param sensor: FoodSensor instance (updated for the current frame).
+        :param index: flat index of the cell.
+        :param cell: CellId instance.
+        :return: distance to the food or None if there is no food within the radius.
         """
-        index = command.is_cell_of_types(board, point, cell_types)
-        if index >= 0:
-            return cell_types[index]
-        return None
+        return command.look(sensor, index, cell)
 
 
 class Move(BaseAction):
     """
     Move in a specific direction.
     """
-    def execute(self, old_board, new_board, point, cell,
+    def execute(self, old_board, new_board, index, cell,
                 curr_cell_types, next_cell_types):
         """
         Moves cell in a specific direction.
         :param old_board - Board instance (current frame).
         :param new_board - Board instance (new frame).
-        :param point - Point instance.
+        :param index - flat index of the cell.
         :param cell - CellId instance.
         :param curr_cell_types - current frame cell types check list.
         :param next_cell_types - next frame cell types check list.
         :return: None.
         """
-        if command.reaches_bound(old_board, point, cell.direction):
-            command.move(new_board, point, cell)
+        shifted_index = command.neighbor(old_board, index, cell.direction)
+        if shifted_index < 0:
+            command.move(new_board, index, cell)
             return
 
-        shifted_point = copy.copy(point)
-        shifted_point.shift(cell.direction, 1)
-
         curr_frame_cell_is_empty = command.is_cell_of_types(
-            old_board, shifted_point, curr_cell_types
+            old_board, shifted_index, curr_cell_types
         ) >= 0
 
         next_frame_cell_is_empty = command.is_cell_of_types(
-            new_board, shifted_point, next_cell_types
+            new_board, shifted_index, next_cell_types
         ) >= 0
 
         if curr_frame_cell_is_empty and next_frame_cell_is_empty:
-            point = shifted_point
-        command.move(new_board, point, cell)
+            index = shifted_index
+        command.move(new_board, index, cell)
 
 
 class Eat(BaseAction):
     """
     Eat something/somebody.
     """
-    def execute(self, old_board, new_board, point, cell):
+    def execute(self, old_board, new_board, index, cell):
         """
         Eats food in set direction (if food is present).
         :param old_board - Board instance (current frame).
         :param new_board - Board instance (new frame).
-        :param point - Point instance.
+        :param index - flat index of the cell.
         :param cell - CellId instance.
         :return: None.
         """
         # It takes 5hp for bot to eat food
         cell.change_hp(-5)
 
-        if command.reaches_bound(old_board, point, cell.direction):
-            new_board.set_cell(point, cell)
+        shifted_index = command.neighbor(old_board, index, cell.direction)
+        if shifted_index < 0:
+            command.move(new_board, index, cell)
             return
 
-        shifted_point = copy.copy(point)
-        shifted_point.shift(cell.direction, 1)
-
-        # Next frame cell should be empty, because cells are being refreshed in order of their
-        # indexing, so the lower index - the earlier it's being refreshed. Hence, early cells
-        # can eat food before the current cell.
-        next_frame_cell_is_empty = command.is_cell_of_types(
-            new_board, shifted_point, [CellId.EMPTY_CELL, CellId.FOOD_CELL]
-        )
+        # Target cell should be empty or food on both frames. On the current frame it
+        # should not be occupied by another cell. On the next frame it can be already taken,
+        # because cells are being refreshed in order of their indexing, so the lower
+        # index - the earlier it's being refreshed. Hence, early cells can eat food before
+        # the current cell.
+        curr_frame_cell_is_free = command.is_cell_of_types(
+            old_board, shifted_index, [CellId.EMPTY_CELL, CellId.FOOD_CELL]
+        ) >= 0
 
-        if next_frame_cell_is_empty:
-            command.move(new_board, shifted_point, cell)
+        next_frame_cell_is_free = command.is_cell_of_types(
+            new_board, shifted_index, [CellId.EMPTY_CELL, CellId.FOOD_CELL]
+        ) >= 0
 
+        if curr_frame_cell_is_free and next_frame_cell_is_free:
             curr_frame_cell_is_food = command.is_cell_of_types(
-                old_board, point, [CellId.FOOD_CELL]
-            )
+                old_board, shifted_index, [CellId.FOOD_CELL]
+            ) >= 0
+            # Health points change before placing, so board statistics
+            # account the final hp of the cell
             if curr_frame_cell_is_food:
                 cell.change_hp(10)
+
+            command.move(new_board, shifted_index, cell)
         else:
-            command.move(new_board, point, cell)
+            command.move(new_board, index, cell)
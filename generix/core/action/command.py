@@ -1,77 +1,39 @@
 """
 A module for different commands which composes into Action.
+Cells are addressed by flat indexes of the board (x * height + y).
 """
-from generix.core.cell.direction import Direction
+from generix.core.board.neighbors import DIRECTION_INDEX
 
 
-def reaches_bound(board, point, direction):
+def neighbor(board, i, direction):
     """
-    Checks whether a cell reached bounds or not.
-    :param direction: direction to check.
-    :param board: board instance.
-    :param point: Point object.
-    :return: True - reached, False - not reached.
-    """
-    if direction == Direction.UP:
-        return is_upper_bound(point.y)
-    elif direction == Direction.UP_RIGHT:
-        return is_upper_bound(point.y) or is_right_bound(point.x, board)
-    elif direction == Direction.RIGHT:
-        return is_right_bound(point.x, board)
-    elif direction == Direction.DOWN_RIGHT:
-        return is_lower_bound(point.y, board) or is_right_bound(point.x, board)
-    elif direction == Direction.DOWN:
-        return is_lower_bound(point.y, board)
-    elif direction == Direction.DOWN_LEFT:
-        return is_lower_bound(point.y, board) or is_left_bound(point.x)
-    elif direction == Direction.LEFT:
-        return is_left_bound(point.x)
-    elif direction == Direction.UP_LEFT:
-        return is_upper_bound(point.y) or is_left_bound(point.x)
-
-def is_left_bound(x):
-    """
-    Was left bound reached?
-    :param x: x coordinate.
-    :return: True - bound was reached, False - otherwise.
-    """
-    return x <= 0
-
-def is_upper_bound(y):
-    """
-    Was right bound reached?
-    :param y: y coordinate.
-    :return: True - bound was reached, False - otherwise.
-    """
-    return y <= 0
-
-def is_lower_bound(y, board):
-    """
-    Was lower bound reached?
-    :param y: y coordinate.
+    Gets neighboring cell in a specific direction.
     :param board: Board instance.
-    :return: True - bound was reached, False - otherwise.
+    :param i: flat index of the cell.
+    :param direction: direction to look at.
+    :return: flat index of the neighbor or -1 if a bound was reached.
     """
-    return y >= board.height - 1
+    return board.neighbors[i * 8 + DIRECTION_INDEX[direction]]
 
-def is_right_bound(x, board):
+def reaches_bound(board, i, direction):
     """
-    Was right bound reached?
-    :param x: x coordinate.
-    :param board: Board instance.
-    :return: True - bound was reached, False - otherwise.
+    Checks whether a cell reached bounds or not.
+    :param board: board instance.
+    :param i: flat index of the cell.
+    :param direction: direction to check.
+    :return: True - reached, False - not reached.
     """
-    return x >= board.width - 1
+    return neighbor(board, i, direction) < 0
 
-def move(board, point, cell):
+def move(board, i, cell):
     """
-    Sets cell on point position.
+    Sets cell on a position.
     :param board: Board instance.
-    :param point: Point instance of cell location.
+    :param i: flat index of cell location.
     :param cell: CellId instance.
     :return: None.
     """
-    board.set_cell(point, cell)
+    board.set_cell_at(i, cell)
 
 def turn(cell, angle):
     """
@@ -82,16 +44,29 @@ def turn(cell, angle):
     """
     cell.turn(angle)
 
-def is_cell_of_types(board, point, types):
+def look(sensor, i, cell):
+    """
+    Turns cell to the nearest food.
+    :param sensor: FoodSensor instance.
+    :param i: flat index of the cell.
+    :param cell: Cell object.
+    :return: distance to the food or None if there is no food within the radius.
+    """
+    direction = sensor.direction(i)
+    if direction is not None and direction != cell.direction:
+        cell.turn((direction.value - cell.direction.value) % 360)
+    return sensor.distance(i)
+
+def is_cell_of_types(board, i, types):
     """
     Searches cell type in the list and returns an index if found.
     :param board: Board instance.
-    :param point: Point instance.
+    :param i: flat index of the cell.
     :param types: list of cell types (enum).
     :return: index if found, otherwise it returns -1.
     """
     try:
-        index = types.index(board.get_cell(point).id)
+        index = types.index(board.get_cell_at(i).id)
     except ValueError:
         return -1
     return index
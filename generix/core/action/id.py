@@ -11,3 +11,4 @@ class Action(enum.Enum):
     STAY = 2
     TURN = 3
     MOVE = 4
+    REPRODUCE = 5
@@ -0,0 +1,96 @@
+"""
+A module for intent kernels of actions (see board/intent.py). A kernel decides
+what a cell is going to do by the current frame only, so kernels of different
+cells do not depend on each other:
+    - scalar kernel: (board, i, cell, sensor) -> (<kind>, <target>) for final
+      actions, None for the rest (they just change the cell, e.g. turn it);
+    - batched kernel: (board, group, kinds, targets, sensor) fills intents of
+      a group of (<position>, <flat index>, <cell>) triples which have chosen
+      the same final action, so lookups are done once per group, not per cell.
+"""
+from generix.core.action import command
+from generix.core.board.neighbors import DIRECTION_INDEX
+from generix.core.cell.id import CellId
+
+
+# Kinds of intents
+NONE = 0
+STAY = 1
+MOVE = 2
+EAT = 3
+DEAD = 4
+# Stays where it is and gives birth once all cells are placed
+REPRODUCE = 5
+
+# It takes 5hp for bot to eat food
+EAT_COST = 5
+
+
+def turn(board, i, cell, sensor):
+    command.turn(cell, 45)
+
+
+def look(board, i, cell, sensor):
+    command.look(sensor, i, cell)
+
+
+def stay(board, i, cell, sensor):
+    return STAY, -1
+
+
+def reproduce(board, i, cell, sensor):
+    return REPRODUCE, -1
+
+
+def move(board, i, cell, sensor):
+    target = board.neighbors[i * 8 + DIRECTION_INDEX[cell.direction]]
+    if target >= 0 and board.types[target] == CellId.EMPTY_CELL.value:
+        return MOVE, target
+    return STAY, -1
+
+
+def eat(board, i, cell, sensor):
+    cell.change_hp(-EAT_COST)
+    target = board.neighbors[i * 8 + DIRECTION_INDEX[cell.direction]]
+    if target >= 0 and board.types[target] in (CellId.EMPTY_CELL.value, CellId.FOOD_CELL.value):
+        return EAT, target
+    return STAY, -1
+
+
+def stay_batch(board, group, kinds, targets, sensor):
+    for k, _, _ in group:
+        kinds[k] = STAY
+
+
+def reproduce_batch(board, group, kinds, targets, sensor):
+    for k, _, _ in group:
+        kinds[k] = REPRODUCE
+
+
+def move_batch(board, group, kinds, targets, sensor):
+    neighbors = board.neighbors
+    types = board.types
+    empty = CellId.EMPTY_CELL.value
+    direction_index = DIRECTION_INDEX
+    for k, i, cell in group:
+        target = neighbors[i * 8 + direction_index[cell.direction]]
+        if target >= 0 and types[target] == empty:
+            kinds[k] = MOVE
+            targets[k] = target
+        else:
+            kinds[k] = STAY
+
+
+def eat_batch(board, group, kinds, targets, sensor):
+    neighbors = board.neighbors
+    types = board.types
+    free = (CellId.EMPTY_CELL.value, CellId.FOOD_CELL.value)
+    direction_index = DIRECTION_INDEX
+    for k, i, cell in group:
+        cell.change_hp(-EAT_COST)
+        target = neighbors[i * 8 + direction_index[cell.direction]]
+        if target >= 0 and types[target] in free:
+            kinds[k] = EAT
+            targets[k] = target
+        else:
+            kinds[k] = STAY
@@ -0,0 +1,127 @@
+"""
+A module for a registry of actions. Each action is declared once: parameters
+of its implementation, whether it is final (ends the turn of a cell), a scalar
+implementation for the serial tick and intent kernels for the intent tick (see
+action/kernel.py). Engines take the fastest path an action has: a batched
+kernel, then a scalar one.
+
+To add an action: a value of the Action enum, an implementation (a BaseAction
+subclass and, optionally, intent kernels) and a register() call below.
+Settings of actions are derived from the registry.
+"""
+from generix.core.action import action, kernel
+from generix.core.action.id import Action
+from generix.core.cell.id import CellId
+
+
+class ActionKernel:
+    """
+    Declaration of an action. Parameters are names of values which the serial
+    tick provides for a cell:
+        'cell' - the cell itself;
+        'old_board', 'new_board' - boards of the current and the next frame;
+        'index' - flat index of the cell on the current frame;
+        'sensor' - FoodSensor instance (None - no cells can look for food);
+        'births' - list where reproducing cells are put (see BoardManager.place_births).
+    """
+    __slots__ = ('action', 'cls', 'params', 'options', 'is_final', 'intent', 'batch', '_item')
+
+    def __init__(self, action, cls, params=(), options=None, is_final=False, intent=None,
+                 batch=None):
+        """
+        Constructs ActionKernel instance.
+        :param action: Action value.
+        :param cls: BaseAction subclass (scalar implementation).
+        :param params: names of positional parameters of cls.execute.
+        :param options: dict of constant keyword parameters of cls.execute.
+        :param is_final: True - the action ends the turn of a cell.
+        :param intent: scalar intent kernel (None - unsupported by the intent tick).
+        :param batch: batched intent kernel of a final action (None - scalar kernel is used).
+        """
+        self.action = action
+        self.cls = cls
+        self.params = tuple(params)
+        self.options = dict(options or {})
+        self.is_final = is_final
+        self.intent = intent
+        self.batch = batch
+        self._item = cls()
+
+    def execute(self, context):
+        """
+        Executes the scalar implementation.
+        :param context: dict of values by parameter names (see ActionKernel).
+        :return: depends on the action (e.g. Look returns distance to food).
+        """
+        return self._item.execute(*[context[name] for name in self.params], **self.options)
+
+
+# Declared actions: {<Action>: ActionKernel}
+_kernels = {}
+
+
+def register(action_kernel):
+    """
+    Registers an action.
+    :param action_kernel: ActionKernel instance.
+    :return: None.
+    """
+    if action_kernel.action in _kernels:
+        raise ValueError('action is already registered:', action_kernel.action)
+    _kernels[action_kernel.action] = action_kernel
+
+
+def get_kernel(action_id):
+    """
+    Gets declaration of an action.
+    :param action_id: Action value.
+    :return: ActionKernel instance.
+    """
+    try:
+        return _kernels[action_id]
+    except KeyError:
+        raise ValueError('undefined action value:', action_id) from None
+
+
+def get_kernels():
+    """
+    Gets declarations of all actions.
+    :return: list of ActionKernel instances in order of Action values.
+    """
+    return sorted(_kernels.values(), key=lambda item: item.action.value)
+
+
+def get_settings():
+    """
+    Gets 'action' section of settings.
+    :return: dict: {<Action>: {'cls': <BaseAction subclass>, 'is_final': <bool>}}.
+    """
+    return {
+        item.action: {'cls': item.cls, 'is_final': item.is_final} for item in get_kernels()
+    }
+
+
+register(ActionKernel(
+    Action.LOOK, action.Look, ('sensor', 'index', 'cell'), intent=kernel.look
+))
+register(ActionKernel(
+    Action.EAT, action.Eat, ('old_board', 'new_board', 'index', 'cell'), is_final=True,
+    intent=kernel.eat, batch=kernel.eat_batch
+))
+register(ActionKernel(
+    Action.STAY, action.Stay, ('new_board', 'index', 'cell'), is_final=True,
+    intent=kernel.stay, batch=kernel.stay_batch
+))
+register(ActionKernel(
+    Action.TURN, action.Turn, ('cell',), {'angle': 45}, intent=kernel.turn
+))
+register(ActionKernel(
+    Action.MOVE, action.Move, ('old_board', 'new_board', 'index', 'cell'), {
+        'curr_cell_types': [CellId.EMPTY_CELL],
+        'next_cell_types': [CellId.EMPTY_CELL],
+    }, is_final=True, intent=kernel.move, batch=kernel.move_batch
+))
+register(ActionKernel(
+    Action.REPRODUCE, action.Reproduce, ('new_board', 'index', 'cell', 'births'), is_final=True,
+    intent=kernel.reproduce, batch=kernel.reproduce_batch
+))
@@ -1,29 +1,58 @@
 """
-A module for an application base window.
+A module for an application base window. The board is panned by dragging it
+with the left mouse button or by arrow keys and zoomed by the mouse wheel or
+by +/- keys, 0 shows the whole board.
 """
-import os
-
 import pygame
 
-from generix.core.board.manager import BoardManager
+from generix.core.board.renderer import BoardRenderer
+from generix.core.board.recorder import (
+    Recorder, PngSequenceWriter, VideoWriter, frame_from_surface
+)
+from generix.core.board.shared import SharedBoardWriter
+from generix.core.board.viewport import Viewport
 from generix.core.data.db import Database
-from generix.core.settings.registry import settings_reg
-from generix.core.settings.settings import BOARD_FILE_PATH, LOAD_BOARD, FPS, REFRESH_RATE
+from generix.core.data.profiler import Profiler, NullProfiler
+from generix.core.context import app_context
+from generix.core.experiment import ExperimentRunner
+from generix.core.scheduler import Scheduler
+from generix.core.settings.settings import (
+    FPS, TICK_RATE, FAST_FORWARD, PROFILE, RECORD, SHARED_BOARD
+)
+
+
+# Pan of one arrow key press (pixels)
+PAN_STEP = 100
 
 
 class AppWindow:
     """
     Application base window.
     """
-    def __init__(self, width_px, height_px):
+    def __init__(self, width_px, height_px, context=None):
         """
         Constructs application window.
         :param width_px: window width.
         :param height_px: window height.
+        :param context: AppContext instance (None - application context).
         """
-        self._db = Database()
-        self._board_manager = BoardManager()
+        self._context = context or app_context
+        self._context.make_dirs()
+        self._profiler = Profiler() if PROFILE else NullProfiler()
+        self._db = Database(self._context.session_maker)
+        self._runner = ExperimentRunner(self._db, self._context, self._profiler)
+        self._scheduler = Scheduler(FPS, TICK_RATE, FAST_FORWARD)
         self._display = pygame.display.set_mode((width_px, height_px))
+        self._renderer = BoardRenderer(self._context.settings, self._profiler)
+        self._viewport = Viewport(
+            width_px, height_px, self._context.settings.find_option_by_key('cell', 'width')
+        )
+        self._recorder = None
+        if RECORD == 'png':
+            self._recorder = Recorder(PngSequenceWriter(self._context.frames_dir_path))
+        elif RECORD == 'video':
+            self._recorder = Recorder(VideoWriter(self._context.video_file_path, FPS))
+        self._shared_board = SharedBoardWriter(SHARED_BOARD) if SHARED_BOARD else None
 
     def run(self, experiment_name):
         """
@@ -31,73 +60,93 @@ class AppWindow:
         :param experiment_name: name of experiment to run.
         :return: None.
         """
-        if self._db.find_experiment_by_name(experiment_name) is None:
-            # Creates a new experiment in the DB
-            self._db.create_experiment(experiment_name)
+        self._runner.start(experiment_name)
+        snapshot = self._runner.board_manager.snapshot()
+        self._viewport.fit(snapshot.width, snapshot.height)
+        view = None
 
-        # Creates new board for the experiment
-        self._board_manager.create_new_board()
-        if LOAD_BOARD:
-            self._board_manager.load(BOARD_FILE_PATH)
+        # Main loop: simulation runs between frames. Snapshots are drawn on the
+        # renderer thread, the display shows the latest finished frame.
+        self._renderer.start()
+        while not self.handle_events():
+            if self._scheduler.run_frame(self._runner.tick):
+                snapshot = self._runner.board_manager.snapshot()
+                self._viewport.resize(snapshot.width, snapshot.height)
+                view = self._viewport.view
+                self._renderer.submit(snapshot, view)
+                if self._shared_board is not None:
+                    self.share_board()
+            elif view != self._viewport.view:
+                # Redraws the last snapshot, e.g. while simulation waits for the next tick
+                view = self._viewport.view
+                self._renderer.submit(snapshot, view)
+            frame = self._renderer.take_frame()
+            if frame is not None:
+                self.refresh_display(frame)
+        self._renderer.stop()
+        if self._recorder is not None:
+            self._recorder.close()
+        if self._shared_board is not None:
+            self._shared_board.close()
 
-        # Main loop of simulation
-        i = 0
-        while not AppWindow.is_quit_event():
-            updated_board = self._board_manager.update(fps=FPS, refresh_rate=REFRESH_RATE)
-            # Updates only if enough time passed
-            if updated_board:
-                self.refresh_display(updated_board)
-            # Checks minimum population of cells to decide: should we continue or not
-            if is_complete_simulation(self._board_manager.statistics):
-                # Saves cells locations to the file
-                self._board_manager.save(BOARD_FILE_PATH)
-                # Saves statistics to the database
-                self._db.create_simulation(experiment_name, i)
-                # Creates new board to start a new simulation
-                self._board_manager.create_new_board()
-                # Loads cells locations from the file (from previous simulation)
-                self._board_manager.load(BOARD_FILE_PATH)
-                # TODO
-                # 1) Считать геномы выживших ботов
-                # 2) Клонировать каждую клетку n раз
-                # 3) Мутировать n / 10 клеток
-                self._board_manager.form_bots_generation()
+        if self._profiler.enabled:
+            print(self._profiler)
+            self._profiler.dump(self._context.profile_file_path)
 
-            # Statistics is being recalculated on each iteration
-            self._board_manager.renew_statistics()
-            i += 1
+    def share_board(self):
+        """
+        Publishes the board for observers in other processes. It is done once
+        per frame, so observers do not slow down fast-forwarded simulation.
+        :return: None.
+        """
+        started = self._profiler.start()
+        board_manager = self._runner.board_manager
+        self._shared_board.publish(board_manager.board, board_manager.ticks)
+        self._profiler.stop('share', started)
 
     def refresh_display(self, bitmap):
         """
         Blits board pixels to the display.
         :return: None.
         """
+        started = self._profiler.start()
         self._display.blit(bitmap, (0, 0))
         pygame.display.flip()
+        self._profiler.stop('display', started)
 
-    @staticmethod
-    def is_quit_event():
+        if self._recorder is not None:
+            started = self._profiler.start()
+            self._recorder.capture(frame_from_surface(bitmap))
+            self._profiler.stop('record', started)
+
+    def handle_events(self):
         """
-        Handles clicking on the [X] button.
+        Handles clicking on the [X] button, panning and zooming.
         :return: True if user clicked on the [X], otherwise - False.
         """
+        viewport = self._viewport
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return True
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button in (4, 5):
+                # Mouse wheel: up - zoom in, down - zoom out
+                viewport.zoom(1 if event.button == 4 else -1, *event.pos)
+            elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+                viewport.pan(*event.rel)
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_LEFT:
+                    viewport.pan(PAN_STEP, 0)
+                elif event.key == pygame.K_RIGHT:
+                    viewport.pan(-PAN_STEP, 0)
+                elif event.key == pygame.K_UP:
+                    viewport.pan(0, PAN_STEP)
+                elif event.key == pygame.K_DOWN:
+                    viewport.pan(0, -PAN_STEP)
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    viewport.zoom(1)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    viewport.zoom(-1)
+                elif event.key == pygame.K_0:
+                    snapshot = self._runner.board_manager.snapshot()
+                    viewport.fit(snapshot.width, snapshot.height)
         return False
-
-
-def is_complete_simulation(iteration):
-    """
-    Compares current population of cells with minimum barrier and decides
-    whether to continue simulation or not.
-    :param iteration: statistics data.
-    :return: True - continue simulation, False - stop simulation.
-    """
-    for cell_id, cell_count in iteration.cells_counter.items():
-        min_population = settings_reg.find_option_by_key(cell_id, 'min')
-        if min_population is None:
-            continue
-        if min_population >= cell_count:
-            return True
-    return False
\ No newline at end of file
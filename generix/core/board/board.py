@@ -1,31 +1,48 @@
 """
 A module for a game board.
 """
-import copy
-
-import pygame
+import array
 
+from generix.core.cell.id import CellId
 from generix.core.cell.point import Point
-from generix.core.settings.registry import settings_reg
+from generix.core.board.neighbors import get_neighbor_table
+from generix.core.board.zobrist import cell_key
+from generix.core.data.statistics import IterationStatistics
 
 
-class Board(pygame.Surface):
+class Board:
     """
-    Board forms grid of cells  (cell managers).
+    Board forms grid of cells  (cell managers). Board only stores cells,
+    it is rendered from its snapshot (see board/renderer.py).
+
+    Cells are stored in a flat list indexed by x * height + y. Besides cells,
+    board keeps flat arrays of cells types and hp. Boards are double-buffered
+    (a new one is created on each tick), so once a tick is over, arrays are
+    never written again and can be handed off to other threads without copying.
     """
-    def __init__(self, width_n, height_n):
+    # Dense boards hold a cell in every slot, including empty ones
+    sparse = False
+
+    def __init__(self, width_n, height_n, toroidal=False, hashed=False):
         """
         Constructs Board instance.
         :param width_n: width of the board (amount of rows).
         :param height_n: height of the board (amount of columns).
+        :param toroidal: if True - edges of the board are wrapped around.
+        :param hashed: if True - Zobrist hash of the board is maintained (see board/zobrist.py).
         """
-        cell_data = settings_reg.find('cell')
-        super(Board, self).__init__((width_n * cell_data['width'], height_n * cell_data['height']))
         self._width = width_n
         self._height = height_n
-        self._grid = []
-        self._prev_point = Point(0, 0)
-        self._curr_point = Point(0, 0)
+        self._toroidal = toroidal
+        self._hashed = hashed
+        self._state_hash = 0
+        self._cells = []
+        self._types = array.array('b', bytes(width_n * height_n))
+        self._hps = array.array('i', bytes(4 * width_n * height_n))
+        self._neighbors = get_neighbor_table(width_n, height_n, toroidal)
+        self._statistics = IterationStatistics()
+        self._prev_index = 0
+        self._curr_index = 0
 
     def __iter__(self):
         """
@@ -39,25 +56,13 @@ class Board(pygame.Surface):
         Gets next CellManager object on the 2D board.
         :return: CellManager object.
         """
-        if self._curr_point.x == self._width:
-            self._curr_point.x = 0
+        if self._curr_index == len(self._cells):
+            self._curr_index = 0
             raise StopIteration
 
-        cell = self.get_cell(self._curr_point)
-
-        # Without shallow copy we will have prev_point reference
-        # to the curr_point, so in practice - it will be the same object,
-        # but we need them to exist separately. Shallow copy is enough for
-        # this purpose, no need in copy.deepcopy().
-        self._prev_point = copy.copy(self._curr_point)
-
-        if self._curr_point.y < self._height - 1:
-            self._curr_point.y += 1
-        else:
-            self._curr_point.x += 1
-            self._curr_point.y = 0
-
-        return cell
+        self._prev_index = self._curr_index
+        self._curr_index += 1
+        return self._cells[self._prev_index]
 
     @property
     def width(self):
@@ -68,12 +73,36 @@ class Board(pygame.Surface):
         return self._height
 
     @property
-    def curr_point(self):
-        return self._curr_point
+    def toroidal(self):
+        return self._toroidal
+
+    @property
+    def types(self):
+        return self._types
+
+    @property
+    def hps(self):
+        return self._hps
+
+    @property
+    def neighbors(self):
+        return self._neighbors
+
+    @property
+    def statistics(self):
+        return self._statistics
+
+    @property
+    def state_hash(self):
+        return self._state_hash
+
+    @property
+    def prev_index(self):
+        return self._prev_index
 
     @property
     def prev_point(self):
-        return self._prev_point
+        return Point(self._prev_index // self._height, self._prev_index % self._height)
 
     def get_cell(self, point):
         """
@@ -81,7 +110,41 @@ class Board(pygame.Surface):
         :param point: Point object.
         :return: CellManager object.
         """
-        return self._grid[point.x][point.y]
+        return self._cells[point.x * self._height + point.y]
+
+    def get_cell_at(self, i):
+        """
+        Gets cell by flat index.
+        :param i: flat index (x * height + y).
+        :return: Cell object.
+        """
+        return self._cells[i]
+
+    def cells(self):
+        """
+        Gets all cells in order of flat indexes (x * height + y).
+        The list is owned by the board and should not be modified.
+        :return: list of cells.
+        """
+        return self._cells
+
+    def occupied(self):
+        """
+        Gets non-empty cells in order of flat indexes.
+        :return: list of (<flat index>, <cell>) pairs.
+        """
+        empty = CellId.EMPTY_CELL.value
+        types = self._types
+        cells = self._cells
+        return [(i, cells[i]) for i in range(len(cells)) if types[i] != empty]
+
+    def snapshot(self, tick):
+        """
+        Makes snapshot of the board without copying its arrays.
+        :param tick: tick number.
+        :return: Snapshot object.
+        """
+        return Snapshot(tick, self._width, self._height, self._types, self._hps)
 
     def set_cell(self, point, cell):
         """
@@ -90,15 +153,90 @@ class Board(pygame.Surface):
         :param cell: Cell object.
         :return: None.
         """
-        self._grid[point.x][point.y] = cell
+        self.set_cell_at(point.x * self._height + point.y, cell)
+
+    def set_cell_at(self, i, cell):
+        """
+        Replaces cell by flat index.
+        Cell should not change its hp after it has been placed, otherwise
+        statistics will be inconsistent.
+        :param i: flat index (x * height + y).
+        :param cell: Cell object.
+        :return: None.
+        """
+        self._statistics.discard(self._cells[i])
+        self._statistics.add(cell)
+        if self._hashed:
+            self._state_hash ^= cell_key(i, self._cells[i]) ^ cell_key(i, cell)
+        self._cells[i] = cell
+        self._store(i, cell)
+
+    def change_hp(self, i, value):
+        """
+        Changes hp of a placed cell, keeping statistics consistent.
+        :param i: flat index of the cell.
+        :param value: delta of change, can be negative.
+        :return: None.
+        """
+        cell = self._cells[i]
+        self._statistics.discard(cell)
+        cell.change_hp(value)
+        self._statistics.add(cell)
+        self._hps[i] = cell.hp
 
     def append_cell(self, index, cell):
         """
-        Appends cell manager to the end of board.
-        :param index: index of appending place.
+        Appends cell manager to the end of board. Cells are appended column
+        by column.
+        :param index: index of appending place (x coordinate).
+        :param cell: Cell object.
+        :return: None.
+        """
+        if self._hashed:
+            self._state_hash ^= cell_key(len(self._cells), cell)
+        self._store(len(self._cells), cell)
+        self._cells.append(cell)
+        self._statistics.add(cell)
+
+    def _store(self, i, cell):
+        """
+        Stores type and hp of the cell in flat arrays.
+        :param i: flat index of the cell.
         :param cell: Cell object.
         :return: None.
         """
-        if index == len(self._grid):
-            self._grid.append([])
-        self._grid[index].append(cell)
+        self._types[i] = cell.id.value
+        self._hps[i] = getattr(cell, 'hp', 0)
+
+
+class Snapshot:
+    """
+    Immutable view of a board after a tick: flat arrays of cells types and hp
+    indexed by x * height + y. Arrays are handed off without copying, because
+    boards are double-buffered and never written once their tick is over.
+    """
+    __slots__ = ('tick', 'width', 'height', 'types', 'hps')
+
+    def __init__(self, tick, width, height, types, hps):
+        """
+        Constructs Snapshot object.
+        :param tick: tick number.
+        :param width: width of the board (amount of cells).
+        :param height: height of the board (amount of cells).
+        :param types: array of CellId values.
+        :param hps: array of health points.
+        """
+        self.tick = tick
+        self.width = width
+        self.height = height
+        self.types = types
+        self.hps = hps
+
+    def regions(self):
+        """
+        Gets regions of the board which hold cells. Dense board is a single
+        region, see ChunkedSnapshot for a board split into chunks.
+        :return: iterator of (<key>, <x>, <y>, <stride>, <types>, <hps>), where
+                 arrays of a region are indexed by local x * stride + local y.
+        """
+        yield (0, 0), 0, 0, self.height, self.types, self.hps
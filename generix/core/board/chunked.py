@@ -0,0 +1,350 @@
+"""
+A module for a chunked board. The grid is split into square chunks which are
+allocated on demand, empty chunks are implicit. Memory scales with occupied
+area rather than area of the world, so large sparse worlds fit in memory.
+"""
+import array
+import operator
+
+from generix.core.action.id import Action
+from generix.core.cell.cell import EmptyCell
+from generix.core.cell.id import CellId
+from generix.core.cell.point import Point
+from generix.core.genome.genome import Genome
+from generix.core.board.neighbors import OUT_OF_BOUNDS, SHIFTS
+from generix.core.board.zobrist import cell_key
+from generix.core.data.statistics import IterationStatistics
+
+
+CHUNK_SHIFT = 5
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# Empty slots share one cell, it is only read and never acts
+EMPTY = EmptyCell(Genome([Action.STAY]))
+
+
+class Chunk:
+    """
+    Square tile of a chunked board. Only non-empty cells are stored, their
+    types and hp are kept in flat arrays indexed by local x * CHUNK_SIZE + local y.
+    """
+    __slots__ = ('cells', 'types', 'hps')
+
+    def __init__(self):
+        """
+        Constructs Chunk object.
+        """
+        # Non-empty cells: {<local index>: <cell>}
+        self.cells = {}
+        self.types = array.array('b', bytes(CHUNK_SIZE * CHUNK_SIZE))
+        self.hps = array.array('i', bytes(4 * CHUNK_SIZE * CHUNK_SIZE))
+
+
+class NeighborView:
+    """
+    Computes neighbors on demand in the layout of a neighbor table (see
+    board/neighbors.py), which would be too large for a huge world.
+    """
+    __slots__ = ('_width', '_height', '_toroidal')
+
+    def __init__(self, width, height, toroidal=False):
+        """
+        Constructs NeighborView object.
+        :param width: width of the board (amount of cells).
+        :param height: height of the board (amount of cells).
+        :param toroidal: if True - edges of the board are wrapped around.
+        """
+        self._width = width
+        self._height = height
+        self._toroidal = toroidal
+
+    def __getitem__(self, k):
+        """
+        Gets neighbor of a cell.
+        :param k: flat index of the cell * 8 + direction index.
+        :return: flat index of the neighbor or OUT_OF_BOUNDS.
+        """
+        (i, d) = divmod(k, 8)
+        (x, y) = divmod(i, self._height)
+        (dx, dy) = SHIFTS[d]
+        x += dx
+        y += dy
+        if self._toroidal:
+            x %= self._width
+            y %= self._height
+        elif not (0 <= x < self._width and 0 <= y < self._height):
+            return OUT_OF_BOUNDS
+        return x * self._height + y
+
+
+class TypeView:
+    """
+    Reads types of cells of a chunked board by flat index, like the types
+    array of a dense board.
+    """
+    __slots__ = '_board'
+
+    def __init__(self, board):
+        """
+        Constructs TypeView object.
+        :param board: ChunkedBoard instance.
+        """
+        self._board = board
+
+    def __getitem__(self, i):
+        """
+        Gets type of a cell.
+        :param i: flat index of the cell.
+        :return: CellId value.
+        """
+        return self._board.get_cell_at(i).id.value
+
+
+class ChunkedBoard:
+    """
+    Board which stores cells in chunks of CHUNK_SIZE x CHUNK_SIZE cells.
+    It keeps the contract of Board: cells are addressed by points or flat
+    indexes (x * height + y), empty slots read as empty cells. Iteration
+    visits non-empty cells only, in order of flat indexes.
+
+    A chunk is allocated when the first cell is placed into it and dropped
+    when its last cell is removed. Like dense boards, chunked ones are
+    double-buffered, so chunk arrays can be handed off without copying.
+    """
+    # Empty cells are implicit, the board is never filled with them
+    sparse = True
+
+    def __init__(self, width_n, height_n, toroidal=False, hashed=False):
+        """
+        Constructs ChunkedBoard instance.
+        :param width_n: width of the board (amount of rows).
+        :param height_n: height of the board (amount of columns).
+        :param toroidal: if True - edges of the board are wrapped around.
+        :param hashed: if True - Zobrist hash of the board is maintained (see board/zobrist.py).
+        """
+        self._width = width_n
+        self._height = height_n
+        self._toroidal = toroidal
+        self._hashed = hashed
+        self._state_hash = 0
+        # Allocated chunks: {(<chunk x>, <chunk y>): <chunk>}
+        self._chunks = {}
+        self._neighbors = NeighborView(width_n, height_n, toroidal)
+        self._types = TypeView(self)
+        self._statistics = IterationStatistics()
+        self._statistics.fill(EMPTY, width_n * height_n)
+        self._prev_index = 0
+
+    def __iter__(self):
+        """
+        Iterates over non-empty cells.
+        :return: iterator of cells.
+        """
+        for i, cell in self.occupied():
+            self._prev_index = i
+            yield cell
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def toroidal(self):
+        return self._toroidal
+
+    @property
+    def types(self):
+        return self._types
+
+    @property
+    def neighbors(self):
+        return self._neighbors
+
+    @property
+    def statistics(self):
+        return self._statistics
+
+    @property
+    def chunks(self):
+        return self._chunks
+
+    @property
+    def state_hash(self):
+        return self._state_hash
+
+    @property
+    def prev_index(self):
+        return self._prev_index
+
+    @property
+    def prev_point(self):
+        return Point(self._prev_index // self._height, self._prev_index % self._height)
+
+    def get_cell(self, point):
+        """
+        Gets specific cell.
+        :param point: Point object.
+        :return: cell object.
+        """
+        return self.get_cell_at(point.x * self._height + point.y)
+
+    def get_cell_at(self, i):
+        """
+        Gets cell by flat index.
+        :param i: flat index (x * height + y).
+        :return: cell object.
+        """
+        (x, y) = divmod(i, self._height)
+        chunk = self._chunks.get((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT))
+        if chunk is None:
+            return EMPTY
+        return chunk.cells.get(((x & CHUNK_MASK) << CHUNK_SHIFT) | (y & CHUNK_MASK), EMPTY)
+
+    def occupied(self):
+        """
+        Gets non-empty cells in order of flat indexes. Only allocated chunks
+        are visited.
+        :return: list of (<flat index>, <cell>) pairs.
+        """
+        height = self._height
+        result = []
+        for (cx, cy), chunk in self._chunks.items():
+            x0 = cx << CHUNK_SHIFT
+            y0 = cy << CHUNK_SHIFT
+            for local, cell in chunk.cells.items():
+                x = x0 + (local >> CHUNK_SHIFT)
+                y = y0 + (local & CHUNK_MASK)
+                result.append((x * height + y, cell))
+        result.sort(key=operator.itemgetter(0))
+        return result
+
+    def snapshot(self, tick):
+        """
+        Makes snapshot of allocated chunks without copying their arrays.
+        :param tick: tick number.
+        :return: ChunkedSnapshot object.
+        """
+        chunks = {key: (chunk.types, chunk.hps) for key, chunk in self._chunks.items()}
+        return ChunkedSnapshot(tick, self._width, self._height, chunks)
+
+    def set_cell(self, point, cell):
+        """
+        Replaces current cell with a new one.
+        :param point: Point object.
+        :param cell: cell object.
+        :return: None.
+        """
+        self.set_cell_at(point.x * self._height + point.y, cell)
+
+    def set_cell_at(self, i, cell):
+        """
+        Replaces cell by flat index. Placing an empty cell frees the slot.
+        Cell should not change its hp after it has been placed, otherwise
+        statistics will be inconsistent.
+        :param i: flat index (x * height + y).
+        :param cell: cell object.
+        :return: None.
+        """
+        (x, y) = divmod(i, self._height)
+        key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)
+        local = ((x & CHUNK_MASK) << CHUNK_SHIFT) | (y & CHUNK_MASK)
+        is_empty = cell.id == CellId.EMPTY_CELL
+
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            if is_empty:
+                return
+            chunk = self._chunks[key] = Chunk()
+
+        self._statistics.discard(chunk.cells.get(local, EMPTY))
+        self._statistics.add(cell)
+        if self._hashed:
+            self._state_hash ^= cell_key(i, chunk.cells.get(local, EMPTY)) ^ cell_key(i, cell)
+
+        if is_empty:
+            chunk.cells.pop(local, None)
+            if not chunk.cells:
+                del self._chunks[key]
+                return
+        else:
+            chunk.cells[local] = cell
+        chunk.types[local] = cell.id.value
+        chunk.hps[local] = getattr(cell, 'hp', 0)
+
+    def change_hp(self, i, value):
+        """
+        Changes hp of a placed cell, keeping statistics consistent.
+        :param i: flat index of the cell (should not be empty).
+        :param value: delta of change, can be negative.
+        :return: None.
+        """
+        (x, y) = divmod(i, self._height)
+        chunk = self._chunks[(x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)]
+        local = ((x & CHUNK_MASK) << CHUNK_SHIFT) | (y & CHUNK_MASK)
+        cell = chunk.cells[local]
+        self._statistics.discard(cell)
+        cell.change_hp(value)
+        self._statistics.add(cell)
+        chunk.hps[local] = cell.hp
+
+
+class ChunkedSnapshot:
+    """
+    Immutable view of a chunked board after a tick: arrays of allocated
+    chunks by chunk coordinates. Dense arrays of the whole board are only
+    assembled on demand.
+    """
+    __slots__ = ('tick', 'width', 'height', 'chunks')
+
+    def __init__(self, tick, width, height, chunks):
+        """
+        Constructs ChunkedSnapshot object.
+        :param tick: tick number.
+        :param width: width of the board (amount of cells).
+        :param height: height of the board (amount of cells).
+        :param chunks: dict of (<types>, <hps>) arrays by chunk coordinates.
+        """
+        self.tick = tick
+        self.width = width
+        self.height = height
+        self.chunks = chunks
+
+    @property
+    def types(self):
+        return self._assemble(0, 'b')
+
+    @property
+    def hps(self):
+        return self._assemble(1, 'i')
+
+    def regions(self):
+        """
+        Gets allocated chunks, empty ones are skipped.
+        :return: iterator of (<key>, <x>, <y>, <stride>, <types>, <hps>).
+        """
+        for (cx, cy), (types, hps) in self.chunks.items():
+            yield (cx, cy), cx << CHUNK_SHIFT, cy << CHUNK_SHIFT, CHUNK_SIZE, types, hps
+
+    def _assemble(self, n, typecode):
+        """
+        Assembles dense array of the whole board indexed by x * height + y.
+        :param n: index of array in chunks data (0 - types, 1 - hps).
+        :param typecode: typecode of the array.
+        :return: array object.
+        """
+        height = self.height
+        result = array.array(typecode, [0]) * (self.width * height)
+        for (cx, cy), data in self.chunks.items():
+            values = data[n]
+            x0 = cx << CHUNK_SHIFT
+            y0 = cy << CHUNK_SHIFT
+            size = min(CHUNK_SIZE, height - y0)
+            for lx in range(min(CHUNK_SIZE, self.width - x0)):
+                start = (x0 + lx) * height + y0
+                result[start:start + size] = values[lx * CHUNK_SIZE:lx * CHUNK_SIZE + size]
+        return result
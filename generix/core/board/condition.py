@@ -0,0 +1,132 @@
+"""
+A module for conditions which decide when a simulation is complete.
+"""
+import enum
+import time
+
+from generix.core.cell.id import CellId
+
+
+@enum.unique
+class StopReason(enum.Enum):
+    POPULATION = 0
+    EXTINCTION = 1
+    MAX_TICKS = 2
+    STAGNATION = 3
+    TIME_BUDGET = 4
+    CYCLE = 5
+
+
+class StopConditions:
+    """
+    Stop conditions compiled once from the settings. Each condition is checked
+    in O(1) per tick against incrementally maintained board statistics.
+    """
+    def __init__(self, settings):
+        """
+        Constructs StopConditions instance.
+        :param settings: SettingsRegistry instance.
+        """
+        cell_ids = []
+        min_populations = []
+        extinct_ids = []
+        tracked_ids = []
+        for cell_id, cell_data in settings.find('cell').items():
+            if not isinstance(cell_id, CellId):
+                continue
+            min_population = settings.search(cell_data, 'min')
+            if min_population is not None:
+                cell_ids.append(cell_id)
+                min_populations.append(min_population)
+            if settings.search(cell_data, 'extinction'):
+                extinct_ids.append(cell_id)
+            if settings.search(cell_data, 'amount') is not None:
+                tracked_ids.append(cell_id)
+
+        # Vector of thresholds: (cell_id, min_population) pairs
+        self._thresholds = tuple(zip(cell_ids, min_populations))
+        self._extinct_ids = tuple(extinct_ids)
+        # Populations which are compared to detect stagnation
+        self._tracked_ids = tuple(tracked_ids)
+        self._max_ticks = settings.find('max_ticks')
+        self._time_budget = settings.find('time_budget')
+        self._stagnation_ticks = settings.find('stagnation_ticks')
+
+        self._ticks = 0
+        self._started_at = time.monotonic()
+        self._last_population = None
+        self._stagnant_ticks = 0
+
+    @property
+    def ticks(self):
+        return self._ticks
+
+    @property
+    def ticks_left(self):
+        """
+        Gets amount of ticks until the simulation is stopped by max_ticks or
+        by stagnation, if populations do not change.
+        :return: amount of ticks or None if there is no such limit.
+        """
+        limits = []
+        if self._max_ticks is not None:
+            limits.append(self._max_ticks - self._ticks)
+        if self._stagnation_ticks is not None and self._last_population is not None:
+            limits.append(self._stagnation_ticks - self._stagnant_ticks)
+        return min(limits) if limits else None
+
+    def reset(self):
+        """
+        Resets counters before a new simulation.
+        :return: None.
+        """
+        self._ticks = 0
+        self._started_at = time.monotonic()
+        self._last_population = None
+        self._stagnant_ticks = 0
+
+    def skip(self, ticks):
+        """
+        Registers skipped ticks (see ExperimentRunner.check_cycle). Populations
+        do not change while a simulation repeats itself.
+        :param ticks: amount of ticks.
+        :return: None.
+        """
+        self._ticks += ticks
+        if self._last_population is not None:
+            self._stagnant_ticks += ticks
+
+    def check(self, statistics):
+        """
+        Registers a new tick and checks whether simulation should be stopped.
+        :param statistics: IterationStatistics instance of the current board.
+        :return: StopReason value if simulation is complete, otherwise - None.
+        """
+        self._ticks += 1
+
+        for cell_id, min_population in self._thresholds:
+            if min_population >= statistics.count(cell_id):
+                return StopReason.POPULATION
+
+        for cell_id in self._extinct_ids:
+            if statistics.count(cell_id) == 0:
+                return StopReason.EXTINCTION
+
+        if self._max_ticks is not None and self._ticks >= self._max_ticks:
+            return StopReason.MAX_TICKS
+
+        if self._stagnation_ticks is not None:
+            population = tuple(statistics.count(cell_id) for cell_id in self._tracked_ids)
+            if population == self._last_population:
+                self._stagnant_ticks += 1
+                if self._stagnant_ticks >= self._stagnation_ticks:
+                    return StopReason.STAGNATION
+            else:
+                self._last_population = population
+                self._stagnant_ticks = 0
+
+        if self._time_budget is not None:
+            if time.monotonic() - self._started_at >= self._time_budget:
+                return StopReason.TIME_BUDGET
+
+        return None
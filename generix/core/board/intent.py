@@ -0,0 +1,181 @@
+"""
+A module for a two-phase tick: every cell emits an intent first, then
+conflicts between intents are resolved. The result of a tick does not
+depend on the order in which cells are visited.
+"""
+import array
+
+from generix.core.action.id import Action
+from generix.core.action.kernel import NONE, STAY, MOVE, EAT, DEAD, REPRODUCE
+from generix.core.action.registry import get_kernel
+from generix.core.cell.id import CellId
+
+
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def mix(value):
+    """
+    Mixes bits of a 64-bit integer (SplitMix64 finalizer).
+    :param value: integer.
+    :return: 64-bit integer.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+class IntentEngine:
+    """
+    Updates board in two phases:
+        1) intent: every cell executes its genome until a final action and
+           emits an intent (stay, move to or eat a target cell) into arrays;
+        2) resolve: among cells which claim the same target, a single winner
+           is chosen by a deterministic rule; losers stay where they are.
+    Rules:
+        'seeded' - priority is a hash of (seed, tick, index);
+        'index' - the lower index wins (same as the serial tick).
+    """
+    def __init__(self, settings, rule='seeded', seed=0):
+        """
+        Constructs IntentEngine instance.
+        :param settings: SettingsRegistry instance.
+        :param rule: conflict resolution rule ('seeded' or 'index').
+        :param seed: seed of the 'seeded' rule.
+        """
+        if rule not in ('seeded', 'index'):
+            raise ValueError('undefined resolve rule:', rule)
+        self._rule = rule
+        self._seed = seed
+        self._final_actions = frozenset(
+            action for action in Action if settings.find_option_by_key(action, 'is_final')
+        )
+        # Intent kernels by action: batched ones are used for final actions if present
+        self._intents = {}
+        self._batches = {}
+        for action in Action:
+            action_kernel = get_kernel(action)
+            if action_kernel.intent is not None:
+                self._intents[action] = action_kernel.intent
+            if action_kernel.batch is not None and action in self._final_actions:
+                self._batches[action] = action_kernel.batch
+        self._step_costs = {
+            cell_id: settings.find_option_by_key(cell_id, 'step_cost')
+            for cell_id in CellId if settings.find(cell_id) is not None
+        }
+
+    def tick(self, old_board, new_board, tick, sensor=None):
+        """
+        Updates cells of the old board and places them on the new one.
+        New board should be initialized with empty cells.
+        :param old_board: Board instance (current frame).
+        :param new_board: Board instance (new frame).
+        :param tick: tick number (seeds the 'seeded' rule).
+        :param sensor: FoodSensor instance updated for the old board (None - no LOOK actions).
+        :return: list of (<flat index>, <cell>) pairs of reproducing cells.
+        """
+        occupied = old_board.occupied()
+        (kinds, targets) = self.emit_intents(old_board, occupied, sensor)
+        winners = self.resolve(occupied, kinds, targets, tick)
+        self.apply(old_board, new_board, occupied, kinds, targets, winners)
+        # Reproducing cells stay where they are
+        return [occupied[k] for k, kind in enumerate(kinds) if kind == REPRODUCE]
+
+    def emit_intents(self, board, occupied, sensor=None):
+        """
+        Phase 1: executes genomes of cells and collects their intents.
+        :param board: Board instance (current frame).
+        :param occupied: list of (<flat index>, <cell>) pairs of non-empty cells.
+        :param sensor: FoodSensor instance (None - no LOOK actions).
+        :return: arrays of kinds and targets (flat indexes) of intents,
+                 in order of occupied cells.
+        """
+        n = len(occupied)
+        kinds = array.array('b', bytes(n))
+        targets = array.array('l', [-1]) * n
+        intents = self._intents
+        batches = self._batches
+        final_actions = self._final_actions
+        # Cells whose final action has a batched kernel: {<Action>: [(k, i, cell)]}
+        groups = {}
+        for k, (i, cell) in enumerate(occupied):
+            step_cost = self._step_costs.get(cell.id)
+            while True:
+                if step_cost:
+                    cell.change_hp(step_cost)
+                    if cell.hp <= 0:
+                        kinds[k] = DEAD
+                        break
+
+                action = cell.next_action()
+                if action in batches:
+                    groups.setdefault(action, []).append((k, i, cell))
+                    break
+                intent = intents.get(action)
+                if intent is None:
+                    raise ValueError('action is not supported by intent tick:', action)
+                result = intent(board, i, cell, sensor)
+
+                # If action is final - breaks execution. The control then moves to the next bot.
+                if action in final_actions:
+                    (kinds[k], targets[k]) = result or (STAY, -1)
+                    break
+
+        # Intents depend on the current frame only, so groups are filled in any order
+        for action, group in groups.items():
+            batches[action](board, group, kinds, targets, sensor)
+        return kinds, targets
+
+    def resolve(self, occupied, kinds, targets, tick):
+        """
+        Phase 2: chooses a single winner among cells claiming the same target.
+        :param occupied: list of (<flat index>, <cell>) pairs of non-empty cells.
+        :param kinds: array of kinds of intents.
+        :param targets: array of targets of intents.
+        :param tick: tick number.
+        :return: dict of winners: {<target>: <position of winner in occupied>}.
+        """
+        winners = {}
+        seeded = self._rule == 'seeded'
+        key = mix(self._seed * 0x100000001B3 + tick)
+        priorities = {}
+        for k, kind in enumerate(kinds):
+            if kind != MOVE and kind != EAT:
+                continue
+            target = targets[k]
+            i = occupied[k][0]
+            priority = mix(i ^ key) if seeded else i
+            winner = winners.get(target)
+            if winner is None or priority < priorities[winner]:
+                winners[target] = k
+            priorities[k] = priority
+        return winners
+
+    def apply(self, old_board, new_board, occupied, kinds, targets, winners):
+        """
+        Places cells on the new board according to the resolved intents.
+        :param old_board: Board instance (current frame).
+        :param new_board: Board instance (new frame).
+        :param occupied: list of (<flat index>, <cell>) pairs of non-empty cells.
+        :param kinds: array of kinds of intents.
+        :param targets: array of targets of intents.
+        :param winners: dict of winners by target.
+        :return: None.
+        """
+        # Cells which stay (including losers) keep their places
+        for k, kind in enumerate(kinds):
+            if kind == NONE or kind == DEAD:
+                continue
+            if (kind == MOVE or kind == EAT) and winners[targets[k]] == k:
+                continue
+            (i, cell) = occupied[k]
+            new_board.set_cell_at(i, cell)
+
+        # Winners take their targets (food placed above is eaten)
+        types = old_board.types
+        for target, k in winners.items():
+            cell = occupied[k][1]
+            if kinds[k] == EAT and types[target] == CellId.FOOD_CELL.value:
+                cell.change_hp(10)
+            new_board.set_cell_at(target, cell)
@@ -2,39 +2,87 @@
 A module for a BoardHandler which manages Board instance.
 """
 import json
+import random
 
-import pygame
-
-from generix.core.cell.factory import factory
 from generix.core.cell.id import CellId
 from generix.core.cell.point import Point, generate_random_point
 from generix.core.board.board import Board
-from generix.core.action.executor import execute, Action
-from generix.core.settings.registry import settings_reg
+from generix.core.board.chunked import ChunkedBoard
+from generix.core.board.intent import IntentEngine
+from generix.core.board.neighbors import DIRECTION_INDEX
+from generix.core.board.sensor import FoodSensor
+from generix.core.action.id import Action
+from generix.core.action.registry import get_kernel
+from generix.core.context import app_context
 from generix.core.settings.encoder import SettingsEncoder
-from generix.core.data.statistics import IterationStatistics
+from generix.core.data.profiler import NullProfiler
 
 
 class BoardManager:
     """
     Handles boards state and manages statistics.
     """
-    def __init__(self):
+    def __init__(self, profiler=None, context=None):
         """
         Constructs BoardManager instance.
+        :param profiler: Profiler instance (None - profiling is disabled).
+        :param context: AppContext instance (None - application context).
         """
-        self._board_data = settings_reg.find('board')
+        context = context or app_context
+        self._settings = context.settings
+        self._genomes = context.genomes
+        self._factory = context.factory
+        self._board_data = self._settings.find('board')
+        self._board_cls = ChunkedBoard if self._board_data.get('storage') == 'chunked' else Board
+        # Cycles are detected by board hashes
+        self._hashed = bool(
+            self._settings.find('state_hash') or self._settings.find('cycle_history')
+        )
         self._prev_board = None
         self._curr_board = None
-        self._statistics = IterationStatistics()
-        self._clock = pygame.time.Clock()
+        self._profiler = profiler or NullProfiler()
+        self._ticks = 0
+        self._engine = None
+        if self._settings.find('tick_mode') == 'intent':
+            self._engine = IntentEngine(
+                self._settings, self._settings.find('resolve_rule'), self._settings.find('seed')
+            )
+        self._final_actions = frozenset(
+            action for action in Action if self._settings.find_option_by_key(action, 'is_final')
+        )
+        # Reproducing cell types: {<CellId>: (<threshold>, <max population>, <allowed actions>)}
+        self._reproduction = {}
+        for cell_id, cell_data in self._settings.find('cell').items():
+            if not isinstance(cell_id, CellId):
+                continue
+            allowed_actions = self._settings.search(cell_data, 'allowed_actions') or ()
+            if Action.REPRODUCE in allowed_actions:
+                self._reproduction[cell_id] = (
+                    self._settings.search(cell_data, 'threshold') or 0,
+                    self._settings.search(cell_data, 'max'),
+                    allowed_actions,
+                )
+        self._births = []
+        # Food is sensed only if some cells can look for it
+        self._sensor = None
+        if self.is_action_allowed(Action.LOOK):
+            self._sensor = FoodSensor(self._settings.find('sensor_radius'))
+
+    @property
+    def board(self):
+        return self._curr_board
 
     @property
     def statistics(self):
-        return self._statistics
+        return self._curr_board.statistics
+
+    @property
+    def ticks(self):
+        return self._ticks
 
-    def renew_statistics(self):
-        self._statistics = IterationStatistics()
+    @property
+    def state_hash(self):
+        return self._curr_board.state_hash
 
     def save(self, path):
         """
@@ -63,57 +111,108 @@ class BoardManager:
 
         for location, cell_id_value in data.items():
             cell_id = CellId(cell_id_value)
-            if settings_reg.find_option_by_key(cell_id, 'save_location'):
+            if self._settings.find_option_by_key(cell_id, 'save_location'):
                 (x, y) = location.split(',')
-                self._curr_board.set_cell(Point(int(x), int(y)), factory.create_cell(cell_id))
+                self._curr_board.set_cell(Point(int(x), int(y)), self._factory.create_cell(cell_id))
 
     def create_new_board(self):
         """
         Creates new Board instance and initializes it.
         :return: None.
         """
-        self._curr_board = Board(self._board_data['rows'], self._board_data['cols'])
+        self._curr_board = self._board_cls(
+            self._board_data['rows'], self._board_data['cols'],
+            toroidal=self._board_data.get('topology') == 'toroidal', hashed=self._hashed
+        )
         self.init_board(self._curr_board)
         self.fill_board(self._curr_board)
 
-    def update(self, fps, refresh_rate):
+    def set_board(self, board):
         """
-        Updates board state.
-        :param fps: frames per second.
-        :param refresh_rate: refresh rate.
-        :return: updated board.
+        Makes a prepared board current, e.g. a board of a fixed scenario.
+        :param board: board instance.
+        :return: None.
         """
-        limit = pygame.time.get_ticks()
-        self._clock.tick(fps)
-        if pygame.time.get_ticks() - limit > refresh_rate:
-            self.switch_board()
-            self.init_board(self._curr_board, CellId.EMPTY_CELL)
+        self._curr_board = board
 
-            # Updates state of cells on the previous frame
+    def tick(self):
+        """
+        Makes one step of simulation.
+        :return: updated board.
+        """
+        profiler = self._profiler
+        profiler.begin_tick()
+
+        started = profiler.start()
+        self.switch_board()
+        self.init_board(self._curr_board, CellId.EMPTY_CELL)
+        profiler.stop('switch', started)
+
+        if self._sensor is not None:
+            started = profiler.start()
+            self._sensor.update(self._prev_board)
+            profiler.stop('sense', started)
+
+        # Updates state of cells on the previous frame
+        started = profiler.start()
+        if self._engine is None:
+            self._births = []
             for cell in self._prev_board:
-                self._statistics.update(cell.id)
                 self.update_cell(cell)
+            births = self._births
+        else:
+            births = self._engine.tick(
+                self._prev_board, self._curr_board, self._ticks, self._sensor
+            )
+        profiler.stop('update', started)
+
+        if births:
+            started = profiler.start()
+            self.place_births(births)
+            profiler.stop('births', started)
 
-            # Updates visual state on the current frame
-            for cell in self._curr_board:
-                self.render_cell(self._curr_board, cell)
+        self._ticks += 1
+        return self._curr_board
 
-            return self._curr_board
-        return None
+    def skip(self, ticks, hp_changes):
+        """
+        Skips ticks of a simulation which repeats itself: cells stay as they
+        are, only their hp changes. Hp is changed through the current board,
+        so its hp array and statistics stay consistent.
+        :param ticks: amount of ticks to skip.
+        :param hp_changes: list of (<cell>, <hp change>) pairs, cells should be
+                           placed on the current board.
+        :return: None.
+        """
+        board = self._curr_board
+        indexes = {id(cell): i for i, cell in board.occupied()}
+        for cell, change in hp_changes:
+            board.change_hp(indexes[id(cell)], change)
+        self._ticks += ticks
+
+    def snapshot(self):
+        """
+        Makes snapshot of the current board without copying its arrays.
+        :return: Snapshot object.
+        """
+        return self._curr_board.snapshot(self._ticks)
 
     def init_board(self, board, cell_name=None):
         """
-        Initializes board instance with cells.
+        Initializes board instance with cells. Sparse boards are empty from
+        the start and are not filled randomly.
         :param board: board to be initialized.
         :param cell_name: cell enum value. None means random.
         :return: None.
         """
+        if board.sparse:
+            return
         for x in range(board.width):
             for _ in range(board.height):
                 if cell_name:
-                    cell = factory.create_cell(cell_name)
+                    cell = self._factory.create_cell(cell_name)
                 else:
-                    cell = factory.create_random_cell()
+                    cell = self._factory.create_random_cell()
                 board.append_cell(x, cell)
 
     def fill_board(self, board):
@@ -123,10 +222,10 @@ class BoardManager:
         :param board: board to be filled.
         :return: None.
         """
-        for cell_id, cell_data in settings_reg.find('cell').items():
+        for cell_id, cell_data in self._settings.find('cell').items():
             if not isinstance(cell_data, dict):
                 continue
-            amount = settings_reg.search(cell_data, 'amount')
+            amount = self._settings.search(cell_data, 'amount')
             if amount is None:
                 continue
             while amount > 0:
@@ -134,7 +233,7 @@ class BoardManager:
                 curr_cell_id = self._curr_board.get_cell(point).id
                 # Check whether the cell is empty or not, to replace it.
                 if curr_cell_id == CellId.EMPTY_CELL:
-                    board.set_cell(point, factory.create_cell(cell_id))
+                    board.set_cell(point, self._factory.create_cell(cell_id))
                     amount -= 1
 
     def switch_board(self):
@@ -143,7 +242,10 @@ class BoardManager:
         :return: None.
         """
         self._prev_board = self._curr_board
-        self._curr_board = Board(self._curr_board.width, self._curr_board.height)
+        self._curr_board = self._board_cls(
+            self._curr_board.width, self._curr_board.height,
+            toroidal=self._curr_board.toroidal, hashed=self._hashed
+        )
 
     def update_cell(self, cell):
         """
@@ -151,131 +253,108 @@ class BoardManager:
         :param cell: CellId object.
         :return: None.
         """
+        context = {
+            'cell': cell,
+            'old_board': self._prev_board,
+            'new_board': self._curr_board,
+            'index': self._prev_board.prev_index,
+            'sensor': self._sensor,
+            'births': self._births,
+        }
         while True:
-            step_cost = settings_reg.find_option_by_key(cell.id, 'step_cost')
+            step_cost = self._settings.find_option_by_key(cell.id, 'step_cost')
             if step_cost:
                 cell.change_hp(step_cost)
                 if cell.hp <= 0:
                     break
 
-            # CellId is being used in every action, so passed explicitly
             action = cell.next_action()
-            execute(action, cell=cell, **self.prepare_action_context(action))
+            get_kernel(action).execute(context)
 
             # If action is final - breaks execution. The control then moves to the next bot.
-            if settings_reg.find_option_by_key(action, 'is_final'):
+            if action in self._final_actions:
                 break
 
-    def render_cell(self, board, cell):
-        cell_data = settings_reg.find('cell')
-
-        width = cell_data['width']
-        height = cell_data['height']
-
-        render(board, settings_reg.find_option_by_key(cell.id, 'color'), width, height)
-
-        if cell.id == CellId.HUNTER_CELL:
-            text_settings = cell_data['text']
-
-            font_size = width * text_settings['size_multiplier']
-            rendered_text = render_text(
-                str(cell.hp), text_settings['color'], text_settings['font'], int(font_size)
-            )
-
-            (x_pad, y_pad) = center_text_in_cell(
-                width, height,
-                rendered_text.get_width(),
-                rendered_text.get_height()
-            )
-
-            x = board.prev_point.x * width + x_pad
-            y = board.prev_point.y * height + y_pad
-
-            blit_text(board, rendered_text, (x, y))
-
-
-    def prepare_action_context(self, action):
-        if action == Action.EAT:
-            return {
-                'old_board': self._prev_board,
-                'new_board': self._curr_board,
-                'point': self._prev_board.prev_point,
-            }
-
-        elif action == Action.MOVE:
-            return {
-                'old_board': self._prev_board,
-                'new_board': self._curr_board,
-                'point': self._prev_board.prev_point,
-                'curr_cell_types': [CellId.EMPTY_CELL],
-                'next_cell_types': [CellId.EMPTY_CELL],
-            }
-
-        elif action == Action.STAY:
-            return {
-                'board': self._curr_board,
-                'point': self._prev_board.prev_point,
-            }
-
-        elif action == Action.TURN:
-            return { 'angle': 45 }
-
-        else:
-            raise ValueError('undefined action value:', action)
-
-    def get_survived_cells(self):
-        self._curr_board.
+    def place_births(self, births):
+        """
+        Places children of reproducing cells once all cells of the tick are
+        placed, in order of flat indexes of parents. A parent with enough hp
+        gives half of it to a child with a mutated genome, which takes the
+        first free neighbor starting from the direction of the parent. Births
+        beyond the maximum population are dropped.
+        :param births: list of (<flat index>, <cell>) pairs of parents.
+        :return: None.
+        """
+        board = self._curr_board
+        neighbors = board.neighbors
+        types = board.types
+        statistics = board.statistics
+        empty = CellId.EMPTY_CELL.value
+        for i, parent in births:
+            (threshold, max_population, allowed_actions) = self._reproduction[parent.id]
+            if parent.hp < threshold or parent.hp < 2:
+                continue
+            if max_population is not None and statistics.count(parent.id) >= max_population:
+                continue
 
-    def mutate_n_cells(self, n):
-        pass
+            base = i * 8
+            start = DIRECTION_INDEX[parent.direction]
+            for d in range(8):
+                j = neighbors[base + (start + d) % 8]
+                if j >= 0 and types[j] == empty:
+                    break
+            else:
+                continue
 
+            hp = parent.hp // 2
+            board.change_hp(i, -hp)
+            genome = parent.genome.clone()
+            genome.mutate(allowed_actions)
+            self._genomes.lineage.record(genome)
+            child = self._factory.create_child(parent.id, genome, hp)
+            board.set_cell_at(j, child)
 
-def render(board, color, cell_width, cell_height):
-    """
-    Renders cell square.
-    :param board: Board instance.
-    :param color: color code (RGB tuple).
-    :return: None.
-    """
-    board.fill(color, (
-        cell_width * board.prev_point.x,
-        cell_height * board.prev_point.y,
-        cell_width, cell_height
-    ))
-
+    def is_action_allowed(self, action):
+        """
+        Checks whether genomes of some cell type may have an action.
+        :param action: Action value.
+        :return: True - allowed, False - not allowed.
+        """
+        for cell_id, cell_data in self._settings.find('cell').items():
+            if not isinstance(cell_id, CellId):
+                continue
+            if action in (self._settings.search(cell_data, 'allowed_actions') or ()):
+                return True
+        return False
 
-def render_text(text, text_color=(255, 255, 255), font_name='Sans Serif', font_size=6):
-    """
-    Renders text.
-    :param text: text to render.
-    :param text_color: text color (RGB tuple).
-    :param font_name: font name.
-    :param font_size: font size.
-    :return: rendered text.
-    """
-    font = pygame.font.SysFont(font_name, font_size)
-    return font.render(text, False, text_color)
+    def get_survived_cells(self, cell_id=CellId.HUNTER_CELL):
+        """
+        Gets cells of a specific type which are alive on the current board.
+        :param cell_id: CellId value.
+        :return: list of cells.
+        """
+        return [cell for cell in self._curr_board if cell.id == cell_id]
 
+    def form_bots_generation(self, cell_id=CellId.HUNTER_CELL):
+        """
+        Forms genomes of the next generation from cells which survived on the
+        current board. Each survivor is cloned n times to restore population,
+        then n / 10 of clones are mutated. Genomes are put into the genome
+        registry, so they are picked when the next board is filled.
+        :param cell_id: CellId value.
+        :return: None.
+        """
+        survivors = self.get_survived_cells(cell_id)
+        if not survivors:
+            return
 
-def blit_text(board, rendered_text, position):
-    """
-    Renders text on a cell square.
-    :param board: Board instance.
-    :param text: text.
-    :return: None.
-    """
-    board.blit(rendered_text, position)
+        cell_data = self._settings.find(cell_id)
+        amount = self._settings.search(cell_data, 'amount') or len(survivors)
+        n = max(1, amount // len(survivors))
 
+        genomes = [cell.genome.clone() for cell in survivors for _ in range(n)]
+        for genome in random.sample(genomes, len(genomes) // 10):
+            genome.mutate(self._settings.search(cell_data, 'allowed_actions'))
 
-def center_text_in_cell(cell_width_px, cell_height_px, text_width_px, text_height_px):
-    """
-    Centers text in a cell.
-    :param cell_width_px: cell width (pixels).
-    :param cell_height_px: cell height (pixels).
-    :param text_width_px: text width (pixels).
-    :param text_height_px: text height (pixels).
-    :return: upper left corner of centered area.
-    """
-    x = int((cell_width_px - text_width_px) / 2)
-    y = int((cell_height_px - text_height_px) / 2)
-    return x, y
\ No newline at end of file
+        for genome in genomes:
+            self._genomes.create(cell_id, genome)
@@ -0,0 +1,69 @@
+"""
+A module for precomputed tables of neighboring cells. A table is a flat
+array of shape [cells x 8 directions]: table[i * 8 + d] is a flat index of
+the neighbor of cell i in direction d (see DIRECTION_INDEX) or OUT_OF_BOUNDS.
+"""
+import array
+import functools
+
+from generix.core.cell.direction import Direction
+
+
+OUT_OF_BOUNDS = -1
+
+# Shifts (dx, dy) by direction index, in order of Direction values
+SHIFTS = (
+    (0, -1),   # UP
+    (1, -1),   # UP_RIGHT
+    (1, 0),    # RIGHT
+    (1, 1),    # DOWN_RIGHT
+    (0, 1),    # DOWN
+    (-1, 1),   # DOWN_LEFT
+    (-1, 0),   # LEFT
+    (-1, -1),  # UP_LEFT
+)
+
+# Direction index (0..7) by Direction value
+DIRECTION_INDEX = {direction: direction.value // 45 for direction in Direction}
+
+
+# A process rarely uses boards of more than two sizes, and a table of a large
+# board takes hundreds of megabytes
+@functools.lru_cache(maxsize=2)
+def get_neighbor_table(width, height, toroidal=False):
+    """
+    Gets table of neighbors for a board size. Tables are cached, because
+    a new board of the same size is created on each tick. A table is filled
+    by slices: neighbors in a direction of a column of cells are a column of
+    consecutive indexes.
+    :param width: width of the board (amount of cells).
+    :param height: height of the board (amount of cells).
+    :param toroidal: if True - edges of the board are wrapped around,
+                     otherwise neighbors beyond edges are OUT_OF_BOUNDS.
+    :return: array of flat indexes.
+    """
+    table = array.array('i', [OUT_OF_BOUNDS]) * (width * height * 8)
+    indexes = array.array('i', range(width * height))
+    for x in range(width):
+        base = x * height * 8
+        for d, (dx, dy) in enumerate(SHIFTS):
+            nx = x + dx
+            if toroidal:
+                nx %= width
+            elif not 0 <= nx < width:
+                continue
+            column = nx * height
+            if toroidal:
+                # Neighbor of cell y is cell (y + dy) % height of the column
+                shift = dy % height
+                table[base + d:base + height * 8 + d:8] = (
+                    indexes[column + shift:column + height] + indexes[column:column + shift]
+                )
+            else:
+                # Cells whose neighbors are within the board
+                (y0, y1) = (max(-dy, 0), min(height - dy, height))
+                if y0 < y1:
+                    table[base + y0 * 8 + d:base + y1 * 8 + d:8] = (
+                        indexes[column + y0 + dy:column + y1 + dy]
+                    )
+    return table
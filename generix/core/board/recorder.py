@@ -0,0 +1,285 @@
+"""
+A module for a recorder which exports frames of a run to a PNG sequence or
+a video file in the background.
+"""
+import collections
+import concurrent.futures
+import multiprocessing
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+
+from generix.core.cell.id import CellId
+
+
+class RawFrame:
+    """
+    RGB frame (3 bytes per pixel, row by row).
+    """
+    __slots__ = ('width', 'height', 'data')
+
+    def __init__(self, width, height, data):
+        """
+        Constructs RawFrame object.
+        :param width: width of the frame (pixels).
+        :param height: height of the frame (pixels).
+        :param data: RGB bytes.
+        """
+        self.width = width
+        self.height = height
+        self.data = data
+
+
+def frame_from_surface(surface):
+    """
+    Makes frame of a rendered surface.
+    :param surface: pygame.Surface instance.
+    :return: RawFrame object.
+    """
+    import pygame
+
+    (width, height) = surface.get_size()
+    return RawFrame(width, height, pygame.image.tostring(surface, 'RGB'))
+
+
+def frame_from_snapshot(snapshot, colors):
+    """
+    Makes frame of a board snapshot (1 pixel per cell) without rendering.
+    :param snapshot: Snapshot object.
+    :param colors: dict of colors (RGB tuples) by CellId value.
+    :return: RawFrame object.
+    """
+    types = snapshot.types.tobytes()
+    height = snapshot.height
+    data = bytearray(3 * len(types))
+    for channel in range(3):
+        table = bytearray(256)
+        for cell_type, color in colors.items():
+            table[cell_type] = color[channel]
+        values = types.translate(table)
+        # Snapshot arrays are indexed by x * height + y, frames are stored row by row
+        data[channel::3] = b''.join(values[y::height] for y in range(height))
+    return RawFrame(snapshot.width, height, bytes(data))
+
+
+def make_colors(settings):
+    """
+    Gets colors of cells types from the settings.
+    :param settings: SettingsRegistry instance.
+    :return: dict of colors (RGB tuples) by CellId value.
+    """
+    return {
+        cell_id.value: settings.find_option_by_key(cell_id, 'color')
+        for cell_id in CellId if settings.find(cell_id) is not None
+    }
+
+
+def encode_png(frame, level=6):
+    """
+    Encodes frame as PNG (8-bit RGB).
+    :param frame: RawFrame object.
+    :param level: zlib compression level.
+    :return: PNG bytes.
+    """
+    stride = frame.width * 3
+    data = frame.data
+    # Each scanline starts with filter type 0 (none)
+    raw = b''.join(
+        b'\x00' + data[y * stride:(y + 1) * stride] for y in range(frame.height)
+    )
+    header = struct.pack('>IIBBBBB', frame.width, frame.height, 8, 2, 0, 0, 0)
+    return b''.join((
+        b'\x89PNG\r\n\x1a\n',
+        png_chunk(b'IHDR', header),
+        png_chunk(b'IDAT', zlib.compress(raw, level)),
+        png_chunk(b'IEND', b''),
+    ))
+
+
+def png_chunk(tag, payload):
+    """
+    Makes PNG chunk.
+    :param tag: chunk type.
+    :param payload: chunk data.
+    :return: chunk bytes.
+    """
+    crc = zlib.crc32(tag + payload) & 0xffffffff
+    return struct.pack('>I', len(payload)) + tag + payload + struct.pack('>I', crc)
+
+
+def write_png(path, frame):
+    """
+    Encodes frame and writes it to the file. Runs on a worker process.
+    :param path: path to the file.
+    :param frame: RawFrame object.
+    :return: None.
+    """
+    with open(path, mode='wb') as f:
+        f.write(encode_png(frame))
+
+
+class PngSequenceWriter:
+    """
+    Writes frames as numbered PNG files, encoding them on a process pool.
+    """
+    def __init__(self, dir_path, workers=None):
+        """
+        Constructs PngSequenceWriter instance.
+        :param dir_path: directory where frames are being written.
+        :param workers: amount of worker processes (None - amount of CPUs).
+        """
+        os.makedirs(dir_path, exist_ok=True)
+        self._dir_path = dir_path
+        self._pool = concurrent.futures.ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context('spawn')
+        )
+
+    def submit(self, index, frame):
+        """
+        Schedules writing of a frame.
+        :param index: frame number.
+        :param frame: RawFrame object.
+        :return: Future object.
+        """
+        path = os.path.join(self._dir_path, f'frame_{index:06d}.png')
+        return self._pool.submit(write_png, path, frame)
+
+    def close(self):
+        """
+        Waits for scheduled frames and stops workers.
+        :return: None.
+        """
+        self._pool.shutdown(wait=True)
+
+
+class VideoWriter:
+    """
+    Pipes frames to ffmpeg which encodes them into a video file on its own
+    threads. Frames are written to the pipe by a background thread in order.
+    """
+    def __init__(self, path, fps, compressed=True):
+        """
+        Constructs VideoWriter instance.
+        :param path: path to the video file (.mp4, .avi, ...).
+        :param fps: frames per second of the video.
+        :param compressed: if True - frames are encoded with MPEG-4,
+                           otherwise they are stored as raw video.
+        """
+        self._ffmpeg = shutil.which('ffmpeg')
+        if self._ffmpeg is None:
+            raise RuntimeError('ffmpeg was not found, video can not be recorded!')
+        self._path = path
+        self._fps = fps
+        self._compressed = compressed
+        self._process = None
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, index, frame):
+        """
+        Schedules writing of a frame.
+        :param index: frame number.
+        :param frame: RawFrame object.
+        :return: Future object.
+        """
+        return self._pool.submit(self._write, frame)
+
+    def close(self):
+        """
+        Waits for scheduled frames and finishes the video file.
+        :return: None.
+        """
+        self._pool.shutdown(wait=True)
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
+
+    def _write(self, frame):
+        """
+        Writes frame to the pipe, starting ffmpeg on the first frame.
+        :param frame: RawFrame object.
+        :return: None.
+        """
+        if self._process is None:
+            self._process = subprocess.Popen(
+                self._make_command(frame.width, frame.height), stdin=subprocess.PIPE
+            )
+        self._process.stdin.write(frame.data)
+
+    def _make_command(self, width, height):
+        """
+        Makes ffmpeg command line.
+        :param width: width of frames (pixels).
+        :param height: height of frames (pixels).
+        :return: list of arguments.
+        """
+        command = [
+            self._ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f'{width}x{height}', '-r', str(self._fps), '-i', '-',
+        ]
+        if self._compressed:
+            # yuv420p requires even dimensions
+            command += [
+                '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                '-c:v', 'mpeg4', '-q:v', '3', '-pix_fmt', 'yuv420p',
+            ]
+        else:
+            command += ['-c:v', 'rawvideo']
+        return command + [self._path]
+
+
+class Recorder:
+    """
+    Takes frames from the simulation and passes them to a writer. At most
+    'max_pending' frames are being encoded at once: when writers fall behind,
+    new frames are dropped instead of slowing down the simulation.
+    """
+    def __init__(self, writer, max_pending=8):
+        """
+        Constructs Recorder instance.
+        :param writer: PngSequenceWriter or VideoWriter instance.
+        :param max_pending: maximum amount of frames waiting for encoding.
+        """
+        self._writer = writer
+        self._max_pending = max_pending
+        self._pending = collections.deque()
+        self._index = 0
+        self._dropped = 0
+
+    @property
+    def recorded(self):
+        return self._index
+
+    @property
+    def dropped(self):
+        return self._dropped
+
+    def capture(self, frame):
+        """
+        Passes frame to the writer or drops it.
+        :param frame: RawFrame object.
+        :return: True - frame is scheduled, False - frame is dropped.
+        """
+        while self._pending and self._pending[0].done():
+            # Raises an error of the writer if there was any
+            self._pending.popleft().result()
+
+        if len(self._pending) >= self._max_pending:
+            self._dropped += 1
+            return False
+
+        self._pending.append(self._writer.submit(self._index, frame))
+        self._index += 1
+        return True
+
+    def close(self):
+        """
+        Waits for pending frames and closes the writer.
+        :return: None.
+        """
+        self._writer.close()
+        for future in self._pending:
+            future.result()
+        self._pending.clear()
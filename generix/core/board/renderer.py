@@ -0,0 +1,331 @@
+"""
+A module for a board renderer which draws board snapshots on a separate
+thread, so the simulation never waits for drawing. Boards larger than the
+window are panned and zoomed (see board/viewport.py).
+"""
+import math
+import threading
+
+import pygame
+
+from generix.core.cell.id import CellId
+from generix.core.board.recorder import make_colors
+from generix.core.board.viewport import visible_rect
+from generix.core.data.profiler import NullProfiler
+
+
+# Cells smaller than that (pixels) are drawn as a scaled image, without hp
+TEXT_MIN_PX = 16
+# Cells sampled per pixel (along each axis) of a density map
+DENSITY_SAMPLES = 2
+# Color of the window outside of the board
+BACKGROUND = (0, 0, 0)
+
+
+class LatestQueue:
+    """
+    Size-1 queue where the latest item wins: put() never blocks and replaces
+    the item which has not been taken yet.
+    """
+    def __init__(self):
+        """
+        Constructs LatestQueue instance.
+        """
+        self._item = None
+        self._condition = threading.Condition()
+
+    def put(self, item):
+        """
+        Puts item, replacing the pending one.
+        :param item: any object except None.
+        :return: None.
+        """
+        with self._condition:
+            self._item = item
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """
+        Takes item, waiting for it if there is none.
+        :param timeout: maximum time to wait (seconds).
+        :return: item or None if timeout expired.
+        """
+        with self._condition:
+            if self._item is None:
+                self._condition.wait(timeout)
+            item, self._item = self._item, None
+            return item
+
+
+class BoardRenderer(threading.Thread):
+    """
+    Draws snapshots on an offscreen surface of the window size. Only cells in
+    the view (see board/viewport.py) are drawn, so drawing depends on the size
+    of the window, not of the board:
+        - large cells are drawn one by one with hp of hunters, only cells
+          which changed since the previous snapshot are redrawn;
+        - small cells are put into an image (a pixel per cell) which is
+          scaled up;
+        - cells smaller than a pixel are sampled on a regular grid and scaled
+          down averaging their colors, so a pixel shows density of cell types
+          (a density map).
+    Finished frames are taken by the main thread, which owns the display and
+    the event pump.
+    """
+    def __init__(self, settings, profiler=None):
+        """
+        Constructs BoardRenderer instance.
+        :param settings: SettingsRegistry instance.
+        :param profiler: Profiler instance (None - profiling is disabled).
+        """
+        super(BoardRenderer, self).__init__(name='board-renderer', daemon=True)
+        window = settings.find('window')
+        self._size = (window['width'], window['height'])
+        self._text_settings = settings.find('cell')['text']
+        # Colors indexed by CellId values
+        self._colors = make_colors(settings)
+        self._palette = [BACKGROUND] * 256
+        for cell_type, color in self._colors.items():
+            self._palette[cell_type] = color
+        pygame.font.init()
+        # Fonts by cell size: {<pixels>: <font>}
+        self._fonts = {}
+        # Rendered hp texts: {(<cell size>, <hp>): <surface>}
+        self._texts = {}
+        self._profiler = profiler or NullProfiler()
+        self._snapshots = LatestQueue()
+        self._surface = None
+        # View and visible rectangle of cells which were drawn one by one
+        self._shown = None
+        # Types and hps of these cells
+        self._drawn = None
+        self._frame = None
+        self._frame_lock = threading.Lock()
+        self._running = True
+
+    def submit(self, snapshot, view):
+        """
+        Submits snapshot for drawing, replacing the one which is still waiting.
+        :param snapshot: Snapshot object.
+        :param view: (<x>, <y>, <scale>) tuple (see Viewport.view).
+        :return: None.
+        """
+        self._snapshots.put((snapshot, view))
+
+    def take_frame(self):
+        """
+        Takes the latest finished frame.
+        :return: pygame.Surface or None if no new frame was finished.
+        """
+        with self._frame_lock:
+            frame, self._frame = self._frame, None
+            return frame
+
+    def stop(self):
+        """
+        Stops drawing and waits for the thread.
+        :return: None.
+        """
+        self._running = False
+        self.join()
+
+    def run(self):
+        """
+        Draws submitted snapshots until stopped.
+        :return: None.
+        """
+        while self._running:
+            item = self._snapshots.get(timeout=0.1)
+            if item is None:
+                continue
+            started = self._profiler.start()
+            self.draw(*item)
+            frame = self._surface.copy()
+            with self._frame_lock:
+                self._frame = frame
+            self._profiler.stop('render', started)
+
+    def draw(self, snapshot, view):
+        """
+        Draws cells of the snapshot which are in the view.
+        :param snapshot: Snapshot object.
+        :param view: (<x>, <y>, <scale>) tuple (see Viewport.view).
+        :return: None.
+        """
+        if self._surface is None:
+            self._surface = pygame.Surface(self._size)
+        rect = visible_rect(view, *self._size, snapshot.width, snapshot.height)
+        if view[2] >= TEXT_MIN_PX:
+            self.draw_cells(snapshot, view, rect)
+        else:
+            self._shown = None
+            self._drawn = None
+            self.draw_image(snapshot, view, rect)
+
+    def draw_cells(self, snapshot, view, rect):
+        """
+        Draws visible cells one by one. If the view is the same as of the
+        previous snapshot, only cells which changed are redrawn.
+        :param snapshot: Snapshot object.
+        :param view: (<x>, <y>, <scale>) tuple.
+        :param rect: (<x>, <y>, <width>, <height>) of visible cells.
+        :return: None.
+        """
+        empty = CellId.EMPTY_CELL.value
+        (x, y, scale) = view
+        (x0, y0, width, height) = rect
+        # Edges of cells in the window (pixels) are rounded from the exact
+        # scale, so cells stay anchored to the view and leave no gaps
+        xs = [round((x0 + cx - x) * scale) for cx in range(width + 1)]
+        ys = [round((y0 + cy - y) * scale) for cy in range(height + 1)]
+        # Texts are of the same size in all cells
+        size = int(scale)
+        (types, hps) = crop(snapshot, x0, y0, width, height)
+
+        prev = self._drawn if self._shown == (view, rect) else None
+        if prev is None:
+            self._surface.fill(BACKGROUND)
+            area = pygame.Rect(xs[0], ys[0], xs[-1] - xs[0], ys[-1] - ys[0])
+            self._surface.fill(self._colors[empty], area.clip(self._surface.get_rect()))
+        for i in range(len(types)):
+            if prev is None:
+                # Surface is already filled with empty cells
+                if types[i] == empty:
+                    continue
+            elif prev[0][i] == types[i] and prev[1][i] == hps[i]:
+                continue
+            (cx, cy) = divmod(i, height)
+            self.draw_cell(
+                xs[cx], ys[cy], xs[cx + 1] - xs[cx], ys[cy + 1] - ys[cy], size, types[i], hps[i]
+            )
+        self._shown = (view, rect)
+        self._drawn = (types, hps)
+
+    def draw_image(self, snapshot, view, rect):
+        """
+        Draws visible cells as an image (a pixel per cell) scaled to the view.
+        :param snapshot: Snapshot object.
+        :param view: (<x>, <y>, <scale>) tuple.
+        :param rect: (<x>, <y>, <width>, <height>) of visible cells.
+        :return: None.
+        """
+        (x, y, scale) = view
+        (x0, y0, width, height) = rect
+        self._surface.fill(BACKGROUND)
+        if not width or not height:
+            return
+        # Cells smaller than a pixel are sampled, so cost depends on the window size only
+        step = max(math.ceil(1 / (scale * DENSITY_SAMPLES)), 1)
+        (types, _) = crop(snapshot, x0, y0, width, height, hps=False, step=step)
+        (columns, rows) = (-(-width // step), -(-height // step))
+        # Columns of cells are rows of the image, so it is transposed
+        image = pygame.image.fromstring(bytes(types), (rows, columns), 'P')
+        image.set_palette(self._palette)
+        image = pygame.transform.flip(pygame.transform.rotate(image, -90), True, False)
+
+        size = (max(round(width * scale), 1), max(round(height * scale), 1))
+        if scale >= 1:
+            image = pygame.transform.scale(image, size)
+        else:
+            # Colors are averaged in true color only
+            true_color = pygame.Surface(image.get_size(), 0, 32)
+            true_color.blit(image, (0, 0))
+            image = pygame.transform.smoothscale(true_color, size)
+        self._surface.blit(image, (round((x0 - x) * scale), round((y0 - y) * scale)))
+
+    def draw_cell(self, x, y, width, height, size, cell_type, hp):
+        """
+        Draws cell square (and hp of a hunter).
+        :param x: x of the upper left corner (pixels).
+        :param y: y of the upper left corner (pixels).
+        :param width: width of the cell (pixels).
+        :param height: height of the cell (pixels).
+        :param size: cell size which texts are rendered for (pixels).
+        :param cell_type: CellId value.
+        :param hp: health points.
+        :return: None.
+        """
+        # Surface.fill shifts (rather than clips) rectangles which start out of the surface
+        area = pygame.Rect(x, y, width, height).clip(self._surface.get_rect())
+        self._surface.fill(self._colors[cell_type], area)
+
+        if cell_type == CellId.HUNTER_CELL.value:
+            rendered_text = self._texts.get((size, hp))
+            if rendered_text is None:
+                rendered_text = self.get_font(size).render(
+                    str(hp), False, self._text_settings['color']
+                )
+                self._texts[(size, hp)] = rendered_text
+
+            (x_pad, y_pad) = center_text_in_cell(
+                width, height,
+                rendered_text.get_width(),
+                rendered_text.get_height()
+            )
+            self._surface.blit(rendered_text, (x + x_pad, y + y_pad))
+
+    def get_font(self, size):
+        """
+        Gets font of hp texts for a cell size.
+        :param size: cell size (pixels).
+        :return: pygame.font.Font instance.
+        """
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts[size] = pygame.font.SysFont(
+                self._text_settings['font'], int(size * self._text_settings['size_multiplier'])
+            )
+        return font
+
+
+def crop(snapshot, x0, y0, width, height, hps=True, step=1):
+    """
+    Copies a rectangle of cells of a snapshot. Regions of the snapshot (see
+    Snapshot.regions) which do not intersect the rectangle are skipped, the
+    rest are copied column by column.
+    :param snapshot: Snapshot object.
+    :param x0: x of the rectangle.
+    :param y0: y of the rectangle.
+    :param width: width of the rectangle (amount of cells).
+    :param height: height of the rectangle (amount of cells).
+    :param hps: True - health points are copied too.
+    :param step: only every step-th cell of every step-th column is copied.
+    :return: (<types>, <hps>) indexed by local x * rows + local y, where rows
+             is the amount of copied cells of a column: bytearray of CellId
+             values and list of health points (None if not copied).
+    """
+    columns = -(-width // step)
+    rows = -(-height // step)
+    types = bytearray([CellId.EMPTY_CELL.value]) * (columns * rows)
+    result_hps = [0] * (columns * rows) if hps else None
+    y1 = y0 + height
+    for _, rx, ry, stride, region_types, region_hps in snapshot.regions():
+        # Copied columns and cells of a column which are in the region
+        first_column = max(-(-(rx - x0) // step), 0)
+        last_column = min(-(-(rx + len(region_types) // stride - x0) // step), columns)
+        first_row = max(-(-(ry - y0) // step), 0)
+        last_row = min(-(-(min(ry + stride, y1) - y0) // step), rows)
+        if first_column >= last_column or first_row >= last_row:
+            continue
+        n = last_row - first_row
+        for column in range(first_column, last_column):
+            src = (x0 + column * step - rx) * stride + y0 + first_row * step - ry
+            dst = column * rows + first_row
+            types[dst:dst + n] = region_types[src:src + (n - 1) * step + 1:step]
+            if hps:
+                result_hps[dst:dst + n] = region_hps[src:src + (n - 1) * step + 1:step]
+    return types, result_hps
+
+
+def center_text_in_cell(cell_width_px, cell_height_px, text_width_px, text_height_px):
+    """
+    Centers text in a cell.
+    :param cell_width_px: cell width (pixels).
+    :param cell_height_px: cell height (pixels).
+    :param text_width_px: text width (pixels).
+    :param text_height_px: text height (pixels).
+    :return: upper left corner of centered area.
+    """
+    x = int((cell_width_px - text_width_px) / 2)
+    y = int((cell_height_px - text_height_px) / 2)
+    return x, y
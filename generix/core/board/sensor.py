@@ -0,0 +1,185 @@
+"""
+A module for a food sensor. Once per tick the sensor maintains a distance
+field to the nearest food within a radius (multi-source BFS over 8 neighbors,
+walls block the way), so a cell queries distance and direction to food in O(1).
+
+A tick usually changes a few food cells (eaten ones), so the field is updated
+incrementally: cells whose nearest food was eaten are reset and filled again
+from the rest of the field, new food is spread from itself. The field is rebuilt
+when many cells have changed or walls have moved (e.g. on a new simulation).
+"""
+import re
+
+from generix.core.cell.direction import Direction
+from generix.core.cell.id import CellId
+
+
+# Directions by direction index (see board/neighbors.py)
+DIRECTIONS = tuple(Direction)
+
+
+def find_cells(board, cell_id):
+    """
+    Gets flat indexes of cells of a type.
+    :param board: board instance.
+    :param cell_id: CellId value.
+    :return: list of flat indexes (ascending).
+    """
+    if board.sparse:
+        return [i for i, cell in board.occupied() if cell.id == cell_id]
+    # Scans bytes of the types array instead of cells
+    pattern = re.escape(bytes([cell_id.value]))
+    return [match.start() for match in re.finditer(pattern, board.types.tobytes())]
+
+
+class FoodSensor:
+    """
+    Distance field to the nearest food. Only cells within the radius of some
+    food are stored: {<flat index>: <distance>}, with the food each distance
+    comes from (to know which cells to reset once that food is eaten).
+    """
+    def __init__(self, radius, cell_id=CellId.FOOD_CELL):
+        """
+        Constructs FoodSensor instance.
+        :param radius: maximum distance to sense food at.
+        :param cell_id: CellId value of cells to sense.
+        """
+        self._radius = radius
+        self._cell_id = cell_id
+        self._shape = None
+        self._neighbors = None
+        self._food = frozenset()
+        self._walls = frozenset()
+        self._distances = {}
+        self._sources = {}
+
+    @property
+    def radius(self):
+        return self._radius
+
+    def update(self, board):
+        """
+        Updates the field to food of a board.
+        :param board: board instance (the one cells are read from).
+        :return: None.
+        """
+        food = frozenset(find_cells(board, self._cell_id))
+        walls = frozenset(find_cells(board, CellId.WALL_CELL))
+        added = food - self._food
+        removed = self._food - food
+
+        shape = (board.width, board.height, board.toroidal)
+        # Boards are replaced on each tick, but keep their size and topology
+        self._neighbors = board.neighbors
+        if shape != self._shape or walls != self._walls \
+                or 2 * (len(added) + len(removed)) > len(food):
+            self._shape = shape
+            self._walls = walls
+            self._distances = {}
+            self._sources = {}
+            seeds = [(i, 0, i) for i in food]
+        else:
+            seeds = self._reset(removed)
+            seeds.extend((i, 0, i) for i in added)
+        self._food = food
+        self._spread(seeds)
+
+    def distance(self, i):
+        """
+        Gets distance to the nearest food.
+        :param i: flat index of the cell.
+        :return: amount of steps or None if there is no food within the radius.
+        """
+        return self._distances.get(i)
+
+    def direction(self, i):
+        """
+        Gets direction of the first step to the nearest food. Among equal
+        steps the lowest direction index is taken, so the result does not
+        depend on the order of updates.
+        :param i: flat index of the cell.
+        :return: Direction value or None if there is no food within the radius.
+        """
+        distance = self._distances.get(i)
+        if not distance:
+            return None
+        base = i * 8
+        for d in range(8):
+            j = self._neighbors[base + d]
+            if j >= 0 and self._distances.get(j) == distance - 1:
+                return DIRECTIONS[d]
+        return None
+
+    def _reset(self, removed):
+        """
+        Removes cells whose nearest food was removed.
+        :param removed: set of flat indexes of removed food.
+        :return: list of (<flat index>, <distance>, <source>) seeds which fill
+                 removed cells from their remaining neighbors.
+        """
+        if not removed:
+            return []
+
+        distances = self._distances
+        sources = self._sources
+        neighbors = self._neighbors
+        # Cells of a food are connected: each one is a neighbor of a closer one
+        region = [i for i in removed if i in sources]
+        for i in region:
+            del distances[i]
+            del sources[i]
+        k = 0
+        while k < len(region):
+            base = region[k] * 8
+            k += 1
+            for d in range(8):
+                j = neighbors[base + d]
+                if j >= 0 and sources.get(j) in removed:
+                    del distances[j]
+                    del sources[j]
+                    region.append(j)
+
+        seeds = []
+        for i in region:
+            base = i * 8
+            for d in range(8):
+                j = neighbors[base + d]
+                distance = distances.get(j)
+                if distance is not None and distance < self._radius:
+                    seeds.append((i, distance + 1, sources[j]))
+        return seeds
+
+    def _spread(self, seeds):
+        """
+        Spreads distances from seeds until the radius (BFS with a bucket
+        queue, because seeds have different distances).
+        :param seeds: list of (<flat index>, <distance>, <source>) tuples.
+        :return: None.
+        """
+        radius = self._radius
+        distances = self._distances
+        sources = self._sources
+        neighbors = self._neighbors
+        walls = self._walls
+
+        buckets = [[] for _ in range(radius + 1)]
+        for i, distance, source in seeds:
+            if i not in walls and distance < distances.get(i, radius + 1):
+                distances[i] = distance
+                sources[i] = source
+                buckets[distance].append(i)
+
+        for distance in range(radius):
+            for i in buckets[distance]:
+                # Cell was reached by a closer food after it had been queued
+                if distances[i] != distance:
+                    continue
+                source = sources[i]
+                base = i * 8
+                for d in range(8):
+                    j = neighbors[base + d]
+                    if j < 0 or j in walls or distances.get(j, radius + 1) <= distance + 1:
+                        continue
+                    distances[j] = distance + 1
+                    sources[j] = source
+                    buckets[distance + 1].append(j)
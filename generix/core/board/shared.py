@@ -0,0 +1,295 @@
+"""
+A module for a board published in shared memory, so observers in other
+processes (analyzers, recorders, viewers) read frames without pickling.
+
+Block layout (little-endian):
+    header: magic, layout version, width, height, sequence number;
+    two frame buffers: tick, hp (int32), types (int8), directions (int8).
+
+Frames are written with a seqlock over a double buffer. Sequence number is
+odd while frame n = (seq + 1) // 2 is being written into buffer n % 2 and
+even once it is complete, so the last complete frame is seq // 2. That frame
+stays untouched until the writer starts frame + 2, i.e. while seq < 2 * frame + 3.
+Writer never waits for readers.
+"""
+import array
+import struct
+from multiprocessing import shared_memory
+
+from generix.core.board.neighbors import DIRECTION_INDEX
+
+
+MAGIC = b'GXSB'
+LAYOUT_VERSION = 1
+HEADER = struct.Struct('<4sHHIIQ')
+TICK = struct.Struct('<q')
+# Offset of the sequence number in the header
+SEQ_OFFSET = HEADER.size - 8
+# Direction of cells which have none
+NO_DIRECTION = -1
+
+# Names of blocks created by writers of the current process
+_created = set()
+
+
+def frame_size(width, height):
+    """
+    Gets size of a frame buffer, aligned to 8 bytes.
+    :param width: width of the board (amount of cells).
+    :param height: height of the board (amount of cells).
+    :return: size in bytes.
+    """
+    n = width * height
+    size = TICK.size + 4 * n + n + n
+    return (size + 7) // 8 * 8
+
+
+def attach(name):
+    """
+    Attaches to an existing block. The block is owned by its writer, so it
+    is not unlinked when the observer exits.
+    :param name: name of the block.
+    :return: SharedMemory object.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 tracks attached blocks too and unlinks them at exit
+        from multiprocessing import resource_tracker
+
+        block = shared_memory.SharedMemory(name=name)
+        # A block of a writer of this process is tracked once for both
+        if name not in _created:
+            resource_tracker.unregister(block._name, 'shared_memory')
+        return block
+
+
+def unlink(block):
+    """
+    Removes an attached block. Unlike SharedMemory.unlink, it does not
+    unregister the block from tracking, which attach has done already.
+    :param block: SharedMemory object (see attach).
+    :return: None.
+    """
+    try:
+        from _posixshmem import shm_unlink
+    except ImportError:
+        # Windows removes a block with its last handle
+        return
+    shm_unlink(block._name)
+
+
+class SharedBoardWriter:
+    """
+    Publishes board frames into a shared memory block. The block is created
+    on the first frame (its size depends on the board) and removed on close.
+    """
+    def __init__(self, name):
+        """
+        Constructs SharedBoardWriter instance.
+        :param name: name of the block.
+        """
+        self._name = name
+        self._block = None
+        self._width = None
+        self._height = None
+        self._seq = 0
+
+    @property
+    def name(self):
+        return self._name
+
+    def publish(self, board, tick):
+        """
+        Writes board as the next frame.
+        :param board: Board instance.
+        :param tick: tick number.
+        :return: None.
+        """
+        if self._block is None:
+            self._create(board.width, board.height)
+        elif (board.width, board.height) != (self._width, self._height):
+            raise ValueError('board size differs from the shared one:', board.width, board.height)
+
+        n = self._width * self._height
+        snapshot = board.snapshot(tick)
+        directions = bytearray(NO_DIRECTION.to_bytes(1, 'little', signed=True) * n)
+        for i, cell in board.occupied():
+            direction = getattr(cell, 'direction', None)
+            if direction is not None:
+                directions[i] = DIRECTION_INDEX[direction]
+
+        buf = self._block.buf
+        frame = self._seq // 2 + 1
+        offset = HEADER.size + (frame % 2) * frame_size(self._width, self._height)
+
+        # Odd sequence number: frame is being written
+        self._seq += 1
+        struct.pack_into('<Q', buf, SEQ_OFFSET, self._seq)
+
+        TICK.pack_into(buf, offset, tick)
+        offset += TICK.size
+        buf[offset:offset + 4 * n] = memoryview(snapshot.hps).cast('B')
+        offset += 4 * n
+        buf[offset:offset + n] = memoryview(snapshot.types).cast('B')
+        offset += n
+        buf[offset:offset + n] = directions
+
+        self._seq += 1
+        struct.pack_into('<Q', buf, SEQ_OFFSET, self._seq)
+
+    def close(self):
+        """
+        Removes the block. Observers which are attached keep their mapping.
+        :return: None.
+        """
+        if self._block is None:
+            return
+        self._block.close()
+        self._block.unlink()
+        self._block = None
+        _created.discard(self._name)
+
+    def _create(self, width, height):
+        """
+        Creates the block and writes its header.
+        :param width: width of the board (amount of cells).
+        :param height: height of the board (amount of cells).
+        :return: None.
+        """
+        size = HEADER.size + 2 * frame_size(width, height)
+        try:
+            self._block = shared_memory.SharedMemory(name=self._name, create=True, size=size)
+        except FileExistsError:
+            # Left by a writer which crashed
+            stale = attach(self._name)
+            stale.close()
+            unlink(stale)
+            self._block = shared_memory.SharedMemory(name=self._name, create=True, size=size)
+        _created.add(self._name)
+        self._width = width
+        self._height = height
+        self._seq = 0
+        HEADER.pack_into(self._block.buf, 0, MAGIC, LAYOUT_VERSION, 0, width, height, self._seq)
+
+
+class SharedFrame:
+    """
+    Frame read from shared memory. It looks like a board snapshot, so it can
+    be drawn or recorded the same way (arrays are indexed by x * height + y).
+    """
+    __slots__ = ('tick', 'width', 'height', 'types', 'hps', 'directions', 'number', '_reader')
+
+    def __init__(self, tick, width, height, types, hps, directions, number, reader):
+        """
+        Constructs SharedFrame object.
+        :param tick: tick number.
+        :param width: width of the board (amount of cells).
+        :param height: height of the board (amount of cells).
+        :param types: array or memoryview of CellId values.
+        :param hps: array or memoryview of health points.
+        :param directions: array or memoryview of direction indexes (-1 - none).
+        :param number: frame number.
+        :param reader: SharedBoardReader instance.
+        """
+        self.tick = tick
+        self.width = width
+        self.height = height
+        self.types = types
+        self.hps = hps
+        self.directions = directions
+        self.number = number
+        self._reader = reader
+
+    @property
+    def consistent(self):
+        # Views of the frame are valid until the writer starts frame + 2
+        return self._reader.seq < 2 * self.number + 3
+
+    def regions(self):
+        """
+        Gets regions of the frame (see Snapshot.regions).
+        :return: iterator of (<key>, <x>, <y>, <stride>, <types>, <hps>).
+        """
+        yield (0, 0), 0, 0, self.height, self.types, self.hps
+
+
+class SharedBoardReader:
+    """
+    Reads frames published by SharedBoardWriter in another process.
+    """
+    def __init__(self, name):
+        """
+        Constructs SharedBoardReader instance.
+        :param name: name of the block.
+        """
+        self._block = attach(name)
+        (magic, version, _, width, height, _) = HEADER.unpack_from(self._block.buf, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            self._block.close()
+            raise ValueError('not a shared board:', name)
+        self._width = width
+        self._height = height
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def seq(self):
+        return struct.unpack_from('<Q', self._block.buf, SEQ_OFFSET)[0]
+
+    def view(self):
+        """
+        Gets the last complete frame without copying: its arrays are views
+        of shared memory. Frame should be checked with 'consistent' after it
+        has been used, and views should be released before the reader is closed.
+        :return: SharedFrame object or None if nothing was published yet.
+        """
+        number = self.seq // 2
+        if number == 0:
+            return None
+
+        n = self._width * self._height
+        offset = HEADER.size + (number % 2) * frame_size(self._width, self._height)
+        buf = self._block.buf
+        (tick,) = TICK.unpack_from(buf, offset)
+        offset += TICK.size
+        hps = buf[offset:offset + 4 * n].cast('i')
+        offset += 4 * n
+        types = buf[offset:offset + n].cast('b')
+        offset += n
+        directions = buf[offset:offset + n].cast('b')
+        return SharedFrame(
+            tick, self._width, self._height, types, hps, directions, number, self
+        )
+
+    def read(self):
+        """
+        Gets a consistent copy of the last complete frame.
+        :return: SharedFrame object or None if nothing was published yet.
+        """
+        while True:
+            frame = self.view()
+            if frame is None:
+                return None
+            copies = []
+            for typecode, values in (('b', frame.types), ('i', frame.hps), ('b', frame.directions)):
+                copy = array.array(typecode)
+                copy.frombytes(values.cast('B'))
+                values.release()
+                copies.append(copy)
+            if frame.consistent:
+                (frame.types, frame.hps, frame.directions) = copies
+                return frame
+
+    def close(self):
+        """
+        Detaches from the block.
+        :return: None.
+        """
+        self._block.close()
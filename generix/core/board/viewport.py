@@ -0,0 +1,136 @@
+"""
+A module for a viewport: the part of the board which is shown in the window.
+A view is (<x>, <y>, <scale>): board coordinates (cells, fractional) of the
+upper left corner of the window and size of a cell in pixels. The board can be
+panned and zoomed in and out down to the scale at which it fits the window.
+
+Views are tuples, so the main thread (which handles events) hands them to the
+renderer thread without locking.
+"""
+import math
+
+
+# Zoom factor of one step (e.g. a mouse wheel notch)
+ZOOM_STEP = 1.25
+# Maximum zoom relative to the cell size of the settings
+MAX_ZOOM = 4
+
+
+class Viewport:
+    """
+    Pan and zoom of the board in the window.
+    """
+    def __init__(self, width_px, height_px, cell_px):
+        """
+        Constructs Viewport instance.
+        :param width_px: window width (pixels).
+        :param height_px: window height (pixels).
+        :param cell_px: cell size (pixels) without zoom.
+        """
+        self._width_px = width_px
+        self._height_px = height_px
+        self._cell_px = cell_px
+        self._board_width = 1
+        self._board_height = 1
+        self._x = 0.0
+        self._y = 0.0
+        self._scale = cell_px
+
+    @property
+    def view(self):
+        return self._x, self._y, self._scale
+
+    @property
+    def min_scale(self):
+        # The whole board fits the window (or cells are not shrunk if it fits anyway)
+        return min(
+            self._cell_px,
+            self._width_px / self._board_width,
+            self._height_px / self._board_height
+        )
+
+    def fit(self, board_width, board_height):
+        """
+        Shows the board from its upper left corner: cells are of size from the
+        settings if the board fits the window, otherwise they are shrunk.
+        :param board_width: width of the board (amount of cells).
+        :param board_height: height of the board (amount of cells).
+        :return: None.
+        """
+        self._board_width = max(board_width, 1)
+        self._board_height = max(board_height, 1)
+        self._scale = self.min_scale
+        self._x = 0.0
+        self._y = 0.0
+
+    def resize(self, board_width, board_height):
+        """
+        Keeps the view when the size of the board changes (e.g. a new board),
+        refitting only if needed.
+        :param board_width: width of the board (amount of cells).
+        :param board_height: height of the board (amount of cells).
+        :return: None.
+        """
+        if (board_width, board_height) == (self._board_width, self._board_height):
+            return
+        self._board_width = max(board_width, 1)
+        self._board_height = max(board_height, 1)
+        self._scale = max(self._scale, self.min_scale)
+        self._clamp()
+
+    def pan(self, dx_px, dy_px):
+        """
+        Moves the board.
+        :param dx_px: horizontal shift (pixels), positive - the board moves right.
+        :param dy_px: vertical shift (pixels), positive - the board moves down.
+        :return: None.
+        """
+        self._x -= dx_px / self._scale
+        self._y -= dy_px / self._scale
+        self._clamp()
+
+    def zoom(self, steps, px=None, py=None):
+        """
+        Zooms keeping the board point under a window point in place.
+        :param steps: amount of zoom steps, positive - zoom in, negative - zoom out.
+        :param px: x of the window point (pixels), None - center of the window.
+        :param py: y of the window point (pixels), None - center of the window.
+        :return: None.
+        """
+        px = self._width_px / 2 if px is None else px
+        py = self._height_px / 2 if py is None else py
+        scale = self._scale * ZOOM_STEP ** steps
+        scale = min(max(scale, self.min_scale), self._cell_px * MAX_ZOOM)
+        self._x += px / self._scale - px / scale
+        self._y += py / self._scale - py / scale
+        self._scale = scale
+        self._clamp()
+
+    def _clamp(self):
+        """
+        Keeps the board in the window: no empty space is shown on a side unless
+        the board is smaller than the window.
+        :return: None.
+        """
+        max_x = self._board_width - self._width_px / self._scale
+        max_y = self._board_height - self._height_px / self._scale
+        self._x = min(max(self._x, 0.0), max(max_x, 0.0))
+        self._y = min(max(self._y, 0.0), max(max_y, 0.0))
+
+
+def visible_rect(view, width_px, height_px, board_width, board_height):
+    """
+    Gets cells which are (at least partially) visible.
+    :param view: (<x>, <y>, <scale>) tuple (see Viewport.view).
+    :param width_px: window width (pixels).
+    :param height_px: window height (pixels).
+    :param board_width: width of the board (amount of cells).
+    :param board_height: height of the board (amount of cells).
+    :return: (<x>, <y>, <width>, <height>) of the rectangle (amount of cells).
+    """
+    (x, y, scale) = view
+    x0 = min(int(x), board_width)
+    y0 = min(int(y), board_height)
+    x1 = min(math.ceil(x + width_px / scale), board_width)
+    y1 = min(math.ceil(y + height_px / scale), board_height)
+    return x0, y0, max(x1 - x0, 0), max(y1 - y0, 0)
@@ -0,0 +1,76 @@
+"""
+A module for Zobrist hashing of boards. A board hash is XOR of keys of its
+cells: a key depends on a cell type and location, for cells which have
+a direction also on the direction, the current action of the genome and
+the genome itself. Empty cells have no key, so dense and chunked boards with
+the same cells have the same hash. Boards update their hash as cells are
+placed, so it costs O(1) per placement and can be compared every tick (e.g. to
+check that another engine produces the same boards).
+
+Hp of cells is not hashed: it does not affect decisions of cells, so boards
+which repeat with different hp (hunters running in a loop) are recognized
+as a cycle, and hp is extrapolated instead (see ExperimentRunner.check_cycle).
+"""
+import collections
+
+from generix.core.board.intent import mix, MASK_64
+from generix.core.board.neighbors import DIRECTION_INDEX
+from generix.core.cell.id import CellId
+
+
+def cell_key(i, cell):
+    """
+    Gets Zobrist key of a cell.
+    :param i: flat index of the cell.
+    :param cell: cell object.
+    :return: 64-bit integer (0 for empty cells).
+    """
+    cell_id = cell.id
+    if cell_id == CellId.EMPTY_CELL:
+        return 0
+    key = mix((i << 3) | cell_id.value)
+    direction = getattr(cell, 'direction', None)
+    if direction is None:
+        return key
+    state = ((cell.action_index + 1) << 3) | DIRECTION_INDEX[direction]
+    return mix(key ^ (state << 40) ^ (cell.genome.fingerprint & MASK_64))
+
+
+class CycleDetector:
+    """
+    Bounded history of board hashes: {<hash>: <last tick it was seen at>}.
+    A board which repeats within the history means a fixed point (period 1)
+    or a cycle of cells moves.
+    """
+    def __init__(self, size):
+        """
+        Constructs CycleDetector instance.
+        :param size: amount of recent ticks to keep.
+        """
+        self._size = size
+        self._ticks = {}
+        self._order = collections.deque()
+
+    def reset(self):
+        """
+        Forgets all hashes (e.g. on a new simulation).
+        :return: None.
+        """
+        self._ticks = {}
+        self._order.clear()
+
+    def push(self, tick, state_hash):
+        """
+        Registers hash of a tick.
+        :param tick: tick number.
+        :param state_hash: hash of the board after the tick.
+        :return: period of the cycle (amount of ticks) or None if hash is new.
+        """
+        last = self._ticks.get(state_hash)
+        self._ticks[state_hash] = tick
+        self._order.append((tick, state_hash))
+        if len(self._order) > self._size:
+            (old_tick, old_hash) = self._order.popleft()
+            if self._ticks.get(old_hash) == old_tick:
+                del self._ticks[old_hash]
+        return None if last is None else tick - last
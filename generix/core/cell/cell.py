@@ -1,8 +1,6 @@
 """
 A module for cells classes.
 """
-import pygame
-
 from generix.core.cell.direction import Direction, get_random_direction
 from generix.core.cell.id import CellId
 
@@ -23,6 +21,15 @@ class EmptyCell:
         self._i = -1
         self._genome = genome
 
+    @property
+    def genome(self):
+        return self._genome
+
+    @property
+    def action_index(self):
+        # Index of the current action in genome (-1 - no actions were executed)
+        return self._i
+
     def current_action(self):
         """
         Gets current action to execute.
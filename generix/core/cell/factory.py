@@ -4,51 +4,102 @@ A module for a CellFactory.
 import random
 
 from generix.core.genome.genome import Genome
+from generix.core.genome.analysis import GenomeFilter
 from generix.core.cell.id import CellId
-from generix.core.settings.registry import settings_reg
-from generix.core.genome.registry import genome_reg
+
+
+# Maximum amount of attempts to generate a genome which is not degenerate
+MAX_GENERATION_ATTEMPTS = 100
 
 
 class CellFactory:
     """
     Creates instances of different cells classes.
     """
-    def __init__(self):
+    def __init__(self, settings, genomes):
         """
         Constructs CellFactory object.
+        :param settings: SettingsRegistry instance.
+        :param genomes: GenomeRegistry instance.
         """
+        self._settings = settings
+        self._genomes = genomes
+        self._filter = GenomeFilter(settings)
+        self._pruned = 0
         self._choices = {}
         self._max = 0
-        for cell_id, cell_data in settings_reg.find('cell').items():
+        for cell_id, cell_data in settings.find('cell').items():
             if not isinstance(cell_data, dict):
                 continue
-            current = settings_reg.search(cell_data, 'chance')
+            current = settings.search(cell_data, 'chance')
             if current is None:
                 continue
             self._choices[(self._max, self._max + current)] = cell_id
             self._max += current
 
+    @property
+    def pruned(self):
+        return self._pruned
+
     def create_cell(self, cell_id):
         """
         Creates cell instance of a specific type.
         :param cell_id: CellId value.
         :return: cell instance.
         """
-        cell_data = settings_reg.find(cell_id)
+        cell_data = self._settings.find(cell_id)
 
-        genome = genome_reg.pick_genome(cell_id)
+        genome = self._genomes.pick_genome(cell_id)
+        # Degenerate genomes are dropped from the registry before placement
+        while genome is not None and self._filter.is_degenerate(cell_id, genome):
+            self._pruned += 1 + self._genomes.discard(cell_id, genome)
+            genome = self._genomes.pick_genome(cell_id)
         if genome is None:
-            genome = Genome.generate(
-                settings_reg.search(cell_data, 'genome_max_len'),
-                settings_reg.search(cell_data, 'allowed_actions')
-            )
+            genome = self.generate_genome(cell_id, cell_data)
+            # Random genomes of hunters found new lineages
+            if cell_id == CellId.HUNTER_CELL:
+                self._genomes.lineage.record(genome)
 
-        cls = settings_reg.search(cell_data, 'cls')
+        cls = self._settings.search(cell_data, 'cls')
         if cell_id == CellId.HUNTER_CELL:
-            return cls(genome, settings_reg.search(cell_data, 'at_start'))
+            return cls(genome, self._settings.search(cell_data, 'at_start'))
         else:
             return cls(genome)
 
+    def create_child(self, cell_id, genome, hp):
+        """
+        Creates cell with a given genome and hp, e.g. a child of a cell.
+        :param cell_id: CellId value of a cell with hp.
+        :param genome: Genome instance.
+        :param hp: health points of the cell.
+        :return: cell instance.
+        """
+        cell_data = self._settings.find(cell_id)
+        cls = self._settings.search(cell_data, 'cls')
+        at_start = self._settings.search(cell_data, 'at_start')
+        cell = cls(genome, at_start)
+        cell.change_hp(hp - at_start)
+        return cell
+
+    def generate_genome(self, cell_id, cell_data):
+        """
+        Generates random genome. Degenerate genomes are generated again, but
+        a limited amount of times (allowed actions may not satisfy the filter).
+        :param cell_id: CellId value.
+        :param cell_data: cell settings.
+        :return: Genome instance.
+        """
+        n = self._settings.search(cell_data, 'genome_max_len')
+        allowed_actions = self._settings.search(cell_data, 'allowed_actions')
+
+        genome = Genome.generate(n, allowed_actions)
+        for _ in range(MAX_GENERATION_ATTEMPTS):
+            if not self._filter.is_degenerate(cell_id, genome):
+                break
+            self._pruned += 1
+            genome = Genome.generate(n, allowed_actions)
+        return genome
+
     def create_random_cell(self):
         """
         Gets random cell class.
@@ -60,5 +111,3 @@ class CellFactory:
                 return self.create_cell(cell_name)
         return None
 
-
-factory = CellFactory()
@@ -0,0 +1,148 @@
+"""
+A module for an application context which lazily initializes subsystems:
+paths of the application data, settings, genome registry, cell factory and
+database. Importing modules has no side effects, so worker processes and
+tests only pay for the subsystems they use.
+"""
+import copy
+import datetime
+import os
+
+from generix.core.settings.settings import ROOT, DEFAULT_SETTINGS
+
+
+class AppContext:
+    """
+    Holds application subsystems. Each subsystem is created on first access.
+    """
+    def __init__(self, root=ROOT, experiment_name=None, default_settings=None):
+        """
+        Constructs AppContext instance.
+        :param root: directory where .generix directory is being created.
+        :param experiment_name: name of experiment (None - current timestamp).
+        :param default_settings: default settings dictionary (None - DEFAULT_SETTINGS).
+        """
+        self._root = root
+        self._experiment_name = experiment_name
+        self._default_settings = default_settings
+        self._settings = None
+        self._genomes = None
+        self._factory = None
+        self._session_maker = None
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def experiment_name(self):
+        if self._experiment_name is None:
+            self._experiment_name = 'ex-' + datetime.datetime.now().strftime('%d%b%Y%H%M%S')
+        return self._experiment_name
+
+    @property
+    def app_data_dir_path(self):
+        # Application data root directory
+        return os.path.join(self._root, '.generix')
+
+    @property
+    def db_dir_path(self):
+        # Database-related directory
+        return os.path.join(self.app_data_dir_path, 'db')
+
+    @property
+    def experiments_dir_path(self):
+        # Directory where all experiments configurations are stored as JSON files (boards and cells)
+        return os.path.join(self.app_data_dir_path, 'experiments')
+
+    @property
+    def experiment_dir_path(self):
+        # Directory of the current experiment
+        return os.path.join(self.experiments_dir_path, self.experiment_name)
+
+    @property
+    def settings_file_path(self):
+        # Configuration file with experiment settings
+        return os.path.join(self.experiment_dir_path, 'settings.json')
+
+    @property
+    def board_file_path(self):
+        # Configuration file with board settings
+        return os.path.join(self.experiment_dir_path, 'board.json')
+
+    @property
+    def profile_file_path(self):
+        # Profiling report of the experiment
+        return os.path.join(self.experiment_dir_path, 'profile.json')
+
+    @property
+    def frames_dir_path(self):
+        # Recorded frames of the experiment (PNG sequence)
+        return os.path.join(self.experiment_dir_path, 'frames')
+
+    @property
+    def video_file_path(self):
+        # Recorded video of the experiment
+        return os.path.join(self.experiment_dir_path, 'run.mp4')
+
+    @property
+    def genome_bank_path(self):
+        # Genome bank of the experiment (see genome/bank.py)
+        return os.path.join(self.experiment_dir_path, 'genomes')
+
+    @property
+    def db_file_path(self):
+        # Application database file for simulation
+        return os.path.join(self.db_dir_path, 'generix.sqlite')
+
+    def make_dirs(self):
+        """
+        Creates directories of the application data and of the current experiment.
+        :return: None.
+        """
+        os.makedirs(self.db_dir_path, exist_ok=True)
+        os.makedirs(self.experiment_dir_path, exist_ok=True)
+
+    @property
+    def settings(self):
+        if self._settings is None:
+            from generix.core.settings.registry import SettingsRegistry
+
+            default_settings = self._default_settings or DEFAULT_SETTINGS
+            self._settings = SettingsRegistry(
+                self.settings_file_path, copy.deepcopy(default_settings)
+            )
+            # Reads only if file existed before
+            if os.path.exists(self.settings_file_path):
+                self._settings.load()
+        return self._settings
+
+    @property
+    def genomes(self):
+        if self._genomes is None:
+            from generix.core.genome.registry import GenomeRegistry
+
+            self._genomes = GenomeRegistry(self.genome_bank_path, {})
+            if os.path.exists(self.genome_bank_path):
+                self._genomes.load()
+        return self._genomes
+
+    @property
+    def factory(self):
+        if self._factory is None:
+            from generix.core.cell.factory import CellFactory
+
+            self._factory = CellFactory(self.settings, self.genomes)
+        return self._factory
+
+    @property
+    def session_maker(self):
+        if self._session_maker is None:
+            from generix.core.data.db import create_session_maker
+
+            os.makedirs(self.db_dir_path, exist_ok=True)
+            self._session_maker = create_session_maker(self.db_file_path)
+        return self._session_maker
+
+
+app_context = AppContext()
@@ -1,20 +1,83 @@
 """
 
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import logging
+
+from sqlalchemy import create_engine, desc, func, inspect, text
+from sqlalchemy.orm import aliased, sessionmaker
 from sqlalchemy.exc import IntegrityError
 
-from generix.core.settings.settings import DB_FILE_PATH
-from generix.core.data.model import Experiment, Simulation, Base
+from generix.core.data.model import (
+    Experiment, Simulation, TickStatistics, GenomeDiversity, SweepRun, GenomeEvaluation, Genome,
+    Base
+)
+
+
+# Amount of values passed to a single 'IN' clause
+SQL_VARIABLES_LIMIT = 500
+
+# Columns of ancestry records (see Lineage.rows)
+GENOME_COLUMNS = ('number', 'parent', 'founder', 'generation', 'mutations')
+
+logger = logging.getLogger(__name__)
+
+
+def create_session_maker(path):
+    """
+    Connects to the SQLite database and creates missing tables.
+    :param path: path to the database file.
+    :return: session maker object which manages sessions.
+    """
+    # Creates engine for SQLite database. Sweep workers write concurrently,
+    # so a writer waits for the lock instead of failing at once.
+    engine = create_engine('sqlite:///{}'.format(path), connect_args={'timeout': 30})
+    # Genome table of older versions had no columns of ancestry
+    if 'genome' in inspect(engine).get_table_names() and 'number' not in {
+            column['name'] for column in inspect(engine).get_columns('genome')}:
+        replace_genome_table(engine)
+    # Creates all the defined tables (ORMs) and stores the information in metadata.
+    Base.metadata.create_all(engine)
+    create_indexes(engine)
+    return sessionmaker(bind=engine)
 
 
-# Creates engine for SQLite database.
-engine = create_engine('sqlite:///{}'.format(DB_FILE_PATH))
-# Creates all the defined tables (ORMs) and stores the information in metadata.
-Base.metadata.create_all(engine)
-# Creates session maker object which manages sessions.
-make_session = sessionmaker(bind=engine)
+def create_indexes(engine):
+    """
+    Creates indexes of the models which are missing: create_all() only
+    creates indexes of the tables it creates, so databases of older versions
+    would never get indexes of their existing tables.
+    :param engine: SQLAlchemy engine.
+    :return: None.
+    """
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(text('CREATE {}INDEX IF NOT EXISTS {} ON {} ({})'.format(
+                    'UNIQUE ' if index.unique else '', index.name, table.name,
+                    ', '.join(column.name for column in index.columns)
+                )))
+
+
+def replace_genome_table(engine):
+    """
+    Makes room for the genome table of the current version: an empty table of
+    an older version is dropped, a table with rows is kept under another name.
+    :param engine: SQLAlchemy engine.
+    :return: None.
+    """
+    with engine.begin() as connection:
+        if connection.execute(text('SELECT COUNT(*) FROM genome')).scalar() == 0:
+            logger.info('dropping empty genome table of an older version')
+            connection.execute(text('DROP TABLE genome'))
+            return
+        names = set(inspect(engine).get_table_names())
+        name = 'genome_legacy'
+        n = 1
+        while name in names:
+            n += 1
+            name = 'genome_legacy_{}'.format(n)
+        logger.warning('genome table of an older version is renamed to %s', name)
+        connection.execute(text('ALTER TABLE genome RENAME TO {}'.format(name)))
 
 
 class SQLNotFoundException(Exception):
@@ -29,9 +92,10 @@ class Database:
     """
     A wrapper for comfortable interaction with the database.
     """
-    def __init__(self):
+    def __init__(self, make_session):
         """
         Constructs Database wrapper instance.
+        :param make_session: session maker (see create_session_maker).
         """
         self._session = make_session()
 
@@ -50,6 +114,167 @@ class Database:
         simulation = Simulation(experiment.id, iterations)
         self._session.add(simulation)
         self._commit()
+        return simulation
+
+    def create_tick_statistics(self, simulation_id, rows):
+        """
+        Inserts time series of a simulation in bulk.
+        :param simulation_id: id of the simulation.
+        :param rows: list of dicts with 'TickStatistics' column values.
+        :return: None.
+        """
+        for row in rows:
+            row['simulation_id'] = simulation_id
+        self._session.bulk_insert_mappings(TickStatistics, rows)
+        self._commit()
+
+    def create_genome_diversity(self, simulation_id, row):
+        """
+        Inserts diversity of genomes of a simulation.
+        :param simulation_id: id of the simulation.
+        :param row: dict with 'GenomeDiversity' column values.
+        :return: None.
+        """
+        self._session.add(GenomeDiversity(simulation_id=simulation_id, **row))
+        self._commit()
+
+    def create_genomes(self, experiment_id, rows):
+        """
+        Inserts ancestry records of genomes in bulk (a single executemany).
+        :param experiment_id: id of the experiment.
+        :param rows: iterable of (<number>, <parent>, <founder>, <generation>, <mutations>)
+                     tuples (see Lineage.rows).
+        :return: None.
+        """
+        mappings = [dict(zip(GENOME_COLUMNS, row), experiment_id=experiment_id) for row in rows]
+        if not mappings:
+            return
+        self._session.execute(Genome.__table__.insert(), mappings)
+        self._commit()
+
+    def find_next_genome_number(self, experiment_id):
+        """
+        Gets number which the next genome of an experiment should get.
+        :param experiment_id: id of the experiment.
+        :return: number.
+        """
+        number = self._session.query(func.max(Genome.number)).filter(
+            Genome.experiment_id == experiment_id
+        ).scalar()
+        return 0 if number is None else number + 1
+
+    def find_ancestors(self, experiment_id, number):
+        """
+        Finds chain of ancestors of a genome (recursively, by parent numbers).
+        :param experiment_id: id of the experiment.
+        :param number: number of the genome.
+        :return: list of rows with 'Genome' columns: the genome, its parent, ..., the founder.
+        """
+        chain = self._session.query(Genome).filter(
+            Genome.experiment_id == experiment_id, Genome.number == number
+        ).cte(name='chain', recursive=True)
+        parent = aliased(Genome, name='parent')
+        chain = chain.union_all(self._session.query(parent).filter(
+            parent.experiment_id == experiment_id, parent.number == chain.c.parent
+        ))
+        # Parents are always numbered before their children
+        return self._session.query(chain).order_by(chain.c.number.desc()).all()
+
+    def find_top_lineages(self, experiment_id, limit=10):
+        """
+        Finds the most successful lineages: the ones which reached the latest
+        generations, then the ones with more genomes.
+        :param experiment_id: id of the experiment.
+        :param limit: amount of lineages.
+        :return: list of (<founder>, <amount of genomes>, <last generation>) rows.
+        """
+        genomes = func.count(Genome.id).label('genomes')
+        generation = func.max(Genome.generation).label('generation')
+        return self._session.query(Genome.founder, genomes, generation).filter(
+            Genome.experiment_id == experiment_id
+        ).group_by(Genome.founder).order_by(desc(generation), desc(genomes)).limit(limit).all()
+
+    def create_sweep_run(self, sweep, key, params, experiment_name, result):
+        """
+        Stores result of a completed point of a sweep.
+        :param sweep: sweep name.
+        :param key: canonical JSON of the point.
+        :param params: JSON of parameter values.
+        :param experiment_name: name of experiment the point was run in.
+        :param result: dict with 'SweepRun' column values.
+        :return: SweepRun object.
+        """
+        experiment = self.find_experiment_by_name(experiment_name)
+        if experiment is None:
+            raise SQLNotFoundException(experiment_name)
+        sweep_run = SweepRun(
+            sweep=sweep, key=key, params=params, experiment_id=experiment.id, **result
+        )
+        self._session.add(sweep_run)
+        self._commit()
+        return sweep_run
+
+    def find_sweep_runs(self, sweep):
+        return self._session.query(SweepRun).filter(SweepRun.sweep == sweep).order_by(SweepRun.id)
+
+    def create_genome_evaluations(self, rows):
+        """
+        Inserts fitness of genomes in bulk.
+        :param rows: list of dicts with 'GenomeEvaluation' column values.
+        :return: None.
+        """
+        self._session.bulk_insert_mappings(GenomeEvaluation, rows)
+        self._commit()
+
+    def find_genome_evaluations(self, scenario, genomes, seeds):
+        """
+        Finds stored fitness of genomes in a scenario.
+        :param scenario: hash of the scenario.
+        :param genomes: list of hashes of genomes.
+        :param seeds: list of seeds.
+        :return: list of GenomeEvaluation objects.
+        """
+        evaluations = []
+        # SQLite limits amount of variables of a statement
+        for i in range(0, len(genomes), SQL_VARIABLES_LIMIT):
+            evaluations.extend(self._session.query(GenomeEvaluation).filter(
+                GenomeEvaluation.scenario == scenario,
+                GenomeEvaluation.genome.in_(genomes[i:i + SQL_VARIABLES_LIMIT]),
+                GenomeEvaluation.seed.in_(seeds)
+            ))
+        return evaluations
+
+    def delete_experiment(self, name):
+        """
+        Deletes experiment with its simulations and their statistics.
+        :param name: experiment name.
+        :return: None.
+        """
+        experiment = self.find_experiment_by_name(name)
+        if experiment is None:
+            return
+        simulation_ids = self._session.query(Simulation.id).filter(
+            Simulation.experiment_id == experiment.id
+        )
+        self._session.query(TickStatistics).filter(
+            TickStatistics.simulation_id.in_(simulation_ids)
+        ).delete(synchronize_session=False)
+        self._session.query(GenomeDiversity).filter(
+            GenomeDiversity.simulation_id.in_(simulation_ids)
+        ).delete(synchronize_session=False)
+        self._session.query(Genome).filter(
+            Genome.experiment_id == experiment.id
+        ).delete(synchronize_session=False)
+        self._session.query(Simulation).filter(
+            Simulation.experiment_id == experiment.id
+        ).delete(synchronize_session=False)
+        self._session.delete(experiment)
+        self._commit()
+
+    def find_simulation_ticks(self, simulation_id):
+        return self._session.query(TickStatistics).filter(
+            TickStatistics.simulation_id == simulation_id
+        ).order_by(TickStatistics.tick)
 
     def find_experiment_by_id(self, id):
         return self._session.query(Experiment).filter(Experiment.id == id).first()
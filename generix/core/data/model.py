@@ -1,7 +1,9 @@
 """
 A module for ORM wrapper classes of database models.
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from sqlalchemy import (
+    Column, Integer, Float, String, DateTime, ForeignKey, UniqueConstraint, func
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.schema import Sequence
 from sqlalchemy.ext.declarative import declarative_base
@@ -17,8 +19,8 @@ class Experiment(Base):
     id = Column(Integer, Sequence('experiment_id_seq', start=1, increment=1), primary_key=True)
     # Linking with FK: experiment_id
     simulation_rel = relationship('Simulation')
-    # Experiment name
-    name = Column(String(32))
+    # Experiment name (indexed: experiments are looked up by name)
+    name = Column(String(32), index=True)
     # Experiment date
     date = Column(DateTime, default=func.now())
 
@@ -31,8 +33,8 @@ class Simulation(Base):
     __tablename__ = 'simulation'
     # PK (with autoincrementing value)
     id = Column(Integer, Sequence('simulation_id_seq', start=1, increment=1), primary_key=True)
-    # FK: 'Experiment' --< 'Simulation'
-    experiment_id = Column(Integer, ForeignKey('experiment.id'))
+    # FK: 'Experiment' --< 'Simulation' (indexed: simulations are listed per experiment)
+    experiment_id = Column(Integer, ForeignKey('experiment.id'), index=True)
     # The number of iterations that was done over
     iterations = Column(Integer)
 
@@ -41,15 +43,110 @@ class Simulation(Base):
         self.iterations = iterations
 
 
+class TickStatistics(Base):
+    """ORM for 'TickStatistics' model in the database (one row per tick)."""
+    __tablename__ = 'tick_statistics'
+    # PK (with autoincrementing value)
+    id = Column(Integer, Sequence('tick_statistics_id_seq', start=1, increment=1), primary_key=True)
+    # FK: 'Simulation' --< 'TickStatistics'
+    simulation_id = Column(Integer, ForeignKey('simulation.id'), index=True)
+    # Tick number inside of the simulation
+    tick = Column(Integer)
+    # Population of each cell type
+    empty_cells = Column(Integer, default=0)
+    standard_cells = Column(Integer, default=0)
+    hunter_cells = Column(Integer, default=0)
+    food_cells = Column(Integer, default=0)
+    wall_cells = Column(Integer, default=0)
+    # Aggregates of hunters health points
+    hp_sum = Column(Integer, default=0)
+    hp_min = Column(Integer)
+    hp_max = Column(Integer)
+
+
+class GenomeDiversity(Base):
+    """ORM for 'GenomeDiversity' model in the database (diversity of hunters of a simulation)."""
+    __tablename__ = 'genome_diversity'
+    # PK (with autoincrementing value)
+    id = Column(Integer, Sequence('genome_diversity_id_seq', start=1, increment=1), primary_key=True)
+    # FK: 'Simulation' --< 'GenomeDiversity'
+    simulation_id = Column(Integer, ForeignKey('simulation.id'), index=True)
+    # Amount of genomes at the start of the simulation and of unique ones
+    genomes = Column(Integer)
+    unique_genomes = Column(Integer)
+    # Shannon entropy of the distribution of genomes (bits)
+    entropy = Column(Float)
+    # Mean pairwise similarity of genomes (MinHash estimate of Jaccard similarity)
+    similarity = Column(Float)
+
+
+class SweepRun(Base):
+    """ORM for 'SweepRun' model in the database (one row per completed point of a sweep)."""
+    __tablename__ = 'sweep_run'
+    # A point is run once per sweep
+    __table_args__ = (UniqueConstraint('sweep', 'key'),)
+    # PK (with autoincrementing value)
+    id = Column(Integer, Sequence('sweep_run_id_seq', start=1, increment=1), primary_key=True)
+    # Sweep name (indexed: completed points are looked up by sweep)
+    sweep = Column(String(32), index=True)
+    # Canonical JSON of parameter values and run options of the point
+    key = Column(String)
+    # JSON of parameter values
+    params = Column(String)
+    # FK: 'Experiment' --< 'SweepRun'
+    experiment_id = Column(Integer, ForeignKey('experiment.id'))
+    # Amount of simulations and their ticks
+    simulations = Column(Integer)
+    ticks_mean = Column(Float)
+    ticks_max = Column(Integer)
+    # Mean amount of hunters alive at the end of simulations
+    hunters_mean = Column(Float)
+    # Wall-clock time of the point (seconds)
+    duration = Column(Float)
+    # Completion date
+    date = Column(DateTime, default=func.now())
+
+
+class GenomeEvaluation(Base):
+    """ORM for 'GenomeEvaluation' model in the database (fitness of a genome in a scenario)."""
+    __tablename__ = 'genome_evaluation'
+    # A genome is evaluated once per scenario and seed
+    __table_args__ = (UniqueConstraint('scenario', 'genome', 'seed'),)
+    # PK (with autoincrementing value)
+    id = Column(Integer, Sequence('genome_evaluation_id_seq', start=1, increment=1), primary_key=True)
+    # Hash of the scenario (indexed: evaluations are looked up by scenario)
+    scenario = Column(String(40), index=True)
+    # Hash of the bytecode of the genome
+    genome = Column(String(40))
+    # Seed of the random generator
+    seed = Column(Integer)
+    # Ticks the hunter survived, amount of food it ate and its hp at the end
+    ticks = Column(Integer)
+    food = Column(Integer)
+    hp = Column(Integer)
+    # Evaluation date
+    date = Column(DateTime, default=func.now())
+
+
 class Genome(Base):
-    """ORM for 'Genome' model in the database."""
+    """ORM for 'Genome' model in the database (ancestry of a genome, see genome/lineage.py)."""
     __tablename__ = 'genome'
+    # A genome is numbered once per experiment (the constraint also indexes ancestor lookups)
+    __table_args__ = (UniqueConstraint('experiment_id', 'number'),)
     # PK (with autoincrementing value)
     id = Column(Integer, Sequence('genome_id_seq', start=1, increment=1), primary_key=True)
-    # FK: 'Action' --< 'Genome'
-    action_id = Column(Integer, ForeignKey('action.id'))
-    # Linking with FK: action_id
-    simulation_rel = relationship('Genome')
+    # FK: 'Experiment' --< 'Genome'
+    experiment_id = Column(Integer, ForeignKey('experiment.id'))
+    # Number of the genome in the experiment
+    number = Column(Integer)
+    # Number of the parent genome (None - random genome)
+    parent = Column(Integer)
+    # Number of the first genome of the lineage (indexed: lineages are grouped by founders)
+    founder = Column(Integer, index=True)
+    # Generation (simulation number) the genome entered the population in
+    generation = Column(Integer)
+    # Amount of mutations relative to the parent
+    mutations = Column(Integer, default=0)
 
 
 class Action(Base):
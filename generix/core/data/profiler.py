@@ -0,0 +1,175 @@
+"""
+A module for a hot-path profiler which measures time spent in each phase of
+a tick.
+"""
+import array
+import json
+import time
+
+
+class Profiler:
+    """
+    Collects durations of ticks and their phases using a monotonic clock.
+    Ticks and phases are measured as:
+        profiler.begin_tick()
+        started = profiler.start()
+        ...
+        profiler.stop('phase', started)
+        profiler.end_tick()
+    Phases may be measured outside of ticks (e.g. DB writes between
+    simulations) or on another thread (drawing), so shares of phases are
+    shares of wall time: from the first measurement to the last one.
+    """
+    enabled = True
+
+    def __init__(self):
+        """
+        Constructs Profiler instance.
+        """
+        # Durations of ticks (seconds)
+        self._ticks = array.array('d')
+        self._tick_started = None
+        # {<phase>: [<calls>, <total_time>]}
+        self._phases = {}
+        # Wall time of the first and of the last measurement
+        self._first = None
+        self._last = None
+
+    @staticmethod
+    def start():
+        """
+        Gets starting point of a measurement.
+        :return: monotonic time (seconds).
+        """
+        return time.perf_counter()
+
+    def stop(self, phase, started):
+        """
+        Finishes measurement of a phase.
+        :param phase: phase name.
+        :param started: value returned by start().
+        :return: None.
+        """
+        now = time.perf_counter()
+        elapsed = now - started
+        if self._first is None:
+            self._first = started
+        self._last = now
+        try:
+            measure = self._phases[phase]
+        except KeyError:
+            measure = self._phases[phase] = [0, 0.0]
+        measure[0] += 1
+        measure[1] += elapsed
+
+    def begin_tick(self):
+        """
+        Starts measurement of a whole tick.
+        :return: None.
+        """
+        self._tick_started = time.perf_counter()
+        if self._first is None:
+            self._first = self._tick_started
+
+    def end_tick(self):
+        """
+        Finishes measurement of a whole tick.
+        :return: None.
+        """
+        if self._tick_started is not None:
+            self._last = time.perf_counter()
+            self._ticks.append(self._last - self._tick_started)
+            self._tick_started = None
+
+    def report(self):
+        """
+        Summarizes measurements: ticks/sec, percentiles of tick latency and
+        per-phase breakdown (share - share of wall time).
+        :return: dict with report data.
+        """
+        total = sum(self._ticks)
+        wall = self._last - self._first if self._first is not None else 0.0
+        latencies = sorted(self._ticks)
+        phases = {}
+        for phase, (calls, phase_total) in self._phases.items():
+            phases[phase] = {
+                'calls': calls,
+                'total_s': phase_total,
+                'mean_ms': phase_total / calls * 1000,
+                'share': phase_total / wall if wall else 0.0,
+            }
+        return {
+            'ticks': len(latencies),
+            'ticks_per_sec': len(latencies) / total if total else 0.0,
+            'wall_s': wall,
+            'latency_ms': {
+                'p50': percentile(latencies, 50) * 1000,
+                'p90': percentile(latencies, 90) * 1000,
+                'p99': percentile(latencies, 99) * 1000,
+                'max': (latencies[-1] if latencies else 0.0) * 1000,
+            },
+            'phases': phases,
+        }
+
+    def dump(self, path):
+        """
+        Saves report to the file as JSON.
+        :param path: path to the file.
+        :return: None.
+        """
+        with open(path, mode='w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def __str__(self):
+        """
+        Represents report as a human-readable table.
+        :return: report string.
+        """
+        report = self.report()
+        latency = report['latency_ms']
+        lines = [
+            f"ticks: {report['ticks']}, ticks/sec: {report['ticks_per_sec']:.2f}, "
+            f"wall time: {report['wall_s']:.2f} s (phase shares are shares of it)",
+            f"latency (ms): p50={latency['p50']:.3f} p90={latency['p90']:.3f} "
+            f"p99={latency['p99']:.3f} max={latency['max']:.3f}",
+        ]
+        for phase, measure in sorted(report['phases'].items(), key=lambda item: -item[1]['total_s']):
+            lines.append(
+                f"{phase:>12}: {measure['calls']:>8} calls, {measure['mean_ms']:10.3f} ms/call, "
+                f"{measure['share'] * 100:6.2f}%"
+            )
+        return '\n'.join(lines)
+
+
+class NullProfiler:
+    """
+    Profiler which measures nothing. Used when instrumentation is disabled, so
+    the hot path only pays for a few empty calls per tick.
+    """
+    enabled = False
+
+    @staticmethod
+    def start():
+        return 0.0
+
+    def stop(self, phase, started):
+        pass
+
+    def begin_tick(self):
+        pass
+
+    def end_tick(self):
+        pass
+
+
+def percentile(values, p):
+    """
+    Gets percentile of sorted values (nearest-rank method).
+    :param values: sorted list of values.
+    :param p: percentile in range of [0;100].
+    :return: value of percentile (0 if there are no values).
+    """
+    if not values:
+        return 0.0
+    rank = int(round(p / 100 * (len(values) - 1)))
+    return values[rank]
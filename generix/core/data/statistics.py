@@ -1,21 +1,169 @@
 """
 
 """
+from generix.core.cell.id import CellId
+
+
+# Maps cell type to a column of 'TickStatistics' model
+TICK_COLUMNS = {
+    CellId.EMPTY_CELL: 'empty_cells',
+    CellId.STANDARD_CELL: 'standard_cells',
+    CellId.HUNTER_CELL: 'hunter_cells',
+    CellId.FOOD_CELL: 'food_cells',
+    CellId.WALL_CELL: 'wall_cells',
+}
+
+
 class IterationStatistics:
+    """
+    Population counters of a board. Counters are maintained incrementally:
+    the board adds/discards a cell each time a slot of the grid changes, so
+    reading them never requires touching the grid.
+    """
     def __init__(self):
+        """
+        Constructs IterationStatistics instance.
+        """
         self._cells_counter = {}
+        # Histogram of health points: {<hp>: <amount_of_cells>}. Health points
+        # are bounded by 'hp.at_start', so min/max lookups are cheap.
+        self._hp_counter = {}
+        self._hp_sum = 0
 
     @property
     def cells_counter(self):
         return self._cells_counter
 
-    def update(self, cell_id):
+    @property
+    def hunters(self):
+        return self._cells_counter.get(CellId.HUNTER_CELL, 0)
+
+    @property
+    def hp_sum(self):
+        return self._hp_sum
+
+    @property
+    def hp_min(self):
+        return min(self._hp_counter) if self._hp_counter else None
+
+    @property
+    def hp_max(self):
+        return max(self._hp_counter) if self._hp_counter else None
+
+    def count(self, cell_id):
         """
-        Updates cell counter.
+        Gets population of a specific cell type.
         :param cell_id: CellId enum (id).
+        :return: amount of cells.
+        """
+        return self._cells_counter.get(cell_id, 0)
+
+    def add(self, cell):
+        """
+        Counts cell which has been placed on the board.
+        :param cell: cell object.
+        :return: None.
+        """
+        self._cells_counter[cell.id] = self._cells_counter.get(cell.id, 0) + 1
+
+        hp = getattr(cell, 'hp', None)
+        if hp is None:
+            return
+        self._hp_sum += hp
+        self._hp_counter[hp] = self._hp_counter.get(hp, 0) + 1
+
+    def fill(self, cell, amount):
+        """
+        Counts amount of identical cells at once (e.g. implicit empty cells).
+        :param cell: cell object.
+        :param amount: amount of cells.
+        :return: None.
+        """
+        self._cells_counter[cell.id] = self._cells_counter.get(cell.id, 0) + amount
+
+        hp = getattr(cell, 'hp', None)
+        if hp is None:
+            return
+        self._hp_sum += hp * amount
+        self._hp_counter[hp] = self._hp_counter.get(hp, 0) + amount
+
+    def discard(self, cell):
+        """
+        Uncounts cell which has been removed from the board.
+        :param cell: cell object.
+        :return: None.
+        """
+        self._cells_counter[cell.id] -= 1
+
+        hp = getattr(cell, 'hp', None)
+        if hp is None:
+            return
+        self._hp_sum -= hp
+        self._hp_counter[hp] -= 1
+        if self._hp_counter[hp] <= 0:
+            del self._hp_counter[hp]
+
+    def as_row(self, tick):
+        """
+        Represents statistics as a row of 'TickStatistics' model.
+        :param tick: tick number.
+        :return: dict of column values.
+        """
+        row = {
+            'tick': tick,
+            'hp_sum': self._hp_sum,
+            'hp_min': self.hp_min,
+            'hp_max': self.hp_max,
+        }
+        for cell_id, column in TICK_COLUMNS.items():
+            row[column] = self._cells_counter.get(cell_id, 0)
+        return row
+
+
+class StatisticsHistory:
+    """
+    Accumulates per-tick statistics of a simulation, so they can be inserted
+    into the database in bulk once the simulation is complete.
+    """
+    def __init__(self):
+        """
+        Constructs StatisticsHistory instance.
+        """
+        self._rows = []
+        self._tick = 0
+
+    def __len__(self):
+        """
+        Gets amount of recorded ticks.
+        :return: amount of rows.
+        """
+        return len(self._rows)
+
+    @property
+    def rows(self):
+        return self._rows
+
+    def record(self, statistics):
+        """
+        Records statistics of the next tick.
+        :param statistics: IterationStatistics instance.
+        :return: None.
+        """
+        self._rows.append(statistics.as_row(self._tick))
+        self._tick += 1
+
+    def skip(self, ticks):
+        """
+        Skips ticks which are not recorded (see ExperimentRunner.check_cycle).
+        :param ticks: amount of ticks.
+        :return: None.
+        """
+        self._tick += ticks
+
+    def clear(self):
+        """
+        Forgets all recorded ticks.
         :return: None.
         """
-        try:
-            self._cells_counter[cell_id] += 1
-        except KeyError:
-            self._cells_counter[cell_id] = 1
+        self._rows = []
+        self._tick = 0
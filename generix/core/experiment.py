@@ -0,0 +1,239 @@
+"""
+A module for an experiment runner which drives simulations of an experiment:
+ticks the board, checks stop conditions, stores statistics and forms the next
+generation. It does not draw anything, so it runs both in the application
+window and headless.
+"""
+import os
+
+from generix.core.board.manager import BoardManager
+from generix.core.board.condition import StopConditions, StopReason
+from generix.core.board.zobrist import CycleDetector
+from generix.core.data.statistics import StatisticsHistory
+from generix.core.data.profiler import NullProfiler
+from generix.core.genome.diversity import DiversityMeter
+
+
+class ExperimentRunner:
+    """
+    Runs simulations of an experiment one after another.
+    """
+    def __init__(self, db, context, profiler=None):
+        """
+        Constructs ExperimentRunner instance.
+        :param db: Database instance.
+        :param context: AppContext instance.
+        :param profiler: Profiler instance (None - profiling is disabled).
+        """
+        self._db = db
+        self._context = context
+        self._profiler = profiler or NullProfiler()
+        self._board_manager = BoardManager(self._profiler, context=context)
+        self._history = StatisticsHistory()
+        self._stop_conditions = StopConditions(context.settings)
+        self._cycles = None
+        # Cycle which is being measured: (<tick it ends at>, <hash>, [(<cell>, <hp>)])
+        self._cycle = None
+        cycle_history = context.settings.find('cycle_history')
+        if cycle_history:
+            if context.settings.find('tick_mode') == 'intent' \
+                    and context.settings.find('resolve_rule') == 'seeded':
+                raise ValueError('cycles are not detected with seeded resolve rule')
+            self._cycles = CycleDetector(cycle_history)
+        self._diversity = DiversityMeter() if context.settings.find('genome_diversity') else None
+        # Diversity of genomes of the current generation
+        self._generation_diversity = None
+        self._experiment_name = None
+        self._experiment_id = None
+        self._simulations = 0
+        self._last_simulation = None
+
+    @property
+    def board_manager(self):
+        return self._board_manager
+
+    @property
+    def simulations(self):
+        return self._simulations
+
+    @property
+    def last_simulation(self):
+        return self._last_simulation
+
+    def start(self, experiment_name):
+        """
+        Prepares the first simulation of the experiment.
+        :param experiment_name: name of experiment to run.
+        :return: None.
+        """
+        if self._db.find_experiment_by_name(experiment_name) is None:
+            # Creates a new experiment in the DB
+            self._db.create_experiment(experiment_name)
+
+        board_file_path = self._context.board_file_path
+        # Numbering of genomes continues the stored ancestry of the experiment
+        self._experiment_id = self._db.find_experiment_by_name(experiment_name).id
+        lineage = self._context.genomes.lineage
+        lineage.reset(self._db.find_next_genome_number(self._experiment_id))
+        lineage.generation = self._db.count_experiment_simulations(self._experiment_id)
+
+        # Creates new board for the experiment
+        self._board_manager.create_new_board()
+        if os.path.exists(board_file_path):
+            self._board_manager.load(board_file_path)
+        # Genomes of a new board (e.g. random ones) are in the database at once
+        self.flush_lineage()
+        self.measure_diversity()
+
+        self._experiment_name = experiment_name
+
+    def tick(self):
+        """
+        Makes one step of simulation. Starts a new simulation if the current
+        one is complete.
+        :return: StopReason value if simulation is complete, otherwise - None.
+        """
+        profiler = self._profiler
+        self._board_manager.tick()
+
+        started = profiler.start()
+        self._history.record(self._board_manager.statistics)
+        # Checks stop conditions to decide: should we continue or not
+        reason = self._stop_conditions.check(self._board_manager.statistics)
+        if reason is None and self._cycles is not None:
+            reason = self.check_cycle()
+        profiler.stop('statistics', started)
+        profiler.end_tick()
+
+        if reason is None:
+            return None
+
+        started = profiler.start()
+        # Saves statistics to the database
+        simulation = self._db.create_simulation(
+            self._experiment_name, self._stop_conditions.ticks
+        )
+        self._db.create_tick_statistics(simulation.id, self._history.rows)
+        if self._generation_diversity is not None:
+            self._db.create_genome_diversity(simulation.id, self._generation_diversity)
+        profiler.stop('db', started)
+
+        # Summary of the simulation: statistics of its last tick
+        self._last_simulation = dict(self._history.rows[-1])
+        if self._generation_diversity is not None:
+            self._last_simulation.update(self._generation_diversity)
+        self._last_simulation['ticks'] = self._stop_conditions.ticks
+        self._last_simulation['reason'] = reason
+        self._simulations += 1
+        # Genomes formed from now on belong to the next generation
+        self._context.genomes.lineage.generation += 1
+
+        started = profiler.start()
+        board_file_path = self._context.board_file_path
+        # Saves cells locations to the file
+        self._board_manager.save(board_file_path)
+        self._history.clear()
+        self._stop_conditions.reset()
+        if self._cycles is not None:
+            self._cycles.reset()
+            self._cycle = None
+        self.form_generation()
+        # Saves the generation, so the experiment can be resumed: genomes and
+        # ancestry of all genomes recorded so far (including the generation)
+        self._context.genomes.save()
+        self.flush_lineage()
+        # Creates new board to start a new simulation
+        self._board_manager.create_new_board()
+        # Loads cells locations from the file (from previous simulation)
+        self._board_manager.load(board_file_path)
+        self.measure_diversity()
+        profiler.stop('generation', started)
+        return reason
+
+    def check_cycle(self):
+        """
+        Checks whether the simulation repeats itself. Cells decide by the board
+        only (hp just kills them), so once the board repeats, it repeats
+        forever, while hp of hunters changes by the same amount each period.
+        The change is measured over the next period, then:
+            - hp does not change: the simulation is stopped;
+            - hp decreases: whole periods are skipped until a hunter is about
+              to starve (or ticks run out), then ticks go on as usual.
+        Hp only decreases within a period (no food is eaten), so no hunter
+        starves during the skipped periods.
+        :return: StopReason.CYCLE if simulation is complete, otherwise - None.
+        """
+        board_manager = self._board_manager
+        ticks = self._stop_conditions.ticks
+        state_hash = board_manager.state_hash
+        period = self._cycles.push(ticks, state_hash)
+
+        if self._cycle is None:
+            if period is not None:
+                hps = [(cell, cell.hp) for cell in board_manager.get_survived_cells()]
+                self._cycle = (ticks + period, period, state_hash, hps)
+            return None
+
+        (end, period, cycle_hash, hps) = self._cycle
+        if ticks < end:
+            return None
+        self._cycle = None
+        # A hunter has died or hashes have collided: nothing repeats
+        hunters = {id(cell) for cell in board_manager.get_survived_cells()}
+        if state_hash != cycle_hash or hunters != {id(cell) for cell, _ in hps}:
+            return None
+
+        changes = [(cell, cell.hp - hp) for cell, hp in hps]
+        if all(change == 0 for _, change in changes):
+            return StopReason.CYCLE
+        if any(change > 0 for _, change in changes):
+            return None
+
+        # Hp stays positive after the skipped periods
+        periods = min(
+            (cell.hp - 1) // -change for cell, change in changes if change < 0
+        )
+        ticks_left = self._stop_conditions.ticks_left
+        if ticks_left is not None:
+            # At least one tick is left to stop the simulation as usual
+            periods = min(periods, (ticks_left - 1) // period)
+        if periods <= 0:
+            return None
+
+        skipped = periods * period
+        board_manager.skip(skipped, [(cell, change * periods) for cell, change in changes])
+        self._stop_conditions.skip(skipped)
+        self._history.skip(skipped)
+        self._cycles.reset()
+        return None
+
+    def flush_lineage(self):
+        """
+        Writes ancestry records which were not written yet to the database.
+        :return: None.
+        """
+        lineage = self._context.genomes.lineage
+        if len(lineage):
+            self._db.create_genomes(self._experiment_id, lineage.rows())
+            lineage.clear()
+
+    def measure_diversity(self):
+        """
+        Measures diversity of hunter genomes of a new generation (the cells
+        of the board a simulation starts with).
+        :return: None.
+        """
+        if self._diversity is None:
+            return
+        self._generation_diversity = self._diversity.measure(
+            cell.genome for cell in self._board_manager.get_survived_cells()
+        )
+
+    def form_generation(self):
+        """
+        Puts genomes of survived bots into the genome registry: clones each
+        cell n times and mutates n / 10 cells. It is called while the board of
+        the complete simulation is still current.
+        :return: None.
+        """
+        self._board_manager.form_bots_generation()
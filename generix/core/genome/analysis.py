@@ -0,0 +1,135 @@
+"""
+A module for static analysis of genomes. Genome is executed in a loop, so many
+genomes make the same decisions: turns which add up to a full circle do
+nothing, rotations and repetitions of a genome run the same loop. Analysis
+reduces a genome to a canonical form, so equivalent genomes can be recognized,
+and detects degenerate genomes whose cells are doomed (e.g. hunters which
+never eat).
+"""
+from generix.core.action.id import Action
+from generix.core.cell.id import CellId
+
+
+# Each turn is 45 degrees, so 8 turns make a full circle
+TURNS_PER_CIRCLE = 8
+
+
+def canonicalize(actions):
+    """
+    Reduces actions of a genome to a canonical form:
+        1) runs of turns (including a run which wraps around the end) are
+           reduced modulo a full circle;
+        2) a genome which repeats itself is reduced to a single period;
+        3) the smallest rotation of the result is taken.
+    Turns which cancel out are still paid with step cost, so the canonical
+    form is used to compare genomes rather than to run them.
+    :param actions: list of actions.
+    :return: tuple of action values.
+    """
+    values = reduce_turns([action.value for action in actions])
+    values = reduce_period(values)
+    return min_rotation(values)
+
+
+def reduce_turns(values):
+    """
+    Reduces runs of turns of a looped genome modulo a full circle.
+    :param values: list of action values.
+    :return: list of action values (rotated).
+    """
+    turn = Action.TURN.value
+    n = len(values)
+    if all(value == turn for value in values):
+        return [turn] * (n % TURNS_PER_CIRCLE)
+
+    # Starts after an action which is not a turn, so no run wraps around
+    start = next(i for i in range(n) if values[i - 1] != turn)
+    result = []
+    run = 0
+    for k in range(n):
+        value = values[(start + k) % n]
+        if value == turn:
+            run += 1
+            continue
+        result.extend([turn] * (run % TURNS_PER_CIRCLE))
+        result.append(value)
+        run = 0
+    result.extend([turn] * (run % TURNS_PER_CIRCLE))
+    return result
+
+
+def reduce_period(values):
+    """
+    Reduces a genome which repeats itself to a single period.
+    :param values: list of action values.
+    :return: list of action values.
+    """
+    n = len(values)
+    for period in range(1, n // 2 + 1):
+        if n % period == 0 and values[period:] == values[:n - period]:
+            return values[:period]
+    return values
+
+
+def min_rotation(values):
+    """
+    Gets lexicographically smallest rotation (Booth's algorithm, O(n)).
+    :param values: list of action values.
+    :return: tuple of action values.
+    """
+    s = values + values
+    failure = [-1] * len(s)
+    k = 0
+    for j in range(1, len(s)):
+        value = s[j]
+        i = failure[j - k - 1]
+        while i != -1 and value != s[k + i + 1]:
+            if value < s[k + i + 1]:
+                k = j - i - 1
+            i = failure[i]
+        if value != s[k + i + 1]:
+            if value < s[k]:
+                k = j
+            failure[j - k] = -1
+        else:
+            failure[j - k] = i + 1
+    return tuple(s[k:k + len(values)])
+
+
+class GenomeFilter:
+    """
+    Detects degenerate genomes of cells which have 'required_actions' in the
+    settings: genomes without final actions (a cell never ends its turn) or
+    without some of the required actions (e.g. a hunter which never eats).
+    """
+    def __init__(self, settings):
+        """
+        Constructs GenomeFilter instance.
+        :param settings: SettingsRegistry instance.
+        """
+        self._final_actions = frozenset(
+            action.value for action in Action if settings.find_option_by_key(action, 'is_final')
+        )
+        # Values of required actions by cell type
+        self._required_actions = {}
+        for cell_id, cell_data in settings.find('cell').items():
+            if not isinstance(cell_id, CellId):
+                continue
+            required_actions = settings.search(cell_data, 'required_actions')
+            if required_actions:
+                self._required_actions[cell_id] = frozenset(
+                    action.value for action in required_actions
+                )
+
+    def is_degenerate(self, cell_id, genome):
+        """
+        Checks whether genome is degenerate.
+        :param cell_id: CellId value.
+        :param genome: Genome instance.
+        :return: True - degenerate, False - not degenerate or cell type is not checked.
+        """
+        required_actions = self._required_actions.get(cell_id)
+        if required_actions is None:
+            return False
+        actions = set(genome.canonical)
+        return actions.isdisjoint(self._final_actions) or not required_actions <= actions
@@ -0,0 +1,301 @@
+"""
+A module for a binary genome bank: genomes of the registry of an experiment
+with their amounts. A bank is a directory of flat files:
+    data.bin - records one after another: bytecode of a genome (action values)
+               followed by its canonical form;
+    ends.bin - end offsets of bytecodes and of canonical forms in data.bin
+               (two unsigned 64-bit integers per record);
+    lineage.bin - numbers of genomes and of founders of their lineages (see
+                  genome/lineage.py), -1 - not numbered (two 64-bit integers
+                  per record);
+    counts.bin - amount of copies of each record (unsigned 32-bit integer);
+    cells.bin - cell type of each record (CellId value, a byte).
+Arrays are stored in native byte order and memory-mapped, so opening a bank
+reads nothing: records are decoded on access. Records are appended, amounts
+are updated in place, a record which is no longer used keeps zero amount until
+the bank is compacted.
+
+Files are appended in the order above, so a record which was not written
+completely (e.g. the process was killed) is not visible. A compacted bank is
+written into a sibling directory which replaces the bank as a whole, so an
+interrupted compaction leaves either the old or the compacted bank.
+"""
+import array
+import mmap
+import os
+import shutil
+
+
+DATA_FILE = 'data.bin'
+ENDS_FILE = 'ends.bin'
+LINEAGE_FILE = 'lineage.bin'
+COUNTS_FILE = 'counts.bin'
+CELLS_FILE = 'cells.bin'
+# Suffixes of sibling directories of a bank being compacted
+TMP_SUFFIX = '.tmp'
+OLD_SUFFIX = '.old'
+
+
+class GenomeBank:
+    """
+    Memory-mapped genome bank. Records are addressed by indexes in order of
+    appending.
+    """
+    def __init__(self, path):
+        """
+        Constructs GenomeBank instance and opens the bank (creates it if needed).
+        :param path: path to the bank directory.
+        """
+        self._path = path
+        self._maps = []
+        self._counts_map = None
+        self._data = None
+        self._ends = None
+        self._lineage = None
+        self._counts = None
+        self._cells = None
+        self._size = 0
+        self._recover()
+        os.makedirs(path, exist_ok=True)
+        self.open()
+
+    def __len__(self):
+        """
+        Gets amount of records.
+        :return: amount of records.
+        """
+        return self._size
+
+    @property
+    def path(self):
+        return self._path
+
+    def open(self):
+        """
+        Maps files of the bank.
+        :return: None.
+        """
+        self.close()
+        self._data = self._map(DATA_FILE, 'B')
+        self._ends = self._map(ENDS_FILE, 'Q')
+        self._lineage = self._map(LINEAGE_FILE, 'q')
+        self._counts = self._map(COUNTS_FILE, 'I', writable=True)
+        self._cells = self._map(CELLS_FILE, 'B')
+        size = min(
+            len(self._ends) // 2, len(self._lineage) // 2, len(self._counts), len(self._cells)
+        )
+        # Records whose bytes are not in data.bin were not written completely
+        while size and self._ends[2 * size - 1] > len(self._data):
+            size -= 1
+        self._size = size
+
+    def close(self):
+        """
+        Unmaps files of the bank.
+        :return: None.
+        """
+        for view in (self._data, self._ends, self._lineage, self._counts, self._cells):
+            if view is not None:
+                view.release()
+        self._data = self._ends = self._lineage = self._counts = self._cells = None
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
+        self._counts_map = None
+        self._size = 0
+
+    def flush(self):
+        """
+        Writes amounts which were updated in place to the disk.
+        :return: None.
+        """
+        if self._counts_map is not None:
+            self._counts_map.flush()
+
+    def cell_id(self, i):
+        """
+        Gets cell type of a record.
+        :param i: index of the record.
+        :return: CellId value.
+        """
+        return self._cells[i]
+
+    def count(self, i):
+        """
+        Gets amount of copies of a record.
+        :param i: index of the record.
+        :return: amount of copies.
+        """
+        return self._counts[i]
+
+    def set_count(self, i, count):
+        """
+        Updates amount of copies of a record in place.
+        :param i: index of the record.
+        :param count: amount of copies.
+        :return: None.
+        """
+        self._counts[i] = count
+
+    def bytecode(self, i):
+        """
+        Gets bytecode of a record.
+        :param i: index of the record.
+        :return: (<bytecode>, <canonical form>) pair of bytes.
+        """
+        start = self._ends[2 * i - 1] if i else 0
+        middle = self._ends[2 * i]
+        end = self._ends[2 * i + 1]
+        return bytes(self._data[start:middle]), bytes(self._data[middle:end])
+
+    def lineage(self, i):
+        """
+        Gets numbers of a record.
+        :param i: index of the record.
+        :return: (<number>, <founder>) pair, None - not numbered.
+        """
+        number = self._lineage[2 * i]
+        founder = self._lineage[2 * i + 1]
+        return None if number < 0 else number, None if founder < 0 else founder
+
+    def records(self):
+        """
+        Iterates over records (faster than access by indexes).
+        :return: iterator of (<index>, <cell type>, <amount>, <bytecode>, <canonical form>,
+                 <number>, <founder>) tuples, numbers are -1 if not numbered.
+        """
+        data = self._data
+        ends = self._ends[:2 * self._size]
+        lineage = self._lineage[:2 * self._size]
+        start = 0
+        for i, (cell_id, count, middle, end, number, founder) in enumerate(zip(
+                self._cells, self._counts[:self._size], ends[0::2], ends[1::2],
+                lineage[0::2], lineage[1::2])):
+            yield (
+                i, cell_id, count, bytes(data[start:middle]), bytes(data[middle:end]),
+                number, founder
+            )
+            start = end
+
+    def append(self, records):
+        """
+        Appends records to the bank.
+        :param records: list of (<cell type>, <amount>, <bytecode>, <canonical form>,
+                        <number>, <founder>) tuples, numbers are None if not numbered.
+        :return: index of the first appended record.
+        """
+        first = self._size
+        if not records:
+            return first
+        # Data of a record which was not written completely is dropped too
+        data_end = offset = self._end(first)
+        ends = array.array('Q')
+        for _, _, code, canonical, _, _ in records:
+            offset += len(code)
+            ends.append(offset)
+            offset += len(canonical)
+            ends.append(offset)
+
+        # Maps are reopened after files have grown
+        self.close()
+        self._truncate(DATA_FILE, data_end)
+        with open(os.path.join(self._path, DATA_FILE), 'ab') as f:
+            for _, _, code, canonical, _, _ in records:
+                f.write(code)
+                f.write(canonical)
+        self._truncate(ENDS_FILE, 2 * first * ends.itemsize)
+        with open(os.path.join(self._path, ENDS_FILE), 'ab') as f:
+            ends.tofile(f)
+        lineage = array.array('q')
+        for _, _, _, _, number, founder in records:
+            lineage.append(-1 if number is None else number)
+            lineage.append(-1 if founder is None else founder)
+        self._truncate(LINEAGE_FILE, 2 * first * lineage.itemsize)
+        with open(os.path.join(self._path, LINEAGE_FILE), 'ab') as f:
+            lineage.tofile(f)
+        self._truncate(COUNTS_FILE, first * array.array('I').itemsize)
+        with open(os.path.join(self._path, COUNTS_FILE), 'ab') as f:
+            array.array('I', [record[1] for record in records]).tofile(f)
+        self._truncate(CELLS_FILE, first)
+        with open(os.path.join(self._path, CELLS_FILE), 'ab') as f:
+            f.write(bytes(record[0] for record in records))
+        self.open()
+        return first
+
+    def rewrite(self, records):
+        """
+        Replaces all records of the bank (e.g. to drop unused ones).
+        :param records: list of records (see GenomeBank.append).
+        :return: None.
+        """
+        self.close()
+        path = self._path + TMP_SUFFIX
+        shutil.rmtree(path, ignore_errors=True)
+        bank = GenomeBank(path)
+        bank.append(records)
+        bank.close()
+        # Files are not replaced one by one: a mix of old and new ones would
+        # look like valid records
+        old_path = self._path + OLD_SUFFIX
+        os.rename(self._path, old_path)
+        os.rename(path, self._path)
+        shutil.rmtree(old_path)
+        self.open()
+
+    def _recover(self):
+        """
+        Rolls back or completes a compaction which was interrupted (see
+        GenomeBank.rewrite).
+        :return: None.
+        """
+        old_path = self._path + OLD_SUFFIX
+        if os.path.exists(old_path):
+            if os.path.exists(self._path):
+                # The compacted bank is in place already
+                shutil.rmtree(old_path)
+            else:
+                os.rename(old_path, self._path)
+        shutil.rmtree(self._path + TMP_SUFFIX, ignore_errors=True)
+
+    def _end(self, size):
+        """
+        Gets size of data of the first records.
+        :param size: amount of records.
+        :return: end offset of the last of them in data.bin.
+        """
+        return self._ends[2 * size - 1] if size else 0
+
+    def _map(self, name, typecode, writable=False):
+        """
+        Maps a file of the bank as a typed view.
+        :param name: file name.
+        :param typecode: format of items (see memoryview.cast).
+        :param writable: True - items can be updated in place.
+        :return: memoryview.
+        """
+        file_path = os.path.join(self._path, name)
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            return memoryview(bytearray()).cast(typecode)
+        with open(file_path, 'r+b' if writable else 'rb') as f:
+            mapped = mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            )
+        self._maps.append(mapped)
+        if writable:
+            self._counts_map = mapped
+        view = memoryview(mapped)
+        # Ignores a partially written item at the end
+        size = len(view) - len(view) % array.array(typecode).itemsize
+        return view[:size].cast(typecode)
+
+    def _truncate(self, name, size):
+        """
+        Drops bytes of a record which was not written completely.
+        :param name: file name.
+        :param size: expected size of the file.
+        :return: None.
+        """
+        file_path = os.path.join(self._path, name)
+        if os.path.exists(file_path) and os.path.getsize(file_path) > size:
+            with open(file_path, 'r+b') as f:
+                f.truncate(size)
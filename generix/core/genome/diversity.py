@@ -0,0 +1,116 @@
+"""
+A module for diversity metrics of a population of genomes: amount of unique
+genomes, Shannon entropy of their distribution and mean pairwise similarity.
+
+Similarity of two genomes is Jaccard similarity of sets of their k-mers (runs
+of k actions, genomes are cyclic). It is estimated by MinHash sketches without
+comparing pairs: two genomes have the same minimum of a hash function with
+probability equal to their similarity, so the share of colliding pairs among
+sketches of the whole population estimates the mean over all pairs. It takes
+O(n * sketch size) once genomes are sketched, and sketches are cached by
+fingerprints of genomes, so clones and survivors of previous generations are
+sketched once.
+"""
+import collections
+import math
+
+from generix.core.board.intent import mix
+
+
+# Length of runs of actions which are compared
+KMER_SIZE = 3
+# Amount of hash functions of a sketch
+SKETCH_SIZE = 16
+# Amount of cached sketches, the cache is cleared once it is full
+CACHE_SIZE = 1 << 17
+
+
+class DiversityMeter:
+    """
+    Measures diversity of genomes. Hashes of k-mers are computed once per
+    k-mer (there are a few of them, actions are a small alphabet), so a sketch
+    is an elementwise minimum of hashes of k-mers of a genome.
+    """
+    def __init__(self, k=KMER_SIZE, size=SKETCH_SIZE):
+        """
+        Constructs DiversityMeter instance.
+        :param k: length of k-mers.
+        :param size: amount of hash functions of a sketch.
+        """
+        self._k = k
+        self._seeds = [mix(seed) for seed in range(size)]
+        # Hashes of k-mers: {<k-mer bytes>: (<hash>, ...)}
+        self._kmers = {}
+        # Sketches of genomes: {<fingerprint>: (<min hash>, ...)}
+        self._sketches = {}
+
+    def sketch(self, genome):
+        """
+        Gets MinHash sketch of a genome.
+        :param genome: Genome instance.
+        :return: tuple of minimums of hash functions.
+        """
+        fingerprint = genome.fingerprint
+        sketch = self._sketches.get(fingerprint)
+        if sketch is not None:
+            return sketch
+
+        code = genome.bytecode
+        n = len(code)
+        # Genome is executed in a loop, so k-mers wrap around
+        code *= self._k // max(n, 1) + 2
+        kmers = self._kmers
+        hashes = []
+        for kmer in {code[j:j + self._k] for j in range(n)}:
+            values = kmers.get(kmer)
+            if values is None:
+                value = int.from_bytes(kmer, 'big')
+                values = kmers[kmer] = tuple(mix(value ^ seed) for seed in self._seeds)
+            hashes.append(values)
+        sketch = tuple(map(min, zip(*hashes))) if hashes else (0,) * len(self._seeds)
+
+        if len(self._sketches) >= CACHE_SIZE:
+            self._sketches.clear()
+        self._sketches[fingerprint] = sketch
+        return sketch
+
+    def measure(self, genomes):
+        """
+        Measures diversity of a population.
+        :param genomes: iterable of Genome instances (one per cell).
+        :return: dict with 'genomes' (amount), 'unique_genomes', 'entropy' (bits)
+                 and 'similarity' (mean pairwise Jaccard similarity, None for
+                 less than two genomes).
+        """
+        counts = collections.Counter()
+        samples = {}
+        for genome in genomes:
+            fingerprint = genome.fingerprint
+            counts[fingerprint] += 1
+            if fingerprint not in samples:
+                samples[fingerprint] = genome
+
+        n = sum(counts.values())
+        entropy = 0.0
+        for amount in counts.values():
+            p = amount / n
+            entropy -= p * math.log2(p)
+
+        similarity = None
+        if n > 1:
+            # Colliding pairs of each hash function, clones always collide
+            collisions = [collections.Counter() for _ in self._seeds]
+            for fingerprint, amount in counts.items():
+                for counter, value in zip(collisions, self.sketch(samples[fingerprint])):
+                    counter[value] += amount
+            pairs = sum(
+                amount * (amount - 1) for counter in collisions for amount in counter.values()
+            )
+            similarity = pairs / (n * (n - 1) * len(self._seeds))
+
+        return {
+            'genomes': n,
+            'unique_genomes': len(counts),
+            'entropy': entropy,
+            'similarity': similarity,
+        }
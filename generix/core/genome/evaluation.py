@@ -0,0 +1,254 @@
+"""
+A module for batch evaluation of genomes. Each hunter genome is placed alone
+into a fixed scenario (walls and food of a board) and is run headless for a
+budget of ticks. Fitness is stored in the database by hashes of the bytecode
+of the genome, of the scenario and by seed, so a genome which appears again in
+later generations is never simulated twice.
+
+Equivalent genomes (see genome/analysis.py) are evaluated separately: turns
+which cancel out are still paid with step cost and rotations start at
+different actions.
+"""
+import hashlib
+import json
+import multiprocessing
+import random
+
+from generix.core.action.id import Action
+from generix.core.cell.id import CellId
+
+
+DEFAULT_MAX_TICKS = 200
+# Tasks sent to a worker process at once
+CHUNK_SIZE = 16
+
+
+class Scenario:
+    """
+    A fixed scenario of evaluation: size of the board, locations of walls and
+    food (indexes x * height + y), start location of the hunter, budget of
+    ticks and settings parameters (see sweep/runner.py). Food may be also
+    placed randomly: it depends on the seed of evaluation.
+    """
+    __slots__ = (
+        'width', 'height', 'walls', 'food', 'random_food', 'start', 'max_ticks', 'toroidal',
+        'params'
+    )
+
+    def __init__(self, width, height, walls=(), food=(), random_food=0, start=None,
+                 max_ticks=DEFAULT_MAX_TICKS, toroidal=False, params=None):
+        """
+        Constructs Scenario object.
+        :param width: width of the board (amount of cells).
+        :param height: height of the board (amount of cells).
+        :param walls: indexes of walls.
+        :param food: indexes of food.
+        :param random_food: amount of food placed randomly on empty cells.
+        :param start: index of the hunter (None - random empty cell).
+        :param max_ticks: maximum amount of ticks of a run.
+        :param toroidal: True - edges of the board are wrapped around.
+        :param params: dict of settings parameter values by name (see sweep/runner.py).
+        """
+        self.width = width
+        self.height = height
+        self.walls = tuple(sorted(walls))
+        self.food = tuple(sorted(food))
+        self.random_food = random_food
+        self.start = start
+        self.max_ticks = max_ticks
+        self.toroidal = toroidal
+        self.params = dict(params or {})
+
+    @classmethod
+    def from_snapshot(cls, snapshot, **kwargs):
+        """
+        Constructs Scenario object with walls and food of a board snapshot.
+        :param snapshot: Snapshot object (see Board.snapshot).
+        :param kwargs: other arguments of Scenario.
+        :return: Scenario object.
+        """
+        walls = []
+        food = []
+        for i, value in enumerate(snapshot.types):
+            if value == CellId.WALL_CELL.value:
+                walls.append(i)
+            elif value == CellId.FOOD_CELL.value:
+                food.append(i)
+        return cls(snapshot.width, snapshot.height, walls, food, **kwargs)
+
+    @property
+    def key(self):
+        return hashlib.sha1(json.dumps({
+            'width': self.width,
+            'height': self.height,
+            'walls': self.walls,
+            'food': self.food,
+            'random_food': self.random_food,
+            'start': self.start,
+            'max_ticks': self.max_ticks,
+            'toroidal': self.toroidal,
+            'params': self.params,
+        }, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def genome_key(genome):
+    """
+    Gets hash of the bytecode of a genome.
+    :param genome: Genome instance.
+    :return: hex string.
+    """
+    return hashlib.sha1(genome.bytecode).hexdigest()
+
+
+# Contexts of scenarios in the current process: {<scenario key>: AppContext}
+_contexts = {}
+
+
+def get_context(scenario):
+    """
+    Gets context with settings of a scenario, created once per process.
+    :param scenario: Scenario object.
+    :return: AppContext instance.
+    """
+    key = scenario.key
+    if key not in _contexts:
+        from generix.core.context import AppContext
+        from generix.sweep.runner import derive_settings
+
+        settings = derive_settings(scenario.params, scenario.max_ticks)
+        # A scenario has a few cells, so only they are stored and updated
+        settings['board']['storage'] = 'chunked'
+        _contexts[key] = AppContext(experiment_name='evaluation', default_settings=settings)
+    return _contexts[key]
+
+
+def evaluate(values, scenario, seed):
+    """
+    Runs a single hunter in a scenario.
+    :param values: tuple of action values of the genome.
+    :param scenario: Scenario object.
+    :param seed: seed of the random generator.
+    :return: dict with 'ticks', 'food' and 'hp' of the hunter.
+    """
+    from generix.core.board.chunked import ChunkedBoard
+    from generix.core.board.manager import BoardManager
+    from generix.core.genome.genome import Genome
+
+    context = get_context(scenario)
+    settings = context.settings
+    factory = context.factory
+
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        manager = BoardManager(context=context)
+        board = ChunkedBoard(scenario.width, scenario.height, toroidal=scenario.toroidal)
+        for i in scenario.walls:
+            board.set_cell_at(i, factory.create_cell(CellId.WALL_CELL))
+        for i in scenario.food:
+            board.set_cell_at(i, factory.create_cell(CellId.FOOD_CELL))
+
+        empty = [
+            i for i in range(scenario.width * scenario.height)
+            if board.get_cell_at(i).id == CellId.EMPTY_CELL
+        ]
+        random_food = random.sample(empty, min(scenario.random_food, len(empty)))
+        for i in random_food:
+            board.set_cell_at(i, factory.create_cell(CellId.FOOD_CELL))
+        start = scenario.start
+        if start is None:
+            start = random.choice(sorted(set(empty).difference(random_food)))
+
+        hunter_data = settings.find(CellId.HUNTER_CELL)
+        hunter = settings.search(hunter_data, 'cls')(
+            Genome([Action(value) for value in values]), settings.search(hunter_data, 'at_start')
+        )
+        board.set_cell_at(start, hunter)
+        manager.set_board(board)
+
+        food = board.statistics.count(CellId.FOOD_CELL)
+        ticks = 0
+        while ticks < scenario.max_ticks and hunter.hp > 0:
+            manager.tick()
+            if hunter.hp > 0:
+                ticks += 1
+        return {
+            'ticks': ticks,
+            'food': food - manager.statistics.count(CellId.FOOD_CELL),
+            'hp': hunter.hp,
+        }
+    finally:
+        random.setstate(state)
+
+
+def evaluate_task(task):
+    """
+    Evaluates a task in a worker process.
+    :param task: (<genome key>, <action values>, <scenario>, <seed>) tuple.
+    :return: dict with 'GenomeEvaluation' column values.
+    """
+    (key, values, scenario, seed) = task
+    row = evaluate(values, scenario, seed)
+    row.update(scenario=scenario.key, genome=key, seed=seed)
+    return row
+
+
+def evaluate_genomes(genomes, scenario, seeds, jobs=None, context=None):
+    """
+    Evaluates genomes in a scenario with every seed. Stored results are
+    reused, the rest are evaluated in a process pool and stored.
+    :param genomes: list of Genome instances.
+    :param scenario: Scenario object.
+    :param seeds: list of seeds.
+    :param jobs: amount of processes (None - amount of CPUs, 1 - current process).
+    :param context: AppContext instance (None - application context).
+    :return: list of dicts with 'ticks', 'food' and 'hp' (means over seeds) by genome.
+    """
+    from generix.core.context import app_context
+    from generix.core.data.db import Database
+
+    context = context or app_context
+    db = Database(context.session_maker)
+    scenario_key = scenario.key
+    seeds = list(seeds)
+
+    keys = [genome_key(genome) for genome in genomes]
+    # Action values of genomes by their hashes, equal genomes are run once
+    forms = {}
+    for key, genome in zip(keys, genomes):
+        forms.setdefault(key, tuple(genome.bytecode))
+
+    results = {
+        (evaluation.genome, evaluation.seed): {
+            'ticks': evaluation.ticks, 'food': evaluation.food, 'hp': evaluation.hp
+        }
+        for evaluation in db.find_genome_evaluations(scenario_key, list(forms), seeds)
+    }
+    tasks = [
+        (key, values, scenario, seed)
+        for key, values in forms.items() for seed in seeds if (key, seed) not in results
+    ]
+
+    if jobs == 1:
+        rows = [evaluate_task(task) for task in tasks]
+    elif tasks:
+        mp_context = multiprocessing.get_context('spawn')
+        with mp_context.Pool(processes=jobs) as pool:
+            rows = pool.map(evaluate_task, tasks, chunksize=CHUNK_SIZE)
+    else:
+        rows = []
+
+    if rows:
+        db.create_genome_evaluations(rows)
+    for row in rows:
+        results[(row['genome'], row['seed'])] = {
+            'ticks': row['ticks'], 'food': row['food'], 'hp': row['hp']
+        }
+
+    fitness = []
+    for key in keys:
+        runs = [results[(key, seed)] for seed in seeds]
+        fitness.append({
+            name: sum(run[name] for run in runs) / len(runs) for name in ('ticks', 'food', 'hp')
+        })
+    return fitness
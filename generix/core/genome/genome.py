@@ -4,6 +4,15 @@ the board. Genome is comprised of n commands like "turn left", "eat" and etc.
 """
 import random
 
+from generix.core.action.id import Action
+from generix.core.genome.analysis import canonicalize
+
+
+# Values of actions (a lookup is much cheaper than the 'value' attribute of an enum)
+ACTION_VALUES = {action: action.value for action in Action}
+# Actions by values, e.g. to decode bytecode
+VALUE_ACTIONS = {action.value: action for action in Action}
+
 
 class Genome:
     """
@@ -15,6 +24,13 @@ class Genome:
         :param actions: list of actions.
         """
         self._actions = actions
+        self._canonical = None
+        self._fingerprint = None
+        # Ancestry (see genome/lineage.py): numbers are given once a genome is recorded
+        self._number = None
+        self._parent = None
+        self._founder = None
+        self._mutations = 0
 
     @classmethod
     def generate(cls, n, allowed_actions):
@@ -26,6 +42,19 @@ class Genome:
         """
         return Genome(generate_genome(n, allowed_actions))
 
+    @classmethod
+    def from_bytecode(cls, code, canonical=None):
+        """
+        Constructs Genome object from action values (see Genome.bytecode).
+        :param code: bytes of action values.
+        :param canonical: bytes of canonical form if it is known.
+        :return: Genome instance.
+        """
+        genome = Genome(list(map(VALUE_ACTIONS.__getitem__, code)))
+        if canonical is not None:
+            genome._canonical = tuple(canonical)
+        return genome
+
     def __len__(self):
         """
         Gets genome size.
@@ -40,6 +69,52 @@ class Genome:
         """
         return ','.join(str(action) for action in self._actions)
 
+    @property
+    def canonical(self):
+        # Canonical form is computed once, equivalent genomes have equal forms
+        if self._canonical is None:
+            self._canonical = canonicalize(self._actions)
+        return self._canonical
+
+    @property
+    def fingerprint(self):
+        # Hash of actions, computed once. Unlike canonical form, it differs for
+        # rotations of a genome (they start at different actions).
+        if self._fingerprint is None:
+            self._fingerprint = hash(tuple(map(ACTION_VALUES.__getitem__, self._actions)))
+        return self._fingerprint
+
+    @property
+    def bytecode(self):
+        # Action values as bytes, e.g. to hash runs of actions
+        return bytes(map(ACTION_VALUES.__getitem__, self._actions))
+
+    @property
+    def number(self):
+        return self._number
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @property
+    def founder(self):
+        return self._founder
+
+    @property
+    def mutations(self):
+        return self._mutations
+
+    def set_lineage(self, number, founder):
+        """
+        Sets number of the genome in the experiment (see Lineage.record).
+        :param number: number of the genome.
+        :param founder: number of the founder of its lineage.
+        :return: None.
+        """
+        self._number = number
+        self._founder = founder
+
     def get_cmd(self, index):
         """
         Gets name of the action from the list.
@@ -48,15 +123,32 @@ class Genome:
         """
         return self._actions[index]
 
-    def mutate(self, n=1):
+    def clone(self):
+        """
+        Copies genome, so the copy can be mutated independently.
+        :return: Genome instance.
+        """
+        genome = Genome(list(self._actions))
+        # Copies are identical until they are mutated
+        genome._canonical = self._canonical
+        genome._fingerprint = self._fingerprint
+        # A copy is a child of the genome
+        genome._parent = self._number
+        genome._founder = self._founder
+        return genome
+
+    def mutate(self, allowed_actions, n=1):
         """
         Changes n actions in genome.
+        :param allowed_actions: list of actions which will be the source.
         :param n: amount of actions to change.
         :return: None.
         """
-        new_cmds = [random.randint(0, len(self) - 1) for _ in range(n)]
-        for i in range(len(new_cmds) - 1):
-            self._actions[i] = new_cmds[i]
+        for _ in range(n):
+            self._actions[random.randint(0, len(self) - 1)] = random.choice(allowed_actions)
+        self._canonical = None
+        self._fingerprint = None
+        self._mutations += n
 
 
 def generate_genome(n, allowed_actions):
@@ -0,0 +1,102 @@
+"""
+A module for ancestry of genomes. Each genome which enters the population
+(a genome of the next generation, a random genome or a genome of a child) gets
+a number in the experiment and a record: number of its parent, number of the
+founder of its lineage (the first genome without a parent), generation and
+amount of mutations relative to the parent.
+
+Records are appended to typed arrays and flushed to the database in bulk once
+per simulation, then the arrays are cleared, so memory does not grow with the
+amount of records. Parent and founder numbers travel with genomes (see
+Genome.clone), so recording never looks up older records.
+"""
+import array
+
+
+class Lineage:
+    """
+    Records which are not flushed yet: arrays of numbers, parents (-1 - no
+    parent), founders, generations and amounts of mutations.
+    """
+    def __init__(self, start=0):
+        """
+        Constructs Lineage instance.
+        :param start: number of the next genome.
+        """
+        self._next = start
+        self._generation = 0
+        self._numbers = array.array('q')
+        self._parents = array.array('q')
+        self._founders = array.array('q')
+        self._generations = array.array('l')
+        self._mutations = array.array('l')
+
+    def __len__(self):
+        """
+        Gets amount of records which are not flushed yet.
+        :return: amount of records.
+        """
+        return len(self._numbers)
+
+    @property
+    def generation(self):
+        return self._generation
+
+    @generation.setter
+    def generation(self, value):
+        self._generation = value
+
+    def reset(self, start):
+        """
+        Drops records which are not flushed and continues numbering of an
+        experiment.
+        :param start: number of the next genome.
+        :return: None.
+        """
+        self._next = start
+        self.clear()
+
+    def record(self, genome):
+        """
+        Numbers a genome and records its ancestry. Genomes which already have
+        a number are skipped.
+        :param genome: Genome instance.
+        :return: number of the genome.
+        """
+        if genome.number is not None:
+            return genome.number
+        number = self._next
+        self._next += 1
+        parent = genome.parent
+        founder = genome.founder if parent is not None else number
+        genome.set_lineage(number, founder)
+
+        self._numbers.append(number)
+        self._parents.append(-1 if parent is None else parent)
+        self._founders.append(founder)
+        self._generations.append(self._generation)
+        self._mutations.append(genome.mutations)
+        return number
+
+    def rows(self):
+        """
+        Gets records which are not flushed yet.
+        :return: iterator of (<number>, <parent>, <founder>, <generation>, <mutations>)
+                 tuples, parent is None for genomes without parents.
+        """
+        return zip(
+            self._numbers,
+            [None if parent < 0 else parent for parent in self._parents],
+            self._founders, self._generations, self._mutations
+        )
+
+    def clear(self):
+        """
+        Drops records (e.g. once they are flushed).
+        :return: None.
+        """
+        self._numbers = array.array('q')
+        self._parents = array.array('q')
+        self._founders = array.array('q')
+        self._generations = array.array('l')
+        self._mutations = array.array('l')
@@ -1,11 +1,17 @@
 """
 
 """
-import json
+import gc
 import random
 
-from generix.core.settings.settings import GENOME_FILE_PATH, LOAD_GENOME
-from generix.core.settings.encoder import SettingsEncoder
+from generix.core.cell.id import CellId
+from generix.core.genome.bank import GenomeBank
+from generix.core.genome.genome import Genome
+from generix.core.genome.lineage import Lineage
+
+
+# Bank is compacted once records without copies outnumber the rest (and there are at least that many)
+COMPACT_SIZE = 1 << 12
 
 
 class GenomeRegistry:
@@ -16,31 +22,109 @@ class GenomeRegistry:
             ...
         }
     }
+    Equivalent genomes (see genome/analysis.py) are stored as one.
+    Genomes are saved to the genome bank of the experiment (see genome/bank.py).
     """
     def __init__(self, path, default_settings):
         """
-        Constructs SettingsRegistry instance.
-        :param path: path to the settings file.
+        Constructs GenomeRegistry instance.
+        :param path: path to the genome bank directory.
         :param default_settings: default settings dictionary.
         """
         self._path = path
         self._settings = default_settings
+        # Stored genomes by canonical forms: {<CellId>: {<canonical form>: <Genome>}}
+        self._canonical = {}
+        self._bank = None
+        # Records of the bank of stored genomes: {<Genome>: <index>}
+        self._indexes = {}
+        # Ancestry of genomes which enter the registry
+        self._lineage = Lineage()
+
+    @property
+    def lineage(self):
+        return self._lineage
 
     def load(self):
         """
-        Loads last saved data from settings.json.
+        Loads genomes from the bank. Records without copies are skipped.
         :return: None.
         """
-        with open(self._path, mode='r', encoding='utf-8') as f:
-            self._settings = json.load(f)
+        self._bank = bank = GenomeBank(self._path)
+        # Genomes are grouped by CellId values, hashing of enum members is slow
+        settings = {}
+        canonical = {}
+        indexes = {}
+        from_bytecode = Genome.from_bytecode
+        # Genomes hold no reference cycles, collecting garbage while they are
+        # created only slows loading down
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for i, cell_id, count, code, canonical_code, number, founder in bank.records():
+                if not count:
+                    continue
+                # Canonical form is stored, so it is not computed again
+                genome = from_bytecode(code, canonical_code)
+                # Clones of the genome continue its lineage
+                if number >= 0:
+                    genome.set_lineage(number, founder)
+                try:
+                    settings[cell_id][genome] = count
+                except KeyError:
+                    settings[cell_id] = {genome: count}
+                    canonical[cell_id] = {}
+                canonical[cell_id][genome.canonical] = genome
+                indexes[genome] = i
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._settings = {CellId(value): cell_genomes for value, cell_genomes in settings.items()}
+        self._canonical = {CellId(value): forms for value, forms in canonical.items()}
+        self._indexes = indexes
 
     def save(self):
         """
-        Saves current settings to the file, rewriting it.
+        Saves genomes to the bank: amounts of saved genomes are updated in
+        place, new genomes are appended, genomes which have left the registry
+        keep no copies until the bank is compacted.
         :return: None.
         """
-        with open(self._path, mode='w', encoding='utf-8') as f:
-            json.dump(self._settings, f, cls=SettingsEncoder)
+        if self._bank is None:
+            self._bank = GenomeBank(self._path)
+        bank = self._bank
+        indexes = {}
+        new_genomes = []
+        for cell_id, cell_genomes in self._settings.items():
+            for genome, count in cell_genomes.items():
+                i = self._indexes.get(genome)
+                if i is None:
+                    new_genomes.append((cell_id, genome, count))
+                    continue
+                indexes[genome] = i
+                if bank.count(i) != count:
+                    bank.set_count(i, count)
+        for genome, i in self._indexes.items():
+            if genome not in indexes:
+                bank.set_count(i, 0)
+
+        unused = len(bank) - len(indexes)
+        if unused >= COMPACT_SIZE and unused > len(indexes) + len(new_genomes):
+            # Rewrites the bank with stored genomes only
+            stored = [
+                (cell_id, genome, count)
+                for cell_id, cell_genomes in self._settings.items()
+                for genome, count in cell_genomes.items()
+            ]
+            bank.rewrite([self._record(*item) for item in stored])
+            self._indexes = {genome: i for i, (_, genome, _) in enumerate(stored)}
+            return
+
+        first = bank.append([self._record(*item) for item in new_genomes])
+        for i, (_, genome, _) in enumerate(new_genomes, first):
+            indexes[genome] = i
+        self._indexes = indexes
+        bank.flush()
 
     def create(self, cell_id, genome):
         """
@@ -49,12 +133,43 @@ class GenomeRegistry:
         :param genome: genome commands list.
         :return: None.
         """
-        cell_genomes = self._settings[cell_id]
+        # Genome equivalent to a stored one is counted as the stored one
+        genome = self._canonical.setdefault(cell_id, {}).setdefault(genome.canonical, genome)
+        self._lineage.record(genome)
+        cell_genomes = self._settings.setdefault(cell_id, {})
         if genome in cell_genomes.keys():
             cell_genomes[genome] += 1
         else:
             cell_genomes[genome] = 1
 
+    def discard(self, cell_id, genome):
+        """
+        Removes genome with all its copies from storage.
+        :param cell_id: CellId value.
+        :param genome: Genome instance.
+        :return: amount of removed copies.
+        """
+        amount = self._settings.get(cell_id, {}).pop(genome, 0)
+        if amount:
+            del self._canonical[cell_id][genome.canonical]
+        return amount
+
+    def amount(self, cell_id):
+        """
+        Gets amount of stored genomes of a cell type.
+        :param cell_id: CellId value.
+        :return: amount of genomes.
+        """
+        return sum(self._settings.get(cell_id, {}).values())
+
+    def distinct(self, cell_id):
+        """
+        Gets amount of behaviorally distinct genomes of a cell type.
+        :param cell_id: CellId value.
+        :return: amount of canonical forms.
+        """
+        return len(self._settings.get(cell_id, {}))
+
     def pick_genome(self, cell_id):
         """
         Takes genome from storage.
@@ -65,20 +180,31 @@ class GenomeRegistry:
             cell_data = self._settings[cell_id]
         except KeyError:
             return None
+        if not cell_data:
+            return None
 
-        # Picks genome randomly
-        genome = random.choice(cell_data.keys())
+        # Picks genome randomly, equivalent genomes are weighted by their amount
+        genome = random.choices(list(cell_data.keys()), weights=list(cell_data.values()))[0]
 
         cell_data[genome] -= 1
         if cell_data[genome] <= 0:
             del cell_data[genome]
+            del self._canonical[cell_id][genome.canonical]
 
         return genome
 
-
-genome_reg = GenomeRegistry(GENOME_FILE_PATH, {})
-
-if LOAD_GENOME:
-    genome_reg.load()
-
+    @staticmethod
+    def _record(cell_id, genome, count):
+        """
+        Makes a record of the genome bank.
+        :param cell_id: CellId value.
+        :param genome: Genome instance.
+        :param count: amount of copies.
+        :return: (<cell type>, <amount>, <bytecode>, <canonical form>, <number>, <founder>)
+                 tuple.
+        """
+        return (
+            cell_id.value, count, genome.bytecode, bytes(genome.canonical),
+            genome.number, genome.founder
+        )
 
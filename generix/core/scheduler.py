@@ -0,0 +1,105 @@
+"""
+A module for a scheduler which decouples simulation rate from frame rate.
+"""
+import time
+
+
+class Scheduler:
+    """
+    Runs as many ticks as allowed between display frames. Frames are due at
+    the target display rate; when a tick takes longer than the frame budget,
+    frames are skipped adaptively, so rendering does not slow down the
+    simulation even more. The caller handles events once per frame, so the
+    window stays responsive even if frames are not rendered.
+    """
+    # Rendering rate in fast-forward mode: enough to watch the progress
+    FAST_FORWARD_FPS = 1
+    # Smoothing factor of the tick duration estimate
+    SMOOTHING = 0.1
+
+    def __init__(self, fps, tick_rate=None, fast_forward=False):
+        """
+        Constructs Scheduler instance.
+        :param fps: target display frames per second.
+        :param tick_rate: target ticks per second (None - as many as possible).
+        :param fast_forward: if True - ticks are unlimited and frames are
+                             rendered rarely.
+        """
+        self._fps = fps
+        self._tick_interval = 1 / tick_rate if tick_rate else None
+        self._fast_forward = fast_forward
+        self._next_tick = time.perf_counter()
+        # Estimated duration of a tick (seconds)
+        self._tick_time = 0.0
+        self._skipped_frames = 0
+        self._rendered_at = 0.0
+
+    @property
+    def fast_forward(self):
+        return self._fast_forward
+
+    @fast_forward.setter
+    def fast_forward(self, value):
+        self._fast_forward = value
+        self._next_tick = time.perf_counter()
+
+    @property
+    def frame_budget(self):
+        return 1 / self._fps
+
+    def run_frame(self, tick):
+        """
+        Runs ticks until the next frame is due.
+        :param tick: callable which makes one tick of simulation.
+        :return: True - frame should be rendered, False - frame is skipped.
+        """
+        frame_budget = self.frame_budget
+        deadline = time.perf_counter() + frame_budget
+        tick_interval = None if self._fast_forward else self._tick_interval
+        ticks = 0
+
+        while True:
+            now = time.perf_counter()
+            if tick_interval is not None:
+                # Next tick belongs to one of the next frames
+                if self._next_tick >= deadline:
+                    if deadline > now:
+                        time.sleep(deadline - now)
+                    break
+                if self._next_tick > now:
+                    time.sleep(self._next_tick - now)
+                # Does not try to catch up if simulation falls behind
+                self._next_tick = max(self._next_tick + tick_interval, now)
+
+            started = time.perf_counter()
+            tick()
+            ticks += 1
+            finished = time.perf_counter()
+            self._tick_time += (finished - started - self._tick_time) * Scheduler.SMOOTHING
+
+            if finished >= deadline:
+                break
+
+        # Nothing changed since the previous frame
+        if not ticks:
+            return False
+        return self._is_frame_due(frame_budget)
+
+    def _is_frame_due(self, frame_budget):
+        """
+        Decides whether the frame should be rendered. If a tick takes longer
+        than the frame budget, one frame is rendered per n budgets of ticks.
+        :param frame_budget: duration of a frame (seconds).
+        :return: True - frame should be rendered, False - frame is skipped.
+        """
+        now = time.perf_counter()
+        if self._fast_forward and now - self._rendered_at < 1 / Scheduler.FAST_FORWARD_FPS:
+            return False
+
+        frames_to_skip = int(self._tick_time / frame_budget)
+        if self._skipped_frames >= frames_to_skip:
+            self._skipped_frames = 0
+            self._rendered_at = now
+            return True
+        self._skipped_frames += 1
+        return False
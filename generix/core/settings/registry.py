@@ -4,7 +4,6 @@
 import json
 import copy
 
-from generix.core.settings.settings import DEFAULT_SETTINGS, SETTINGS_FILE_PATH, LOAD_SETTINGS
 from generix.core.settings.encoder import SettingsEncoder
 
 
@@ -112,10 +111,3 @@ class SettingsRegistry:
                     continue
                 return item
         return None
-
-
-settings_reg = SettingsRegistry(SETTINGS_FILE_PATH, DEFAULT_SETTINGS)
-
-# Reads only if file existed before program execution
-if LOAD_SETTINGS:
-    settings_reg.load()
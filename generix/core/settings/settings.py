@@ -2,60 +2,30 @@
 Generix settings.
 """
 import os
-import datetime
-
-import pygame
 
 from generix.core.cell.id import CellId
 from generix.core.cell import cell
-from generix.core.action import action
+from generix.core.action import registry
 from generix.core.action.id import Action
 
 
-pygame.font.init()
-
-EXPERIMENT_NAME = 'ex-' + datetime.datetime.now().strftime('%d%b%Y%H%M%S')
-FPS = 2
-REFRESH_RATE = 2
+# Display frames per second
+FPS = 30
+# Simulation ticks per second (None - as many as possible between frames)
+TICK_RATE = 2
+# Runs simulation as fast as possible, the display is refreshed rarely
+FAST_FORWARD = False
+# Measures time spent in each phase of a tick (see data/profiler.py)
+PROFILE = False
+# Records displayed frames: None - disabled, 'png' - PNG sequence, 'video' - video file (ffmpeg)
+RECORD = None
+# Publishes the board into shared memory block with this name for observers
+# in other processes (see board/shared.py): None - disabled
+SHARED_BOARD = None
 
-# Default path where .generix directory is being created. Change it, if needed.
+# Default path where .generix directory is being created (by AppContext). Change it, if needed.
 ROOT = os.path.expanduser('~')
 
-# Application data root directory
-app_data_root = os.path.join(ROOT, '.generix')
-if not os.path.exists(app_data_root):
-    os.mkdir(app_data_root)
-
-# Database-related directory
-DB_DIR_PATH = os.path.join(app_data_root, 'db')
-if not os.path.exists(DB_DIR_PATH):
-    os.mkdir(DB_DIR_PATH)
-
-# Directory where all experiments configurations are stored as JSON files (boards and cells)
-EXPERIMENTS_DIR_PATH = os.path.join(app_data_root, 'experiments')
-if not os.path.exists(EXPERIMENTS_DIR_PATH):
-    os.mkdir(EXPERIMENTS_DIR_PATH)
-
-# Loads cells locations from the file
-CURR_EXPERIMENT_DIR_PATH = os.path.join(EXPERIMENTS_DIR_PATH, EXPERIMENT_NAME)
-if not os.path.exists(CURR_EXPERIMENT_DIR_PATH):
-    os.mkdir(CURR_EXPERIMENT_DIR_PATH)
-
-# Configuration file with experiment settings
-SETTINGS_FILE_PATH = os.path.join(CURR_EXPERIMENT_DIR_PATH, 'settings.json')
-LOAD_SETTINGS = os.path.exists(SETTINGS_FILE_PATH)
-
-# Configuration file with board settings
-BOARD_FILE_PATH = os.path.join(CURR_EXPERIMENT_DIR_PATH, 'board.json')
-LOAD_BOARD = os.path.exists(BOARD_FILE_PATH)
-
-# Genomes configuration file path
-GENOME_FILE_PATH = os.path.join(EXPERIMENTS_DIR_PATH, 'genome.json')
-LOAD_GENOME = os.path.exists(GENOME_FILE_PATH)
-
-# Application database file for simulation
-DB_FILE_PATH = os.path.join(DB_DIR_PATH, 'generix.sqlite')
-
 DEFAULT_SETTINGS = {
     'window': {
         'width': 900,
@@ -64,6 +34,35 @@ DEFAULT_SETTINGS = {
     'board': {
         'rows': 20,
         'cols': 20,
+        # 'bounded' - edges are walls, 'toroidal' - edges are wrapped around
+        'topology': 'bounded',
+        # 'dense' - every cell is stored, 'chunked' - chunks of cells are allocated
+        # on demand (for large sparse worlds, only cells with 'amount' are placed)
+        'storage': 'dense',
+    },
+    'simulation': {
+        # Stop conditions of a simulation (None - disabled)
+        'max_ticks': None,
+        # Wall-clock budget of a simulation (seconds)
+        'time_budget': None,
+        # Amount of ticks populations may stay unchanged
+        'stagnation_ticks': None,
+        # 'serial' - cells are updated one by one (the lower index - the earlier),
+        # 'intent' - cells emit intents, then conflicts are resolved (see board/intent.py)
+        'tick_mode': 'serial',
+        # Conflict resolution rule of 'intent' mode: 'seeded' or 'index'
+        'resolve_rule': 'seeded',
+        'seed': 0,
+        # Distance at which cells sense food with LOOK action (see board/sensor.py)
+        'sensor_radius': 8,
+        # Maintains Zobrist hash of boards, e.g. to compare boards of engines (see board/zobrist.py)
+        'state_hash': False,
+        # Amount of recent board hashes to detect cycles in (None - disabled). A simulation
+        # which repeats itself is stopped or skipped ahead until hunters starve. Not
+        # supported with 'seeded' resolve rule: its decisions depend on the tick.
+        'cycle_history': None,
+        # Measures diversity of hunter genomes of each generation (see genome/diversity.py)
+        'genome_diversity': True,
     },
     'cell': {
         'width': 40,
@@ -114,7 +113,14 @@ DEFAULT_SETTINGS = {
             },
             'amount': 30,
             'population': {
-                'min': 5
+                'min': 5,
+                'extinction': True,
+                # Children are not born beyond this population (see Action.REPRODUCE)
+                'max': 200
+            },
+            # Hunter with at least 'threshold' hp splits its hp with a child
+            'reproduce': {
+                'threshold': 20
             },
             'allowed_actions': [
                 Action.STAY,
@@ -122,27 +128,11 @@ DEFAULT_SETTINGS = {
                 Action.MOVE,
                 Action.TURN
             ],
+            # Genomes without these actions (or without final ones) are pruned
+            'required_actions': [Action.EAT],
             'genome_max_len': 64,
         }
     },
-    'action': {
-        Action.TURN: {
-            'cls': action.Turn
-        },
-        Action.STAY: {
-            'cls': action.Stay,
-            'is_final': True
-        },
-        Action.MOVE: {
-            'cls': action.Move,
-            'is_final': True
-        },
-        Action.EAT: {
-            'cls': action.Eat,
-            'is_final': True
-        },
-        Action.LOOK: {
-            'cls': action.Look
-        }
-    }
+    # Declared in action/registry.py
+    'action': registry.get_settings()
 }
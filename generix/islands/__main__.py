@@ -0,0 +1,48 @@
+"""
+Island model entry point:
+    python -m generix.islands --islands 4 --interval 5 --migrants 2 --topology ring
+    python -m generix.islands --name full --topology full --generations 50
+"""
+import argparse
+
+from generix.islands import runner
+
+
+def main():
+    """
+    Island model entry point.
+    """
+    parser = argparse.ArgumentParser(description='Generix island model.')
+    parser.add_argument('--name', default=runner.DEFAULT_NAME,
+                        help='prefix of experiment names of the islands')
+    parser.add_argument('--islands', type=int, default=runner.DEFAULT_ISLANDS,
+                        help='amount of islands, each one is run in a separate process')
+    parser.add_argument('--generations', type=int, default=runner.DEFAULT_GENERATIONS)
+    parser.add_argument('--interval', type=int, default=runner.DEFAULT_INTERVAL,
+                        help='amount of generations between migrations')
+    parser.add_argument('--migrants', type=int, default=runner.DEFAULT_MIGRANTS,
+                        help='amount of genomes an island sends to each neighbor')
+    parser.add_argument('--topology', choices=runner.TOPOLOGIES, default=runner.DEFAULT_TOPOLOGY)
+    parser.add_argument('--max-ticks', type=int, default=runner.DEFAULT_MAX_TICKS)
+    parser.add_argument('--seed', type=int, default=runner.DEFAULT_SEED)
+    args = parser.parse_args()
+    if args.islands < 1 or args.interval < 1:
+        parser.error('amount of islands and interval should be positive')
+
+    from generix.core.context import app_context
+
+    runner.run({
+        'name': args.name,
+        'islands': args.islands,
+        'generations': args.generations,
+        'interval': args.interval,
+        'migrants': args.migrants,
+        'topology': args.topology,
+        'max_ticks': args.max_ticks,
+        'seed': args.seed,
+        'root': app_context.root,
+    })
+
+
+if __name__ == '__main__':
+    main()
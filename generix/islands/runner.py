@@ -0,0 +1,295 @@
+"""
+A module for an island model of the genetic algorithm. Each island is an
+experiment with its own genome registry which is run in a separate process.
+Every few generations islands exchange genomes of their best survivors with
+neighbors of a topology, so good genomes spread while islands keep evolving
+independently in between.
+"""
+import multiprocessing
+import queue
+import random
+import time
+
+from generix.core.action.id import Action
+from generix.core.cell.id import CellId
+from generix.core.experiment import ExperimentRunner
+from generix.core.genome.genome import Genome
+
+
+TOPOLOGIES = ('ring', 'full')
+
+DEFAULT_NAME = 'islands'
+DEFAULT_ISLANDS = 4
+DEFAULT_GENERATIONS = 20
+# Amount of generations between migrations
+DEFAULT_INTERVAL = 5
+# Amount of genomes an island sends to each neighbor
+DEFAULT_MIGRANTS = 2
+DEFAULT_TOPOLOGY = 'ring'
+# Simulations of islands should always end, so ticks are limited by default
+DEFAULT_MAX_TICKS = 1000
+DEFAULT_SEED = 0
+
+# Seconds an island waits for genomes of its neighbors before giving up
+MIGRATION_TIMEOUT = 600
+
+
+def get_neighbors(island, islands, topology):
+    """
+    Gets islands which receive genomes of an island.
+    :param island: index of the island.
+    :param islands: amount of islands.
+    :param topology: 'ring' - the next island, 'full' - every other island.
+    :return: list of island indexes.
+    """
+    if topology == 'ring':
+        return [(island + 1) % islands] if islands > 1 else []
+    elif topology == 'full':
+        return [k for k in range(islands) if k != island]
+    else:
+        raise ValueError('undefined topology:', topology)
+
+
+def get_sources(island, islands, topology):
+    """
+    Gets islands which send genomes to an island.
+    :param island: index of the island.
+    :param islands: amount of islands.
+    :param topology: 'ring' or 'full' (see get_neighbors).
+    :return: list of island indexes.
+    """
+    return [k for k in range(islands) if island in get_neighbors(k, islands, topology)]
+
+
+class Migration:
+    """
+    Exchanges genomes of an island with its neighbors through queues. Exchange
+    is synchronous: an island waits for genomes of all its sources, so every
+    island migrates after the same generations. Genomes are sent as lists of
+    action values.
+    """
+    def __init__(self, island, inbox, outboxes, sources):
+        """
+        Constructs Migration instance.
+        :param island: index of the island.
+        :param inbox: queue of the island.
+        :param outboxes: queues of the neighbors.
+        :param sources: amount of islands which send genomes to the island.
+        """
+        self._island = island
+        self._inbox = inbox
+        self._outboxes = outboxes
+        self._sources = sources
+        # Genomes of later migrations sent by faster islands: {<epoch>: [<genomes>]}
+        self._early = {}
+
+    def exchange(self, epoch, genomes):
+        """
+        Sends genomes to the neighbors and receives genomes of the sources.
+        :param epoch: number of the migration.
+        :param genomes: list of lists of action values.
+        :return: list of lists of action values.
+        """
+        for outbox in self._outboxes:
+            outbox.put((epoch, self._island, genomes))
+
+        received = self._early.pop(epoch, [])
+        while len(received) < self._sources:
+            try:
+                (message_epoch, _, message_genomes) = self._inbox.get(timeout=MIGRATION_TIMEOUT)
+            except queue.Empty:
+                raise RuntimeError('no genomes from neighbors of island', self._island) from None
+            if message_epoch == epoch:
+                received.append(message_genomes)
+            else:
+                self._early.setdefault(message_epoch, []).append(message_genomes)
+        return [genome for genomes in received for genome in genomes]
+
+
+class IslandRunner(ExperimentRunner):
+    """
+    Runs simulations of an island. Every 'interval' generations the best
+    survivors emigrate to the neighbors and immigrants replace random genomes
+    of the registry.
+    """
+    def __init__(self, db, context, migration, generations, interval, migrants,
+                 cell_id=CellId.HUNTER_CELL):
+        """
+        Constructs IslandRunner instance.
+        :param db: Database instance.
+        :param context: AppContext instance.
+        :param migration: Migration instance.
+        :param generations: amount of simulations to run.
+        :param interval: amount of generations between migrations.
+        :param migrants: amount of genomes sent to each neighbor.
+        :param cell_id: CellId value of migrating cells.
+        """
+        super().__init__(db, context)
+        self._migration = migration
+        self._generations = generations
+        self._interval = interval
+        self._migrants = migrants
+        self._cell_id = cell_id
+        self._epochs = 0
+        self._immigrants = 0
+
+    @property
+    def epochs(self):
+        return self._epochs
+
+    @property
+    def immigrants(self):
+        return self._immigrants
+
+    def form_generation(self):
+        """
+        Forms the next generation and migrates genomes when it is time to.
+        :return: None.
+        """
+        super().form_generation()
+        # There is no migration after the last generation
+        if self.simulations % self._interval == 0 and self.simulations < self._generations:
+            self.migrate()
+
+    def migrate(self):
+        """
+        Sends genomes of the survivors with most hp and puts received genomes
+        into the genome registry instead of random ones, so the population
+        keeps its size.
+        :return: None.
+        """
+        survivors = self.board_manager.get_survived_cells(self._cell_id)
+        survivors.sort(key=lambda cell: cell.hp, reverse=True)
+        emigrants = [
+            [cell.genome.get_cmd(i).value for i in range(len(cell.genome))]
+            for cell in survivors[:self._migrants]
+        ]
+
+        self._epochs += 1
+        genomes = self._context.genomes
+        for values in self._migration.exchange(self._epochs, emigrants):
+            genomes.pick_genome(self._cell_id)
+            genomes.create(self._cell_id, Genome([Action(value) for value in values]))
+            self._immigrants += 1
+
+
+def run_island(island, options, inboxes, results):
+    """
+    Runs an island as a headless experiment. Should be called in a fresh
+    process, so registries of islands do not leak into each other.
+    :param island: index of the island.
+    :param options: dict with 'name', 'islands', 'generations', 'interval',
+        'migrants', 'topology', 'max_ticks', 'seed' and 'root'.
+    :param inboxes: queues of all islands.
+    :param results: queue where (island, <summary dict>) is put.
+    :return: None.
+    """
+    random.seed(options['seed'] + island)
+
+    from generix.core.context import AppContext
+    from generix.core.data.db import Database
+    from generix.sweep.runner import derive_settings
+
+    # Experiment names are limited to 32 characters
+    experiment_name = f"{options['name'][:28]}-{island}"
+    settings = derive_settings({}, options['max_ticks'])
+    context = AppContext(options['root'], experiment_name, settings)
+    context.make_dirs()
+    db = Database(context.session_maker)
+
+    (islands, topology) = (options['islands'], options['topology'])
+    migration = Migration(
+        island, inboxes[island],
+        [inboxes[k] for k in get_neighbors(island, islands, topology)],
+        len(get_sources(island, islands, topology))
+    )
+    runner = IslandRunner(
+        db, context, migration, options['generations'], options['interval'], options['migrants']
+    )
+    runner.start(experiment_name)
+
+    started = time.perf_counter()
+    ticks = []
+    hunters = []
+    while runner.simulations < options['generations']:
+        if runner.tick() is not None:
+            ticks.append(runner.last_simulation['ticks'])
+            hunters.append(runner.last_simulation['hunter_cells'])
+
+    results.put((island, {
+        'experiment_name': experiment_name,
+        'simulations': len(ticks),
+        'ticks_mean': sum(ticks) / len(ticks),
+        'ticks_max': max(ticks),
+        'ticks_last': ticks[-1],
+        'hunters_mean': sum(hunters) / len(hunters),
+        'migrations': runner.epochs,
+        'immigrants': runner.immigrants,
+        'duration': time.perf_counter() - started,
+    }))
+
+
+def run(options):
+    """
+    Runs every island in a separate process and waits for all of them.
+    :param options: dict of options (see run_island).
+    :return: list of summary dicts by island.
+    """
+    if options['topology'] not in TOPOLOGIES:
+        raise ValueError('undefined topology:', options['topology'])
+
+    from generix.core.context import AppContext
+
+    # Creates the database once, so islands do not race to create its tables
+    AppContext(options['root']).session_maker
+
+    mp_context = multiprocessing.get_context('spawn')
+    islands = options['islands']
+    inboxes = [mp_context.Queue() for _ in range(islands)]
+    results = mp_context.Queue()
+    processes = [
+        mp_context.Process(target=run_island, args=(island, options, inboxes, results))
+        for island in range(islands)
+    ]
+    for process in processes:
+        process.start()
+
+    summaries = [None] * islands
+    try:
+        for _ in range(islands):
+            while True:
+                try:
+                    (island, summary) = results.get(timeout=1)
+                    break
+                except queue.Empty:
+                    # Neighbors of a failed island would wait for it forever
+                    failed = [k for k, p in enumerate(processes) if p.exitcode not in (None, 0)]
+                    if failed:
+                        raise RuntimeError('islands failed:', failed) from None
+            summaries[island] = summary
+            print(format_result(island, summary))
+    except BaseException:
+        for process in processes:
+            process.terminate()
+        raise
+    finally:
+        for process in processes:
+            process.join()
+    return summaries
+
+
+def format_result(island, summary):
+    """
+    Represents summary of an island as a single line.
+    :param island: index of the island.
+    :param summary: summary dict (see run_island).
+    :return: string.
+    """
+    return (
+        f"island {island} ({summary['experiment_name']}): "
+        f"{summary['simulations']} simulations, "
+        f"{summary['ticks_mean']:.1f} ticks (max {summary['ticks_max']}, "
+        f"last {summary['ticks_last']}), {summary['hunters_mean']:.1f} hunters, "
+        f"{summary['immigrants']} immigrants in {summary['migrations']} migrations, "
+        f"{summary['duration']:.1f} s"
+    )
@@ -4,8 +4,7 @@ Application entry point.
 import pygame
 
 from generix.core.app import AppWindow
-from generix.core.settings.registry import settings_reg
-from generix.core.settings.settings import EXPERIMENT_NAME
+from generix.core.context import app_context
 
 
 def main():
@@ -13,10 +12,10 @@ def main():
     Application entry point.
     """
     pygame.init()
-    width = settings_reg.find_option_by_key('window', 'width')
-    height = settings_reg.find_option_by_key('window', 'height')
+    width = app_context.settings.find_option_by_key('window', 'width')
+    height = app_context.settings.find_option_by_key('window', 'height')
     app = AppWindow(width, height)
-    app.run(EXPERIMENT_NAME)
+    app.run(app_context.experiment_name)
 
 
 if __name__ == '__main__':
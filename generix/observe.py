@@ -0,0 +1,57 @@
+"""
+Observer entry point: attaches to a board which a running simulation publishes
+in shared memory (see SHARED_BOARD setting), reports populations and records
+frames (1 pixel per cell):
+    python -m generix.observe generix-board
+    python -m generix.observe generix-board --png-dir frames
+"""
+import argparse
+import time
+
+from generix.core.board.recorder import Recorder, PngSequenceWriter, frame_from_snapshot, make_colors
+from generix.core.board.shared import SharedBoardReader
+from generix.core.cell.id import CellId
+from generix.core.context import app_context
+
+
+def main():
+    """
+    Observer entry point.
+    """
+    parser = argparse.ArgumentParser(description='Generix shared board observer.')
+    parser.add_argument('name', help='name of the shared memory block')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='seconds between reads')
+    parser.add_argument('--png-dir', default=None,
+                        help='directory where frames are recorded as PNG sequence')
+    args = parser.parse_args()
+
+    reader = SharedBoardReader(args.name)
+    recorder = None
+    if args.png_dir:
+        recorder = Recorder(PngSequenceWriter(args.png_dir))
+        colors = make_colors(app_context.settings)
+
+    last_number = None
+    try:
+        while True:
+            frame = reader.read()
+            if frame is not None and frame.number != last_number:
+                last_number = frame.number
+                types = frame.types.tobytes()
+                print(f'tick {frame.tick}: ' + ', '.join(
+                    f'{cell_id.name.lower()}={types.count(cell_id.value)}' for cell_id in CellId
+                ))
+                if recorder is not None:
+                    recorder.capture(frame_from_snapshot(frame, colors))
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if recorder is not None:
+            recorder.close()
+        reader.close()
+
+
+if __name__ == '__main__':
+    main()
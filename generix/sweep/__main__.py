@@ -0,0 +1,55 @@
+"""
+Parameter sweep entry point:
+    python -m generix.sweep --name food --param food.amount=10,30,50 --param hp.at_start=20:40:10
+    python -m generix.sweep --name random --param hp.at_start=10:50 --samples 20
+"""
+import argparse
+
+from generix.sweep import runner
+
+
+def main():
+    """
+    Parameter sweep entry point.
+    """
+    parser = argparse.ArgumentParser(description='Generix parameter sweep.')
+    parser.add_argument('--name', default=runner.DEFAULT_SWEEP,
+                        help='sweep name, completed points of the sweep are skipped')
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUES',
+                        help='values: a,b,c (list), lo:hi:step (range) or lo:hi (interval, '
+                             'sampled only); names: {} or a dotted path in the settings'
+                             .format(', '.join(runner.PARAMETERS)))
+    parser.add_argument('--samples', type=int, default=None,
+                        help='amount of random points (default: full grid)')
+    parser.add_argument('--generations', type=int, default=runner.DEFAULT_GENERATIONS)
+    parser.add_argument('--max-ticks', type=int, default=runner.DEFAULT_MAX_TICKS)
+    parser.add_argument('--seed', type=int, default=runner.DEFAULT_SEED)
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='amount of processes (default: amount of CPUs)')
+    args = parser.parse_args()
+
+    space = {}
+    for param in args.param:
+        (name, _, values) = param.partition('=')
+        if not values:
+            parser.error(f'parameter should be NAME=VALUES: {param}')
+        space[name] = runner.parse_values(values)
+
+    if args.samples is None:
+        params = runner.make_grid(space)
+    else:
+        params = runner.make_sample(space, args.samples, args.seed)
+
+    from generix.core.context import app_context
+
+    points = [
+        runner.SweepPoint(
+            args.name, values, args.generations, args.max_ticks, args.seed, app_context.root
+        )
+        for values in params
+    ]
+    runner.run(points, args.jobs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""
+A module for a parameter sweep runner. Each point of a grid or of a random
+sample over the settings is run as an independent headless experiment in a
+process pool. Results are stored in the database by parameter values, so
+completed points are skipped when an interrupted sweep is run again.
+"""
+import ast
+import copy
+import hashlib
+import itertools
+import json
+import multiprocessing
+import random
+import shutil
+import time
+
+from generix.core.action.id import Action
+from generix.core.cell.id import CellId
+
+
+# Short names of parameters: {<name>: <paths in the settings>}. The first key
+# of a path is searched anywhere in the settings, the rest are nested keys.
+# Other names are treated as dotted paths, e.g. 'HUNTER_CELL.hp.at_start'.
+PARAMETERS = {
+    'hp.at_start': ((CellId.HUNTER_CELL, 'hp', 'at_start'),),
+    'hp.step_cost': ((CellId.HUNTER_CELL, 'hp', 'step_cost'),),
+    'hunter.amount': ((CellId.HUNTER_CELL, 'amount'),),
+    'food.amount': ((CellId.FOOD_CELL, 'amount'),),
+    'genome_max_len': ((CellId.HUNTER_CELL, 'genome_max_len'),),
+    'board.size': (('board', 'rows'), ('board', 'cols')),
+}
+
+DEFAULT_SWEEP = 'sweep'
+DEFAULT_GENERATIONS = 5
+# Simulations of a sweep should always end, so ticks are limited by default
+DEFAULT_MAX_TICKS = 1000
+DEFAULT_SEED = 0
+
+
+class SweepPoint:
+    """
+    A single point of a sweep: parameter values and options of the run.
+    """
+    __slots__ = ('sweep', 'params', 'generations', 'max_ticks', 'seed', 'root')
+
+    def __init__(self, sweep, params, generations, max_ticks, seed, root):
+        """
+        Constructs SweepPoint object.
+        :param sweep: sweep name.
+        :param params: dict of parameter values by name.
+        :param generations: amount of simulations to run.
+        :param max_ticks: maximum amount of ticks of a simulation.
+        :param seed: seed of the random generator.
+        :param root: directory where .generix directory is being created.
+        """
+        self.sweep = sweep
+        self.params = params
+        self.generations = generations
+        self.max_ticks = max_ticks
+        self.seed = seed
+        self.root = root
+
+    @property
+    def key(self):
+        return json.dumps({
+            'params': self.params,
+            'generations': self.generations,
+            'max_ticks': self.max_ticks,
+            'seed': self.seed,
+        }, sort_keys=True)
+
+    @property
+    def experiment_name(self):
+        # Experiment names are limited to 32 characters
+        digest = hashlib.sha1(self.key.encode('utf-8')).hexdigest()[:8]
+        return f'{self.sweep[:23]}-{digest}'
+
+
+def parse_values(text):
+    """
+    Parses values of a parameter:
+        'a,b,c' - list of values;
+        'lo:hi:step' - range of values (both ends are included);
+        'lo:hi' - interval, it can only be sampled.
+    :param text: string.
+    :return: list of values or (lo, hi) tuple of an interval.
+    """
+    if ':' not in text:
+        return [parse_value(value) for value in text.split(',')]
+
+    bounds = [parse_value(value) for value in text.split(':')]
+    if len(bounds) == 2:
+        return tuple(bounds)
+    if len(bounds) != 3:
+        raise ValueError('undefined range:', text)
+    (lo, hi, step) = bounds
+    n = int(round((hi - lo) / step))
+    values = [lo + i * step for i in range(n + 1)]
+    if isinstance(step, float) or isinstance(lo, float):
+        # Hides accumulated errors, e.g. 0.30000000000000004
+        values = [round(value, 12) for value in values]
+    return values
+
+
+def parse_value(text):
+    """
+    Parses a single value: a number, a Python literal or a string.
+    :param text: string.
+    :return: value.
+    """
+    try:
+        return ast.literal_eval(text.strip())
+    except (ValueError, SyntaxError):
+        return text.strip()
+
+
+def resolve_paths(name):
+    """
+    Gets paths of a parameter in the settings.
+    :param name: short name (see PARAMETERS) or dotted path.
+    :return: tuple of paths (tuples of keys).
+    """
+    if name in PARAMETERS:
+        return PARAMETERS[name]
+
+    keys = []
+    for part in name.split('.'):
+        if part in CellId.__members__:
+            keys.append(CellId[part])
+        elif part in Action.__members__:
+            keys.append(Action[part])
+        else:
+            keys.append(part)
+    return (tuple(keys),)
+
+
+def find_parent(settings, key):
+    """
+    Recursively searches dict which holds the key.
+    :param settings: dictionary with settings.
+    :param key: key to search for.
+    :return: dict or None if key was not found.
+    """
+    if key in settings:
+        return settings
+    for value in settings.values():
+        if isinstance(value, dict):
+            parent = find_parent(value, key)
+            if parent is not None:
+                return parent
+    return None
+
+
+def derive_settings(params, max_ticks=None, default_settings=None):
+    """
+    Derives settings of a point from the default ones.
+    :param params: dict of parameter values by name.
+    :param max_ticks: maximum amount of ticks of a simulation (None - keep).
+    :param default_settings: settings dictionary (None - DEFAULT_SETTINGS).
+    :return: settings dictionary.
+    """
+    from generix.core.settings.settings import DEFAULT_SETTINGS
+
+    settings = copy.deepcopy(default_settings or DEFAULT_SETTINGS)
+    if max_ticks is not None:
+        settings['simulation']['max_ticks'] = max_ticks
+
+    for name, value in params.items():
+        for path in resolve_paths(name):
+            node = find_parent(settings, path[0])
+            if node is None:
+                raise ValueError('undefined parameter:', name)
+            for key in path[:-1]:
+                node = node.get(key)
+                if not isinstance(node, dict):
+                    raise ValueError('undefined parameter:', name)
+            node[path[-1]] = value
+    return settings
+
+
+def make_grid(space):
+    """
+    Makes points of every combination of parameter values.
+    :param space: dict of lists of values by parameter name.
+    :return: list of dicts of parameter values.
+    """
+    names = sorted(space)
+    for name in names:
+        if isinstance(space[name], tuple):
+            raise ValueError('interval should have a step in a grid:', name)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(space[name] for name in names))
+    ]
+
+
+def make_sample(space, n, seed=DEFAULT_SEED):
+    """
+    Makes n distinct random points. Lists are sampled uniformly, intervals
+    of integers give integers.
+    :param space: dict of lists of values or (lo, hi) intervals by parameter name.
+    :param n: amount of points.
+    :param seed: seed of the sample.
+    :return: list of dicts of parameter values.
+    """
+    rng = random.Random(seed)
+    names = sorted(space)
+    points = {}
+    # A small space has less than n distinct points
+    for _ in range(n * 10):
+        if len(points) == n:
+            break
+        point = {}
+        for name in names:
+            values = space[name]
+            if not isinstance(values, tuple):
+                point[name] = rng.choice(values)
+            elif all(isinstance(bound, int) for bound in values):
+                point[name] = rng.randint(*values)
+            else:
+                point[name] = rng.uniform(*values)
+        points.setdefault(json.dumps(point, sort_keys=True), point)
+    return list(points.values())
+
+
+def run_point(point):
+    """
+    Runs a point as a headless experiment. Should be called in a fresh
+    process, so settings of points do not leak into each other.
+    :param point: SweepPoint object.
+    :return: (point, <dict with 'SweepRun' column values>) tuple.
+    """
+    random.seed(point.seed)
+
+    from generix.core.context import AppContext
+    from generix.core.data.db import Database
+    from generix.core.experiment import ExperimentRunner
+
+    settings = derive_settings(point.params, point.max_ticks)
+    context = AppContext(point.root, point.experiment_name, settings)
+    # Leftovers of an interrupted run of the point: the board and the genome
+    # bank would be loaded otherwise, so the run would not depend on the seed only
+    shutil.rmtree(context.experiment_dir_path, ignore_errors=True)
+    context.make_dirs()
+    db = Database(context.session_maker)
+    db.delete_experiment(point.experiment_name)
+
+    runner = ExperimentRunner(db, context)
+    runner.start(point.experiment_name)
+
+    started = time.perf_counter()
+    ticks = []
+    hunters = []
+    while runner.simulations < point.generations:
+        if runner.tick() is not None:
+            ticks.append(runner.last_simulation['ticks'])
+            hunters.append(runner.last_simulation['hunter_cells'])
+
+    return point, {
+        'simulations': len(ticks),
+        'ticks_mean': sum(ticks) / len(ticks),
+        'ticks_max': max(ticks),
+        'hunters_mean': sum(hunters) / len(hunters),
+        'duration': time.perf_counter() - started,
+    }
+
+
+def run(points, jobs=None, context=None):
+    """
+    Runs points which are not completed yet in a process pool and stores
+    their results in the database.
+    :param points: list of SweepPoint objects.
+    :param jobs: amount of processes (None - amount of CPUs).
+    :param context: AppContext instance (None - application context).
+    :return: list of SweepRun objects of the sweeps.
+    """
+    from generix.core.context import app_context
+    from generix.core.data.db import Database
+
+    context = context or app_context
+    db = Database(context.session_maker)
+
+    sweeps = sorted({point.sweep for point in points})
+    completed = {
+        (sweep_run.sweep, sweep_run.key)
+        for sweep in sweeps for sweep_run in db.find_sweep_runs(sweep)
+    }
+    pending = [point for point in points if (point.sweep, point.key) not in completed]
+    print(f'{len(points) - len(pending)} of {len(points)} points are completed already')
+
+    # Fails early on undefined parameters
+    for point in pending:
+        derive_settings(point.params)
+
+    if pending:
+        mp_context = multiprocessing.get_context('spawn')
+        with mp_context.Pool(processes=jobs) as pool:
+            for point, result in pool.imap_unordered(run_point, pending):
+                db.create_sweep_run(
+                    point.sweep, point.key, json.dumps(point.params, sort_keys=True),
+                    point.experiment_name, result
+                )
+                print(format_result(point.params, result))
+
+    return [sweep_run for sweep in sweeps for sweep_run in db.find_sweep_runs(sweep)]
+
+
+def format_result(params, result):
+    """
+    Represents result of a point as a single line.
+    :param params: dict of parameter values by name.
+    :param result: dict with 'SweepRun' column values.
+    :return: string.
+    """
+    values = ' '.join(f'{name}={value}' for name, value in sorted(params.items()))
+    return (
+        f"{values}: {result['simulations']} simulations, "
+        f"{result['ticks_mean']:.1f} ticks (max {result['ticks_max']}), "
+        f"{result['hunters_mean']:.1f} hunters, {result['duration']:.1f} s"
+    )
@@ -0,0 +1,84 @@
+"""
+Tests of the genome bank (see generix/core/genome/bank.py).
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from generix.core.genome import bank
+from generix.core.genome.bank import GenomeBank
+
+
+class GenomeBankTest(unittest.TestCase):
+    def setUp(self):
+        self._path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._path, ignore_errors=True)
+
+    def test_append_after_interrupted_append(self):
+        genomes = GenomeBank(self._path)
+        genomes.append([(1, 2, b'\x01\x02', b'\x01\x02', 0, 0)])
+
+        # Interrupts the append once data.bin is written
+        truncate = GenomeBank._truncate
+
+        def interrupt(instance, name, size):
+            if name == bank.ENDS_FILE:
+                raise OSError('interrupted')
+            truncate(instance, name, size)
+
+        with mock.patch.object(GenomeBank, '_truncate', interrupt):
+            with self.assertRaises(OSError):
+                genomes.append([(1, 1, b'\x03\x03', b'\x03\x03', 1, 0)])
+
+        genomes = GenomeBank(self._path)
+        self.assertEqual(len(genomes), 1)
+        self.assertEqual(genomes.append([(1, 3, b'\x04', b'\x04', None, None)]), 1)
+
+        genomes = GenomeBank(self._path)
+        self.assertEqual(len(genomes), 2)
+        self.assertEqual(genomes.bytecode(0), (b'\x01\x02', b'\x01\x02'))
+        self.assertEqual(genomes.bytecode(1), (b'\x04', b'\x04'))
+        self.assertEqual(genomes.count(1), 3)
+        self.assertEqual(genomes.lineage(0), (0, 0))
+        self.assertEqual(genomes.lineage(1), (None, None))
+        genomes.close()
+
+    def test_interrupted_rewrite(self):
+        path = os.path.join(self._path, 'genomes')
+        genomes = GenomeBank(path)
+        genomes.append([
+            (1, 0, b'\x01', b'\x01', 0, 0),
+            (1, 2, b'\x02\x03', b'\x02\x03', 1, 0),
+        ])
+
+        # Interrupts the compaction once the old bank is moved aside
+        rename = os.rename
+
+        def interrupt(source, destination):
+            if source.endswith(bank.TMP_SUFFIX):
+                raise OSError('interrupted')
+            rename(source, destination)
+
+        with mock.patch.object(bank.os, 'rename', interrupt):
+            with self.assertRaises(OSError):
+                genomes.rewrite([(1, 2, b'\x02\x03', b'\x02\x03', 1, 0)])
+
+        genomes = GenomeBank(path)
+        self.assertEqual(len(genomes), 2)
+        self.assertEqual(genomes.bytecode(1), (b'\x02\x03', b'\x02\x03'))
+        self.assertEqual(os.listdir(self._path), ['genomes'])
+
+        genomes.rewrite([(1, 2, b'\x02\x03', b'\x02\x03', 1, 0)])
+        genomes = GenomeBank(path)
+        self.assertEqual(len(genomes), 1)
+        self.assertEqual(genomes.bytecode(0), (b'\x02\x03', b'\x02\x03'))
+        self.assertEqual(genomes.lineage(0), (1, 0))
+        genomes.close()
+
+
+if __name__ == '__main__':
+    unittest.main()